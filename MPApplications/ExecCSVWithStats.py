@@ -8,11 +8,12 @@
 from MPCore import MPilotProgram as mpprog
 from MPCore import MPilotFramework as mpf
 from MPCore import MPilotParse as mpp
-from collections import OrderedDict
+from MPCore import MPilotEstimate as mpest
+from MPCore import MPilotCompiled as mpcomp
+from MPCore import MPilotMacro as mpmacro
 import numpy as np
 import sys
 import os
-import re
 
 def UsageDie():
     print '''
@@ -28,6 +29,29 @@ OR
 
 OR
 
+{} -graph ScriptFileName OutFileName
+
+  Write the commands of an MPilot script and their dependencies
+  to OutFileName as JSON node and edge lists
+
+OR
+
+{} -estimate ScriptFileName
+
+  Estimate the memory and time needed to execute the script,
+  without executing it
+
+OR
+
+{} -check ScriptFileName
+
+  Check that the commands of the script are framework commands
+  with valid argument names, without loading the libraries. Only
+  names are checked: argument values are checked when the script
+  is executed
+
+OR
+
 {} -list
 
   List of available framework commands'
@@ -38,7 +62,35 @@ OR
 
   Detailed description of specified CommandNames or all commands if no
   CommandNames are specified
+
+Options, used when executing a script:
+
+  -target RsltNm[,RsltNm]  only compute the named results and
+                           the results they depend on
+  -profile                 print the time and memory used by
+                           the most expensive commands
+  -profiletrace FileName   write a timeline of the commands
+                           executed, in Chrome trace format
+  -writecalibration FileName
+                           write the time per element of each command
+                           executed, for -calibration
+  -checkpoint Dir          save each result in Dir as it is computed
+  -resume                  with -checkpoint, reuse the results saved
+                           by a run that did not finish
+  -compiled                keep the parsed script in ScriptFileName + 'c'
+                           and reuse it while the script is unchanged
+
+Options, used with -estimate:
+
+  -target RsltNm[,RsltNm]  only estimate the named results and
+                           the results they depend on
+  -calibration FileName    project run time from a file written
+                           by -writecalibration
+  -compiled                as when executing a script
 '''.format(
+    os.path.basename(sys.argv[0]),
+    os.path.basename(sys.argv[0]),
+    os.path.basename(sys.argv[0]),
     os.path.basename(sys.argv[0]),
     os.path.basename(sys.argv[0]),
     os.path.basename(sys.argv[0]),
@@ -47,38 +99,6 @@ OR
     exit()
 # def UsageDie():
 
-def MacroSub(inFNm):
-    '''
-    This reads in the file and does a macro substitution
-    using lines like this:
-    
-    # MACRO SrchStr:RepStr
-
-    to do substitutions in the script before feeding it to EEMS.
-    '''
-    with open(inFNm,'r') as inF:
-
-        macros = OrderedDict()
-        rtrnStr = ''
-
-        for inLine in inF.readlines():
-
-            myMatch = re.match(r'^\s*#\s*MACRO\s+([^\s:]+)\s*:([^\s].*[^\s])\s*$',inLine)
-
-            if myMatch is not None:
-                macros[myMatch.groups()[0]] = myMatch.groups()[1]
-            else:
-                for srch,rep in macros.items():
-                    inLine = inLine.replace(srch,rep)
-
-            rtrnStr = '{}{}'.format(rtrnStr,inLine)
-
-        return rtrnStr
-
-    # with open(sys.argv[1],'r') as inF, \...
-    
-# def MacroSub(inFNm):
-
 def CreateFramework():
 
     return mpf.MPilotFramework([
@@ -91,21 +111,53 @@ def CreateFramework():
 
 # def CreateFramework():
 
-def RunIt(framework,progStr):
+def RunIt(framework,progStr,targets=None,profile=False,traceFNm=None,calFNm=None,
+          checkpointDir=None,resume=False,compiledFNm=None):
 
     # This bit of code loads and runs the MPilot script
     # you specified on the command line
     with mpprog.MPilotProgram(
             framework,
-            sourceProgStr = progStr
+            sourceProgStr = progStr,
+            compiledFNm = compiledFNm
         ) as prog:
 
         # This runs the MPilot script you specified on the
-        # command line.
-        prog.Run()
+        # command line. With targets, only what is needed to
+        # compute the targets is run.
+        prog.Run(
+            targets=targets,
+            profile=profile or traceFNm is not None or calFNm is not None,
+            checkpointDir=checkpointDir,
+            resume=resume
+            )
+
+        if profile:
+            print prog.ProfileReport().FormattedReport()
+        if traceFNm is not None:
+            prog.ProfileReport().WriteChromeTrace(traceFNm)
+        if calFNm is not None:
+            mpest.WriteCalibration(
+                mpest.CalibrationFromProfile(prog.ProfileReport(),prog.Estimate(targets=targets)),
+                calFNm
+                )
 
 # def CreateJSONFile(inFNm,outFNm)
 
+def EstimateIt(framework,progStr,targets=None,calibration=None,compiledFNm=None):
+
+    # Estimates the memory and time needed to run the script,
+    # reading only the headers of input files
+    with mpprog.MPilotProgram(
+            framework,
+            sourceProgStr = progStr,
+            compiledFNm = compiledFNm
+        ) as prog:
+
+        print prog.Estimate(calibration=calibration,targets=targets).FormattedReport()
+
+# def EstimateIt(framework,progStr,targets=None,calibration=None,compiledFNm=None):
+
 def TreeIt(framework,inFNm):
     
     # This bit of code loads the MPilot script, generates
@@ -122,6 +174,86 @@ def TreeIt(framework,inFNm):
 
 # def TreeIt(framework,inFNm):
 
+def GraphIt(framework,inFNm,outFNm):
+
+    # Writes the commands of the script and their dependencies
+    # to outFNm as JSON node and edge lists
+    with mpprog.MPilotProgram(
+            framework,
+            inFNm
+        ) as prog:
+
+        prog.WriteCmdGraph(outFNm)
+
+# def GraphIt(framework,inFNm,outFNm):
+
+def CheckIt(framework,progStr,inFNm):
+
+    # Checks the function and argument names of the commands of the
+    # script against the descriptions of the framework's commands
+    # (see MPilotRegistry.py). Argument values are not checked.
+    for mptCmdStruct in mpp.ParseStringToCommands(progStr,inFNm).values():
+        framework.CheckCmdStruct(mptCmdStruct)
+
+# def CheckIt(framework,progStr,inFNm):
+
+def PopOpt(optNm):
+
+    # Removes an option and its value from the command line,
+    # returning the value, or None if the option is not there.
+
+    if optNm not in sys.argv:
+        return None
+
+    optNdx = sys.argv.index(optNm)
+    if optNdx + 1 >= len(sys.argv):
+        UsageDie()
+
+    rtrn = sys.argv[optNdx + 1]
+    del sys.argv[optNdx:optNdx + 2]
+
+    return rtrn
+
+# def PopOpt(optNm):
+
+def PopFlag(flagNm):
+
+    # Removes a flag from the command line, returning whether
+    # it was there.
+
+    if flagNm not in sys.argv:
+        return False
+
+    sys.argv.remove(flagNm)
+
+    return True
+
+# def PopFlag(flagNm):
+
+def CompiledFNm(scriptFNm):
+
+    # Where -compiled keeps the compiled script, None without it
+
+    if not compiled:
+        return None
+
+    return mpcomp.CompiledFNm(scriptFNm)
+
+# def CompiledFNm(scriptFNm):
+
+targets = PopOpt('-target')
+if targets is not None:
+    targets = targets.split(',')
+profile = PopFlag('-profile')
+traceFNm = PopOpt('-profiletrace')
+calFNm = PopOpt('-writecalibration')
+checkpointDir = PopOpt('-checkpoint')
+resume = PopFlag('-resume')
+calibration = PopOpt('-calibration')
+compiled = PopFlag('-compiled')
+if calibration is not None:
+    calibration = mpest.ReadCalibration(calibration)
+
 myFw = CreateFramework()
 
 if len(sys.argv) < 2:
@@ -131,7 +263,20 @@ if len(sys.argv) < 2:
 elif sys.argv[1] == '-tree' and len(sys.argv) == 3:
 
     TreeIt(myFw,sys.argv[2])
+
+elif sys.argv[1] == '-graph' and len(sys.argv) == 4:
+
+    GraphIt(myFw,sys.argv[2],sys.argv[3])
     
+elif sys.argv[1] == '-estimate' and len(sys.argv) == 3:
+
+    EstimateIt(myFw,mpmacro.MacroSubFile(sys.argv[2]),targets,calibration,CompiledFNm(sys.argv[2]))
+
+elif sys.argv[1] == '-check' and len(sys.argv) == 3:
+
+    CheckIt(myFw,mpmacro.MacroSubFile(sys.argv[2]),sys.argv[2])
+    print '\nCheck of function and argument names succeeded\n'
+
 elif sys.argv[1] == '-list' and len(sys.argv) == 2:
 
     print
@@ -153,7 +298,8 @@ elif sys.argv[1] == '-help':
 
 elif len(sys.argv) == 2: 
 
-    RunIt(myFw,MacroSub(sys.argv[1]))
+    RunIt(myFw,mpmacro.MacroSubFile(sys.argv[1]),targets,profile,traceFNm,calFNm,checkpointDir,resume,
+          CompiledFNm(sys.argv[1]))
     print '\nRun succeeded\n'
 
 else:
@@ -0,0 +1,154 @@
+#!/opt/local/bin/python
+
+# Note the line above. If you are running on linux or OS X,
+# you should have a similar line. This tells the operating
+# system what command it should use to run this script. It
+# should be pointing to version 2.7 of python
+
+# Sends MPilot scripts to a server started with ExecServer.py. Only
+# the standard library is imported, so this starts quickly.
+
+from MPCore import MPilotClient as mpclient
+from MPCore import MPilotMacro as mpmacro
+import json
+import sys
+import os
+
+def UsageDie():
+    print '''
+{} [Options] ScriptFileName
+
+  Execute an MPilot script on the server
+
+OR
+
+{} [-socket FileName | -port N] -status
+
+  Show what the server holds
+
+OR
+
+{} [-socket FileName | -port N] -shutdown
+
+  Stop the server
+
+Options:
+
+  -socket FileName         server's Unix socket, default:
+                           {}
+  -port N                  server's localhost port, instead of -socket.
+                           The server's token is read from:
+                           {}
+  -framework Name          framework to run the script with, default
+                           NetCDFUtils
+  -target RsltNm[,RsltNm]  only compute the named results and
+                           the results they depend on
+  -profile                 print the time and memory used by
+                           the most expensive commands
+  -workers N               execute up to N commands at once
+  -prefetch N              read input files ahead of use on N
+                           background threads
+'''.format(
+    os.path.basename(sys.argv[0]),
+    os.path.basename(sys.argv[0]),
+    os.path.basename(sys.argv[0]),
+    mpclient.DEFAULT_ADDRESS,
+    mpclient.TokenFNm('N')
+    )
+    exit()
+# def UsageDie():
+
+def PopOpt(optNm):
+
+    # Removes an option and its value from the command line,
+    # returning the value, or None if the option is not there.
+
+    if optNm not in sys.argv:
+        return None
+
+    optNdx = sys.argv.index(optNm)
+    if optNdx + 1 >= len(sys.argv):
+        UsageDie()
+
+    rtrn = sys.argv[optNdx + 1]
+    del sys.argv[optNdx:optNdx + 2]
+
+    return rtrn
+
+# def PopOpt(optNm):
+
+def PopFlag(flagNm):
+
+    # Removes a flag from the command line, returning whether
+    # it was there.
+
+    if flagNm not in sys.argv:
+        return False
+
+    sys.argv.remove(flagNm)
+
+    return True
+
+# def PopFlag(flagNm):
+
+def SendIt(request):
+
+    reply = mpclient.Request(address,request)
+    if not reply['ok']:
+        print reply['error']
+        exit(1)
+
+    return reply
+
+# def SendIt(request):
+
+address = PopOpt('-socket')
+port = PopOpt('-port')
+if port is not None:
+    address = int(port)
+if address is None:
+    address = mpclient.DEFAULT_ADDRESS
+frameworkNm = PopOpt('-framework')
+if frameworkNm is None:
+    frameworkNm = 'NetCDFUtils'
+
+runArgs = {}
+targets = PopOpt('-target')
+if targets is not None:
+    runArgs['targets'] = targets.split(',')
+if PopFlag('-profile'):
+    runArgs['profile'] = True
+workers = PopOpt('-workers')
+if workers is not None:
+    runArgs['workers'] = int(workers)
+prefetchWorkers = PopOpt('-prefetch')
+if prefetchWorkers is not None:
+    runArgs['prefetchWorkers'] = int(prefetchWorkers)
+
+if len(sys.argv) != 2:
+
+    UsageDie()
+
+elif sys.argv[1] == '-status':
+
+    print json.dumps(SendIt({'op':'status'})['status'],indent=2,sort_keys=True)
+
+elif sys.argv[1] == '-shutdown':
+
+    SendIt({'op':'shutdown'})
+
+else:
+
+    progStr = mpmacro.MacroSubFile(sys.argv[1])
+
+    reply = SendIt({
+        'op':'run',
+        'framework':frameworkNm,
+        'script':progStr,
+        'cwd':os.getcwd(),
+        'runArgs':runArgs,
+        })
+
+    if reply['output'] != '':
+        print reply['output']
+    print '\nRun succeeded in {:.3f} s\n'.format(reply['secs'])
@@ -8,11 +8,15 @@
 from MPCore import MPilotProgram as mpprog
 from MPCore import MPilotFramework as mpf
 from MPCore import MPilotParse as mpp
+from MPCore import MPilotEstimate as mpest
+from MPCore import MPilotSweep as mpsweep
+from MPCore import MPilotCompiled as mpcomp
+from MPCore import MPilotMacro as mpmacro
 from collections import OrderedDict
 import numpy as np
+import csv
 import sys
 import os
-import re
 
 def UsageDie():
     print '{} ScriptFileName'.format(os.path.basename(sys.argv[0]))
@@ -27,6 +31,13 @@ def UsageDie():
     print 
     print 'OR'
     print
+    print '{} -graph ScriptFileName OutFileName'.format(os.path.basename(sys.argv[0]))
+    print
+    print '  Write the commands of an MPilot script and their dependencies'
+    print '  to OutFileName as JSON node and edge lists\n'
+    print 
+    print 'OR'
+    print
     print '{} -macro ScriptFileName'.format(os.path.basename(sys.argv[0]))
     print
     print '  Display script with macro substitution completed\n' 
@@ -50,38 +61,63 @@ def UsageDie():
     print 
     print '  for each MacroNm:MacroVal does a macro substitution on script'
     print '  CommandNames are specified'
+    print
+    print 'OR'
+    print
+    print '\n{} -sweep ScenarioFileName ScriptFileName'.format(os.path.basename(sys.argv[0]))
+    print 
+    print '  Execute the script once for each scenario in ScenarioFileName, a CSV'
+    print '  file with a header row of MacroNms and a row of MacroVals for each'
+    print '  scenario (as with -defmacros). An optional first column named'
+    print '  Scenario names the scenarios. Commands that are the same in several'
+    print '  scenarios are executed only once.'
+    print
+    print 'OR'
+    print
+    print '\n{} -estimate ScriptFileName'.format(os.path.basename(sys.argv[0]))
+    print 
+    print '  Estimate the memory and time needed to execute the script, without'
+    print '  executing it'
+    print
+    print 'OR'
+    print
+    print '\n{} -check ScriptFileName'.format(os.path.basename(sys.argv[0]))
+    print 
+    print '  Check that the commands of the script are framework commands with'
+    print '  valid argument names, without loading the libraries. Only names are'
+    print '  checked: argument values are checked when the script is executed'
+    print
+    print 'Options, used when executing a script:'
+    print
+    print '  -target RsltNm[,RsltNm]  only compute the named results and'
+    print '                           the results they depend on'
+    print '  -profile                 print the time and memory used by'
+    print '                           the most expensive commands'
+    print '  -profiletrace FileName   write a timeline of the commands'
+    print '                           executed, in Chrome trace format'
+    print '  -workers N               execute up to N commands at once'
+    print '  -writecalibration FileName'
+    print '                           write the time per element of each command'
+    print '                           executed, for -calibration'
+    print '  -checkpoint Dir          save each result in Dir as it is computed'
+    print '  -resume                  with -checkpoint, reuse the results saved'
+    print '                           by a run that did not finish'
+    print '  -prefetch N              read input files ahead of use on N'
+    print '                           background threads'
+    print "  -compiled                keep the parsed script in ScriptFileName + 'c'"
+    print '                           and reuse it while the script is unchanged'
+    print
+    print 'Options, used with -estimate:'
+    print
+    print '  -target RsltNm[,RsltNm]  only estimate the named results and'
+    print '                           the results they depend on'
+    print '  -calibration FileName    project run time from a file written'
+    print '                           by -writecalibration'
+    print '  -compiled                as when executing a script'
     
     exit()
 # def UsageDie():
 
-def MacroSub(inStr):
-    '''
-    This reads in the file and does a macro substitution
-    using lines like this:
-    
-    # MACRO SrchStr:RepStr
-
-    to do substitutions in the script before feeding it to EEMS.
-    '''
-    macros = OrderedDict()
-    rtrnStr = ''
-
-    for inLine in inStr.splitlines():
-
-        myMatch = re.match(r'^\s*#\s*MACRO\s+([^\s:]+)\s*:([^\s].*[^\s]*)\s*$',inLine)
-
-        if myMatch is not None:
-            macros[myMatch.groups()[0]] = myMatch.groups()[1]
-        else:
-            for srch,rep in macros.items():
-                inLine = inLine.replace(srch,rep)
-
-        rtrnStr = '{}{}\n'.format(rtrnStr,inLine)
-
-    return rtrnStr
-
-# def MacroSub(inFNm):
-
 def ReadIt(inFNm):
     with open(inFNm,'r') as inF:
         rtrnStr = inF.read()
@@ -96,21 +132,55 @@ def CreateFramework():
 
 # def CreateFramework():
 
-def RunIt(framework,progStr):
+def RunIt(framework,progStr,targets=None,profile=False,traceFNm=None,workers=None,calFNm=None,
+          checkpointDir=None,resume=False,prefetchWorkers=None,compiledFNm=None):
 
     # This bit of code loads and runs the MPilot script
     # you specified on the command line
     with mpprog.MPilotProgram(
             framework,
-            sourceProgStr = progStr
+            sourceProgStr = progStr,
+            compiledFNm = compiledFNm
         ) as prog:
 
         # This runs the MPilot script you specified on the
-        # command line.
-        prog.Run()
+        # command line. With targets, only what is needed to
+        # compute the targets is run.
+        prog.Run(
+            workers=workers,
+            targets=targets,
+            profile=profile or traceFNm is not None or calFNm is not None,
+            checkpointDir=checkpointDir,
+            resume=resume,
+            prefetchWorkers=prefetchWorkers
+            )
+
+        if profile:
+            print prog.ProfileReport().FormattedReport()
+        if traceFNm is not None:
+            prog.ProfileReport().WriteChromeTrace(traceFNm)
+        if calFNm is not None:
+            mpest.WriteCalibration(
+                mpest.CalibrationFromProfile(prog.ProfileReport(),prog.Estimate(targets=targets)),
+                calFNm
+                )
 
 # def RunIt(inFNm,outFNm)
 
+def EstimateIt(framework,progStr,targets=None,calibration=None,compiledFNm=None):
+
+    # Estimates the memory and time needed to run the script,
+    # reading only the headers of input files
+    with mpprog.MPilotProgram(
+            framework,
+            sourceProgStr = progStr,
+            compiledFNm = compiledFNm
+        ) as prog:
+
+        print prog.Estimate(calibration=calibration,targets=targets).FormattedReport()
+
+# def EstimateIt(framework,progStr,targets=None,calibration=None,compiledFNm=None):
+
 def TreeIt(framework,inFNm):
     
     # This bit of code loads the MPilot script, generates
@@ -127,32 +197,157 @@ def TreeIt(framework,inFNm):
 
 # def TreeIt(framework,inFNm):
 
-def MacroIt(inStr,macroList):
-    
+def GraphIt(framework,inFNm,outFNm):
+
+    # Writes the commands of the script and their dependencies
+    # to outFNm as JSON node and edge lists
+    with mpprog.MPilotProgram(
+            framework,
+            sourceProgFNm = inFNm
+        ) as prog:
+
+        prog.WriteCmdGraph(outFNm)
+
+# def GraphIt(framework,inFNm,outFNm):
+
+def CheckIt(framework,progStr,inFNm):
+
+    # Checks the function and argument names of the commands of the
+    # script against the descriptions of the framework's commands
+    # (see MPilotRegistry.py). Argument values are not checked.
+    for mptCmdStruct in mpp.ParseStringToCommands(progStr,inFNm).values():
+        framework.CheckCmdStruct(mptCmdStruct)
+
+# def CheckIt(framework,progStr,inFNm):
+
+def ReadScenarios(inFNm):
+
     '''
-    This reads in the file and does a macro substitution
-    using macroList which is a list of entries like this:
-    
-    MacroNm:MacroVal
+    Reads a scenario file, returning an OrderedDict of
+    scenario name: macroList (see MPilotMacro.MacroIt())
     '''
-    rtrnStr = ''
 
-    for inLine in inStr.splitlines():
+    rtrn = OrderedDict()
 
-        # don't do macros on commented lines
-        if not inLine.startswith('#'):
-            for macroDef in macroList:
-                srch,repl = macroDef.split(':')
-                inLine = inLine.replace(srch,repl)
-
-        rtrnStr = '{}{}\n'.format(rtrnStr,inLine)
+    with open(inFNm,'rU') as inF:
         
-    # for inLine in instr.splitlines():
+        inRows = [row for row in csv.reader(inF) if len(row) > 0]
+        if len(inRows) == 0:
+            return rtrn
+
+        macroNms = [nm.strip() for nm in inRows[0]]
+        hasNms = macroNms[0].lower() == 'scenario'
+
+        for rowNdx,inRow in enumerate(inRows[1:]):
+            
+            if len(inRow) != len(macroNms):
+                raise Exception(
+                    '{}{}{}'.format(
+                        '\n********************ERROR********************\n',
+                        'Scenario file row has {} values, header has {}:\n'.format(
+                            len(inRow),
+                            len(macroNms)
+                            ),
+                        '  File: {}  Row: {}\n'.format(inFNm,rowNdx + 2)
+                        )
+                    )
+
+            if hasNms:
+                scenarioNm = inRow[0].strip()
+                rtrn[scenarioNm] = [
+                    '{}:{}'.format(nm,val.strip()) for nm,val in zip(macroNms[1:],inRow[1:])
+                    ]
+            else:
+                scenarioNm = str(rowNdx + 1)
+                rtrn[scenarioNm] = [
+                    '{}:{}'.format(nm,val.strip()) for nm,val in zip(macroNms,inRow)
+                    ]
 
-    return rtrnStr
-    
-# def MacroIt(progStr)
+        # for rowNdx,inRow in enumerate(inRows[1:]):
+
+    return rtrn
+
+# def ReadScenarios(inFNm):
+
+def SweepIt(framework,scenarioFNm,progFNm,workers=None):
+
+    # Each scenario's script is built as with -defmacros, then the
+    # scenarios are run together so that what they have in common
+    # is executed once
+    tmplStr = ReadIt(progFNm)
+    progStrs = OrderedDict()
+    for scenarioNm,macroLst in ReadScenarios(scenarioFNm).items():
+        progStrs[scenarioNm] = mpmacro.MacroSub(mpmacro.MacroIt(tmplStr,macroLst),progFNm)
+
+    with mpsweep.MPilotSweep(framework,progStrs) as sweep:
+        sweep.Run(workers=workers,releaseRslts=True)
+        print sweep.FormattedSummary()
+
+# def SweepIt(framework,scenarioFNm,progFNm,workers=None):
     
+def PopOpt(optNm):
+
+    # Removes an option and its value from the command line,
+    # returning the value, or None if the option is not there.
+
+    if optNm not in sys.argv:
+        return None
+
+    optNdx = sys.argv.index(optNm)
+    if optNdx + 1 >= len(sys.argv):
+        UsageDie()
+
+    rtrn = sys.argv[optNdx + 1]
+    del sys.argv[optNdx:optNdx + 2]
+
+    return rtrn
+
+# def PopOpt(optNm):
+
+def PopFlag(flagNm):
+
+    # Removes a flag from the command line, returning whether
+    # it was there.
+
+    if flagNm not in sys.argv:
+        return False
+
+    sys.argv.remove(flagNm)
+
+    return True
+
+# def PopFlag(flagNm):
+
+def CompiledFNm(scriptFNm):
+
+    # Where -compiled keeps the compiled script, None without it
+
+    if not compiled:
+        return None
+
+    return mpcomp.CompiledFNm(scriptFNm)
+
+# def CompiledFNm(scriptFNm):
+
+targets = PopOpt('-target')
+if targets is not None:
+    targets = targets.split(',')
+profile = PopFlag('-profile')
+traceFNm = PopOpt('-profiletrace')
+workers = PopOpt('-workers')
+if workers is not None:
+    workers = int(workers)
+calFNm = PopOpt('-writecalibration')
+checkpointDir = PopOpt('-checkpoint')
+resume = PopFlag('-resume')
+prefetchWorkers = PopOpt('-prefetch')
+if prefetchWorkers is not None:
+    prefetchWorkers = int(prefetchWorkers)
+calibration = PopOpt('-calibration')
+compiled = PopFlag('-compiled')
+if calibration is not None:
+    calibration = mpest.ReadCalibration(calibration)
+
 myFw = CreateFramework()
 
 if len(sys.argv) < 2:
@@ -163,10 +358,19 @@ elif sys.argv[1] == '-tree' and len(sys.argv) == 3:
 
     TreeIt(myFw,sys.argv[2])
 
+elif sys.argv[1] == '-graph' and len(sys.argv) == 4:
+
+    GraphIt(myFw,sys.argv[2],sys.argv[3])
+
 elif sys.argv[1] == '-macro' and len(sys.argv) == 3:
 
-    print MacroSub(ReadIt(sys.argv[2]))
+    print mpmacro.MacroSubFile(sys.argv[2])
     
+elif sys.argv[1] == '-check' and len(sys.argv) == 3:
+
+    CheckIt(myFw,mpmacro.MacroSubFile(sys.argv[2]),sys.argv[2])
+    print '\nCheck of function and argument names succeeded\n'
+
 elif sys.argv[1] == '-list' and len(sys.argv) == 2:
 
     for fxnNm in myFw.FxnNames():
@@ -187,14 +391,24 @@ elif sys.argv[1] == '-help':
 
 elif sys.argv[1] == '-defmacros':
     macroLst = sys.argv[2].split(',')
-    progStr = MacroIt(ReadIt(sys.argv[3]),macroLst)
-    RunIt(myFw,MacroSub(progStr))
+    progStr = mpmacro.MacroIt(ReadIt(sys.argv[3]),macroLst)
+    RunIt(myFw,mpmacro.MacroSub(progStr,sys.argv[3]),targets,profile,traceFNm,workers,calFNm,checkpointDir,resume,
+          prefetchWorkers,CompiledFNm(sys.argv[3]))
     print '\nRun succeeded\n'
 
+elif sys.argv[1] == '-estimate' and len(sys.argv) == 3:
+
+    EstimateIt(myFw,mpmacro.MacroSubFile(sys.argv[2]),targets,calibration,CompiledFNm(sys.argv[2]))
+
+elif sys.argv[1] == '-sweep' and len(sys.argv) == 4:
+
+    SweepIt(myFw,sys.argv[2],sys.argv[3],workers)
+    print '\nSweep succeeded\n'
 
 elif len(sys.argv) == 2: 
 
-    RunIt(myFw,MacroSub(ReadIt(sys.argv[1])))
+    RunIt(myFw,mpmacro.MacroSubFile(sys.argv[1]),targets,profile,traceFNm,workers,calFNm,checkpointDir,resume,
+          prefetchWorkers,CompiledFNm(sys.argv[1]))
     print '\nRun succeeded\n'
 
 else:
@@ -0,0 +1,105 @@
+#!/opt/local/bin/python
+
+# Note the line above. If you are running on linux or OS X,
+# you should have a similar line. This tells the operating
+# system what command it should use to run this script. It
+# should be pointing to version 2.7 of python
+
+# Runs an MPilot server, which keeps the MPilot frameworks loaded and
+# executes scripts sent to it with ExecClient.py. See
+# MPCore/MPilotServer.py.
+
+from MPCore import MPilotFramework as mpf
+from MPCore import MPilotServer as mpserver
+from MPCore import MPilotClient as mpclient
+import sys
+import os
+
+def UsageDie():
+    print '{} [-socket FileName | -port N] [-inputcache MB] [-maxprograms N]'.format(
+        os.path.basename(sys.argv[0])
+        )
+    print
+    print '  Serve MPilot scripts sent by ExecClient.py, with these frameworks:'
+    print
+    for frameworkNm in sorted(FRAMEWORK_SPECS.keys()):
+        print '    {}'.format(frameworkNm)
+    print
+    print '  -socket FileName         listen on this Unix socket, default:'
+    print '                           {}'.format(mpclient.DEFAULT_ADDRESS)
+    print '  -port N                  listen on this localhost port instead,'
+    print '                           requiring the token written to:'
+    print '                           {}'.format(mpclient.TokenFNm('N'))
+    print '  -inputcache MB           keep up to MB megabytes of input read,'
+    print '                           for reuse while the input is unchanged'
+    print '  -maxprograms N           keep up to N parsed scripts, default {}'.format(
+        mpserver.DEFAULT_MAX_PROGRAMS
+        )
+
+    exit()
+# def UsageDie():
+
+# The frameworks of ExecNetCDFUtils.py and ExecCSVWithStats.py
+FRAMEWORK_SPECS = {
+    'NetCDFUtils':[
+        ('.MPNetCDFUtilsLib','MPStdLibraries')
+        ],
+    'CSVWithStats':[
+        ('.MPEEMSBasicLib','MPStdLibraries'),
+        ('.MPEEMSFuzzyLogicLib','MPStdLibraries'),
+        ('.MPEEMSGraphLib','MPStdLibraries'),
+        ('.MPEEMSCSVIO','MPStdLibraries'),
+        ('.MPEEMSStatsLib','MPStdLibraries'),
+        ],
+    }
+
+def PopOpt(optNm):
+
+    # Removes an option and its value from the command line,
+    # returning the value, or None if the option is not there.
+
+    if optNm not in sys.argv:
+        return None
+
+    optNdx = sys.argv.index(optNm)
+    if optNdx + 1 >= len(sys.argv):
+        UsageDie()
+
+    rtrn = sys.argv[optNdx + 1]
+    del sys.argv[optNdx:optNdx + 2]
+
+    return rtrn
+
+# def PopOpt(optNm):
+
+address = PopOpt('-socket')
+port = PopOpt('-port')
+if port is not None:
+    address = int(port)
+if address is None:
+    address = mpclient.DEFAULT_ADDRESS
+inputCacheMaxBytes = PopOpt('-inputcache')
+if inputCacheMaxBytes is not None:
+    inputCacheMaxBytes = int(float(inputCacheMaxBytes) * 2**20)
+maxPrograms = PopOpt('-maxprograms')
+if maxPrograms is not None:
+    maxPrograms = int(maxPrograms)
+else:
+    maxPrograms = mpserver.DEFAULT_MAX_PROGRAMS
+
+if len(sys.argv) != 1:
+    UsageDie()
+
+frameworks = {}
+for frameworkNm,moduleSpecs in FRAMEWORK_SPECS.items():
+    frameworks[frameworkNm] = mpf.MPilotFramework(moduleSpecs)
+
+print 'Serving MPilot scripts at: {}'.format(address)
+sys.stdout.flush()
+
+mpserver.MPilotServer(
+    frameworks,
+    address,
+    maxPrograms=maxPrograms,
+    inputCacheMaxBytes=inputCacheMaxBytes
+    ).Serve()
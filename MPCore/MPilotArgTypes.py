@@ -0,0 +1,199 @@
+# Validators for the argument types of MPilot commands.
+#
+# A command's _IsArgType() used to run through a chain of type names
+# and regular expressions every time an argument was checked. Instead,
+# each command class makes one validator per argument type the first
+# time the type is checked (see _MPilotFxnParent._ArgTypeValidator())
+# and keeps it. A validator is called as validator(mpCmd,argStr) and
+# returns True if argStr is of its type.
+#
+# Validators are made by MakeValidator() from element checks, which
+# check one comma separated element of an argument. Command parent
+# classes pick the argument types they accept by listing element
+# checks in their _ARG_ELEM_CHECKS. The checks here give the same
+# answers as the regular expressions they replace.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotArgTypes
+
+import re
+
+_LIST_TYPE_RE = re.compile(r'.+ List$')
+_LIST_RE = re.compile(r'\[.*\]')
+
+_FILE_NM_RE = re.compile(r'([a-zA-Z]:[\\/]){0,1}[\w\\/\.\- ~]*\w+\s*$')
+_FIELD_NM_RE = re.compile(r'^[a-zA-Z][-\w]*$')
+_INT_RE = re.compile(r'^[+-]{0,1}[0-9]+$')
+_POS_INT_RE = re.compile(r'^[+]{0,1}^[0-9]$')
+_BINARY_RE = re.compile(r'^[01]+$')
+_FLOAT_RE = re.compile(
+    r'^[+-]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$'
+    )
+_POS_FLOAT_RE = re.compile(
+    r'^[+]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$'
+    )
+_TRUEST_RE = re.compile(r'^[Tt][Rr][Uu][Ee][Ss][Tt]$')
+_FALSEST_RE = re.compile(r'^[Ff][Aa][Ll][Ss][Ee][Ss][Tt]$')
+
+_DATA_TYPE_DESCS = frozenset([
+    'Any',
+    'String',
+    'File Name',
+    'Field Name',
+    'Integer',
+    'Positive Integer',
+    'Float',
+    'Positive Float',
+    'Fuzzy Value',
+    'Fuzzy',
+    ])
+
+# Element checks: check(mpCmd,elemStr,argStr), where elemStr is one
+# element of argument string argStr
+
+def IsAnything(mpCmd,elemStr,argStr): return True
+
+def IsFileNm(mpCmd,elemStr,argStr): return _FILE_NM_RE.match(elemStr) is not None
+
+def IsFieldNm(mpCmd,elemStr,argStr): return _FIELD_NM_RE.match(elemStr) is not None
+
+def IsInt(mpCmd,elemStr,argStr): return _INT_RE.match(elemStr) is not None
+
+def IsPosInt(mpCmd,elemStr,argStr):
+    return _POS_INT_RE.match(elemStr) is not None and int(elemStr) >= 1
+
+def IsBinary(mpCmd,elemStr,argStr): return _BINARY_RE.match(elemStr) is not None
+
+def IsFloat(mpCmd,elemStr,argStr): return _FLOAT_RE.match(elemStr) is not None
+
+def IsPosFloat(mpCmd,elemStr,argStr): return _POS_FLOAT_RE.match(elemStr) is not None
+
+def IsFuzzyVal(mpCmd,elemStr,argStr):
+    return (
+        _FLOAT_RE.match(elemStr) is not None and
+        mpCmd.fuzzyMin <= float(elemStr) <= mpCmd.fuzzyMax
+        )
+
+# Truest Or Falsest and Boolean check the whole argument
+
+def IsTruestOrFalsest(mpCmd,elemStr,argStr):
+    return (
+        argStr == '-1' or
+        argStr == '1' or
+        _TRUEST_RE.match(argStr) is not None or
+        _FALSEST_RE.match(argStr) is not None
+        )
+
+def IsBoolean(mpCmd,elemStr,argStr): return argStr == 'True' or argStr == 'False'
+
+def IsDataTypeDesc(mpCmd,elemStr,argStr): return elemStr in _DATA_TYPE_DESCS
+
+# The element checks both EEMS and NetCDF commands accept
+COMMON_ELEM_CHECKS = {
+    'Any':IsAnything,
+    'String':IsAnything,
+    'File Name':IsFileNm,
+    'Field Name':IsFieldNm,
+    'Integer':IsInt,
+    'Positive Integer':IsPosInt,
+    'Float':IsFloat,
+    'Positive Float':IsPosFloat,
+    'Fuzzy Value':IsFuzzyVal,
+    'Boolean':IsBoolean,
+    }
+
+def IsListType(argType): return _LIST_TYPE_RE.match(argType) is not None
+
+def ListElemStrs(argStr):
+    # The elements of a list argument, e.g. '[a,b]' -> ['a','b']
+    return argStr.replace('[','').replace(']','').split(',')
+
+def MakeValidator(argType,elemChecks):
+
+    # The validator for argType, which is an element type in
+    # elemChecks, or a list of one (e.g. 'Float List'). A list
+    # argument must be in brackets. Any argument can have more than
+    # one comma separated element, each of which must pass the check.
+
+    if IsListType(argType):
+        elemType = argType.replace(' List','',1)
+    else:
+        elemType = argType
+
+    if elemType not in elemChecks:
+        raise Exception(
+            '{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Class definition error.\n',
+                'Illegal argument type in function descriptions: {}'.format(argType)
+                )
+            )
+
+    elemCheck = elemChecks[elemType]
+
+    if elemType != argType:
+
+        def Validator(mpCmd,argStr):
+            if _LIST_RE.match(argStr) is None:
+                return False
+            for elemStr in ListElemStrs(argStr):
+                if not elemCheck(mpCmd,elemStr,argStr):
+                    return False
+            return True
+
+    else:
+
+        def Validator(mpCmd,argStr):
+            for elemStr in argStr.split(','):
+                if not elemCheck(mpCmd,elemStr,argStr):
+                    return False
+            return True
+
+    # if elemType != argType:...else
+
+    return Validator
+
+# def MakeValidator(argType,elemChecks):
+
+def MakeOneOfValidator(argType):
+
+    # The validator for 'One of| word word ...'
+
+    legalStrs = frozenset(argType.split('|',2)[1].split())
+
+    def Validator(mpCmd,argStr): return argStr in legalStrs
+
+    return Validator
+
+# def MakeOneOfValidator(argType):
+
+def MakeTupleValidator(entryValidators,isList):
+
+    # The validator for a colon separated tuple (e.g. lat:44.75:49.00)
+    # with entries checked by entryValidators, or, if isList, for a
+    # comma separated list of them. Whitespace within a tuple is
+    # ignored.
+
+    def Validator(mpCmd,argStr):
+
+        if isList:
+            tupStrs = ListElemStrs(argStr)
+        else:
+            tupStrs = [argStr]
+
+        for tupStr in tupStrs:
+            entryStrs = ''.join(tupStr.split()).split(':')
+            if len(entryStrs) != len(entryValidators):
+                return False
+            for entryStr,entryValidator in zip(entryStrs,entryValidators):
+                if not entryValidator(mpCmd,entryStr):
+                    return False
+
+        return True
+
+    # def Validator(mpCmd,argStr):
+
+    return Validator
+
+# def MakeTupleValidator(entryValidators,isList):
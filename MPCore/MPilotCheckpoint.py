@@ -0,0 +1,155 @@
+# Checkpoints of MPilot program runs, so that a run that fails part
+# way through (a full disk, a bad input file) can be resumed rather
+# than started again.
+#
+# As each command completes, its execution state is stored in the
+# checkpoint directory (see MPilotRsltCache.py for the format) and a
+# line naming the command and its key is appended to a journal. Keys
+# (see MPilotProgram._CacheKeys()) cover the command's text, the
+# contents of the files it reads, and the keys of the commands it
+# depends on, so a command is complete on resume only if nothing it
+# depends on has changed since it was checkpointed. For commands that
+# write files, the journal also holds the size and modification time
+# of each file written, and the command is complete only while its
+# files are unchanged.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotCheckpoint
+
+import json
+import os
+
+import MPilotHash as mphash
+import MPilotRsltCache as mpcache
+
+_JOURNAL_FNM = 'journal'
+_RSLT_DIR_NM = 'rslts'
+
+class MPilotCheckpoint(object):
+
+    def __init__(
+        self,
+        checkpointDir,  # directory holding the checkpoint
+        resume=False,   # keep what an earlier run checkpointed
+        ):
+
+        self.checkpointDir = checkpointDir
+        self.journalFNm = os.path.join(checkpointDir,_JOURNAL_FNM)
+
+        if not os.path.isdir(checkpointDir):
+            os.makedirs(checkpointDir)
+
+        self.rsltStore = mpcache.MPilotRsltCache(
+            os.path.join(checkpointDir,_RSLT_DIR_NM),
+            maxBytes=None
+            )
+
+        # result name: journal entry of its last completion
+        self.entries = {}
+        if resume:
+            self._ReadJournal()
+        else:
+            self.Clear()
+
+    # def __init__(...)
+
+    def __enter__(self):
+        return(self)
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        if exc_type is not None:
+            print exc_type, exc_value, traceback
+
+    def _ReadJournal(self):
+
+        if not os.path.isfile(self.journalFNm):
+            return
+
+        with open(self.journalFNm,'r') as inF:
+            for line in inF:
+                # The last line is incomplete if a run died while
+                # writing it
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.entries[entry['rsltNm']] = entry
+
+    # def _ReadJournal(self):
+
+    def Clear(self):
+
+        for key in self.rsltStore.entries.keys():
+            self.rsltStore.Remove(key)
+        if os.path.isfile(self.journalFNm):
+            os.remove(self.journalFNm)
+        self.entries = {}
+
+    # def Clear(self):
+
+    def IsComplete(self,mpCmd,key):
+
+        # True if mpCmd completed with the same key, its state is
+        # stored, and any files it wrote are as it left them
+
+        entry = self.entries.get(mpCmd.RsltNm())
+        if entry is None or entry['key'] != key or not self.rsltStore.HasKey(key):
+            return False
+
+        for fNm,fileStat in entry['outFileStats']:
+            curStat = mphash.FileStat(fNm)
+            if curStat is None or list(curStat) != fileStat:
+                return False
+
+        return True
+
+    # def IsComplete(self,mpCmd,key):
+
+    def Load(self,key):
+        # The stored execution state, None if it cannot be read
+        return self.rsltStore.Load(key)
+
+    def Record(self,mpCmd,key):
+
+        # Stores the state of a completed command and journals it.
+        # A state that cannot be stored is not journaled, so the
+        # command is executed again on resume.
+
+        if not self.rsltStore.Store(key,mpcache.ExecState(mpCmd)):
+            return False
+
+        outFileStats = []
+        if mpCmd.HasSideEffects():
+            for fNm in mpCmd.OutFileNms():
+                fileStat = mphash.FileStat(fNm)
+                if fileStat is not None:
+                    outFileStats.append([fNm,list(fileStat)])
+
+        # The state of an earlier completion is no longer needed,
+        # unless a duplicate command shares it
+        oldEntry = self.entries.get(mpCmd.RsltNm())
+        if oldEntry is not None and oldEntry['key'] != key and \
+          not any([entry['key'] == oldEntry['key'] for entry in self.entries.values() if entry is not oldEntry]):
+            self.rsltStore.Remove(oldEntry['key'])
+
+        entry = {
+            'rsltNm':mpCmd.RsltNm(),
+            'key':key,
+            'outFileStats':outFileStats,
+            }
+
+        # Flushed to disk before going on, so the journal never names
+        # a command whose completion could be lost
+        with open(self.journalFNm,'a') as outF:
+            outF.write('{}\n'.format(json.dumps(entry)))
+            outF.flush()
+            os.fsync(outF.fileno())
+
+        self.entries[entry['rsltNm']] = entry
+
+        return True
+
+    # def Record(self,mpCmd,key):
+
+# class MPilotCheckpoint(object):
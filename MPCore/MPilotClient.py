@@ -0,0 +1,74 @@
+# Client side of MPilotServer.py. Only the standard library is used,
+# so that clients start quickly.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotClient
+
+import json
+import os
+import socket
+import tempfile
+
+DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(),'MPilotServer.sock')
+
+def TokenFNm(port):
+    # The file holding the token a server on a localhost port requires
+    # (see MPilotServer.Serve()). It is in the per user directory of
+    # MPilotRegistry.CacheDir(), which is not imported here so that
+    # clients start quickly.
+    cacheRoot = os.environ.get('XDG_CACHE_HOME')
+    if not cacheRoot:
+        cacheRoot = os.path.join(os.path.expanduser('~'),'.cache')
+    return os.path.join(cacheRoot,'mpilot','server-{}.token'.format(port))
+
+def ReadToken(port):
+
+    tokenFNm = TokenFNm(port)
+    if not os.path.isfile(tokenFNm):
+        raise Exception(
+            '{}{}'.format(
+                '\n********************ERROR********************\n',
+                'No token for the MPilot server on port {}: {}\n'.format(port,tokenFNm)
+                )
+            )
+
+    with open(tokenFNm) as tokenF:
+        return tokenF.read().strip()
+
+# def ReadToken(port):
+
+def Request(
+    address,    # as for MPilotServer
+    request,    # dict, see MPilotServer.HandleRequest()
+    ):
+
+    # Sends a request to a server and returns its reply. Requests to
+    # a TCP port carry the server's token.
+
+    if isinstance(address,int):
+        request = dict(request,token=ReadToken(address))
+        sock = socket.create_connection(('127.0.0.1',address))
+    else:
+        sock = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+        sock.connect(address)
+
+    try:
+        sockF = sock.makefile('rw')
+        sockF.write('{}\n'.format(json.dumps(request)))
+        sockF.flush()
+        reply = sockF.readline()
+    finally:
+        sock.close()
+
+    if reply == '':
+        raise Exception(
+            '{}{}'.format(
+                '\n********************ERROR********************\n',
+                'No reply from MPilot server at: {}\n'.format(address)
+                )
+            )
+
+    return json.loads(reply)
+
+# def Request(...)
@@ -0,0 +1,226 @@
+# Immutable command structs for MPilot commands.
+#
+# The parser creates one MPilotCmdStruct for each command, holding
+# where the command came from, its text, and an MPilotParsedCmd of its
+# result name, function name, and MPilotArgs arguments. Because none of
+# these can be changed in place, the struct the parser made is shared,
+# not copied, by the command object created from it and by every copy
+# of that command (copy.copy() and copy.deepcopy() return the struct
+# itself). A command whose struct changes (SetArg(), SetRsltNm(), ...)
+# gets a new struct, sharing everything that did not change, so no
+# other command sees the change.
+#
+# The structs can be read like the dicts they replace, e.g.
+# mptCmdStruct['parsedCmd']['arguments']['InFieldName'].
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotCmdStruct
+
+class MPilotArgs(object):
+
+    # The arguments of a command, argument name: value string, in
+    # script order. Read only, and otherwise used like an OrderedDict.
+    # A name given more than once keeps its first place and last
+    # value, as it did in an OrderedDict.
+
+    __slots__ = ('_nms','_vals')
+
+    def __init__(self,argItems=()):
+
+        vals = {}
+        nms = []
+        for argNm,argVal in argItems:
+            if argNm not in vals:
+                nms.append(argNm)
+            vals[argNm] = argVal
+
+        self._nms = tuple(nms)
+        self._vals = vals
+
+    # def __init__(self,argItems=()):
+
+    def __getitem__(self,argNm): return self._vals[argNm]
+
+    def __contains__(self,argNm): return argNm in self._vals
+
+    def __iter__(self): return iter(self._nms)
+
+    def __len__(self): return len(self._nms)
+
+    def get(self,argNm,default=None): return self._vals.get(argNm,default)
+
+    def keys(self): return list(self._nms)
+
+    def values(self): return [self._vals[argNm] for argNm in self._nms]
+
+    def items(self): return [(argNm,self._vals[argNm]) for argNm in self._nms]
+
+    def iterkeys(self): return iter(self._nms)
+
+    def itervalues(self): return iter(self.values())
+
+    def iteritems(self): return iter(self.items())
+
+    def __eq__(self,other):
+        if isinstance(other,MPilotArgs):
+            return self._nms == other._nms and self._vals == other._vals
+        return self._vals == other
+
+    def __ne__(self,other): return not self == other
+
+    def __repr__(self): return 'MPilotArgs({!r})'.format(self.items())
+
+    def Replace(self,argNm,argVal):
+        # A copy with argNm set to argVal
+        return MPilotArgs(self.items() + [(argNm,argVal)])
+
+    # Immutable, so copies are the original
+    def __copy__(self): return self
+
+    def __deepcopy__(self,memo): return self
+
+    def __reduce__(self): return (MPilotArgs,(self.items(),))
+
+# class MPilotArgs(object):
+
+class _MPilotStructParent(object):
+
+    # Read only struct with named fields, which can also be read
+    # like a dict. Subclasses list their fields in __slots__.
+
+    __slots__ = ()
+
+    def __init__(self,*fieldVals):
+        for fieldNm,fieldVal in zip(self.__slots__,fieldVals):
+            object.__setattr__(self,fieldNm,fieldVal)
+
+    def __setattr__(self,attrNm,attrVal):
+        raise AttributeError(
+            '{} cannot be changed, use Replace()'.format(self.__class__.__name__)
+            )
+
+    def __getitem__(self,fieldNm):
+        if fieldNm not in self.__slots__:
+            raise KeyError(fieldNm)
+        return getattr(self,fieldNm)
+
+    def __contains__(self,fieldNm): return fieldNm in self.__slots__
+
+    def get(self,fieldNm,default=None):
+        if fieldNm not in self.__slots__:
+            return default
+        return getattr(self,fieldNm)
+
+    def FieldVals(self): return tuple([getattr(self,fieldNm) for fieldNm in self.__slots__])
+
+    def Replace(self,**fields):
+
+        # A copy with fields changed
+
+        badNms = set(fields) - set(self.__slots__)
+        if len(badNms) > 0:
+            raise TypeError('Not fields of {}: {}'.format(self.__class__.__name__,' '.join(badNms)))
+
+        return self.__class__(*[
+            fields[fieldNm] if fieldNm in fields else getattr(self,fieldNm)
+            for fieldNm in self.__slots__
+            ])
+
+    # def Replace(self,**fields):
+
+    def __eq__(self,other):
+        return type(self) == type(other) and self.FieldVals() == other.FieldVals()
+
+    def __ne__(self,other): return not self == other
+
+    def __repr__(self):
+        return '{}({})'.format(
+            self.__class__.__name__,
+            ', '.join(['{}={!r}'.format(fieldNm,getattr(self,fieldNm)) for fieldNm in self.__slots__])
+            )
+
+    # Immutable, so copies are the original
+    def __copy__(self): return self
+
+    def __deepcopy__(self,memo): return self
+
+    def __reduce__(self): return (self.__class__,self.FieldVals())
+
+# class _MPilotStructParent(object):
+
+class MPilotParsedCmd(_MPilotStructParent):
+
+    __slots__ = ('rsltNm','cmd','arguments')
+
+    def AsDict(self):
+        return {
+            'rsltNm':self.rsltNm,
+            'cmd':self.cmd,
+            'arguments':self.arguments.items(),
+            }
+
+# class MPilotParsedCmd(_MPilotStructParent):
+
+class MPilotCmdStruct(_MPilotStructParent):
+
+    __slots__ = ('cmdFileNm','lineNo','rawCmdStr','cleanCmdStr','parsedCmd')
+
+    def ReplaceParsed(self,**fields):
+        # A copy with fields of parsedCmd changed
+        return self.Replace(parsedCmd=self.parsedCmd.Replace(**fields))
+
+    def ReplaceArg(self,argNm,argVal):
+        # A copy with argument argNm set to argVal
+        return self.ReplaceParsed(arguments=self.parsedCmd.arguments.Replace(argNm,argVal))
+
+    def AsDict(self):
+        # The dict this struct replaces, with the arguments as a list
+        return {
+            'cmdFileNm':self.cmdFileNm,
+            'lineNo':self.lineNo,
+            'rawCmdStr':self.rawCmdStr,
+            'cleanCmdStr':self.cleanCmdStr,
+            'parsedCmd':self.parsedCmd.AsDict() if self.parsedCmd is not None else None,
+            }
+
+# class MPilotCmdStruct(_MPilotStructParent):
+
+# The struct of a command made without one
+EMPTY_CMD_STRUCT = MPilotCmdStruct(None,None,None,None,MPilotParsedCmd(None,None,MPilotArgs()))
+
+def ParsedCmdFromDict(parsedCmd):
+    # An MPilotParsedCmd from a parsed command dict, or the
+    # MPilotParsedCmd itself
+
+    if isinstance(parsedCmd,MPilotParsedCmd):
+        return parsedCmd
+
+    return MPilotParsedCmd(
+        parsedCmd.get('rsltNm'),
+        parsedCmd.get('cmd'),
+        MPilotArgs(parsedCmd.get('arguments',{}).items())
+        )
+
+# def ParsedCmdFromDict(parsedCmd):
+
+def CmdStructFromDict(mptCmdStruct):
+    # An MPilotCmdStruct from a command struct dict, or the
+    # MPilotCmdStruct itself
+
+    if isinstance(mptCmdStruct,MPilotCmdStruct):
+        return mptCmdStruct
+
+    parsedCmd = mptCmdStruct.get('parsedCmd')
+    if parsedCmd is not None:
+        parsedCmd = ParsedCmdFromDict(parsedCmd)
+
+    return MPilotCmdStruct(
+        mptCmdStruct.get('cmdFileNm'),
+        mptCmdStruct.get('lineNo'),
+        mptCmdStruct.get('rawCmdStr'),
+        mptCmdStruct.get('cleanCmdStr'),
+        parsedCmd
+        )
+
+# def CmdStructFromDict(mptCmdStruct):
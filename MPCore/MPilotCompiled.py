@@ -0,0 +1,117 @@
+# Compiled MPilot programs: the commands of a program after parsing,
+# validation and ordering, saved so that loading the same script again
+# skips all three.
+#
+# A compiled program is saved next to its script (see CompiledFNm())
+# and holds a key (see ProgKey()) ahead of the program itself. The key
+# covers the script text, the name errors report the script by, and
+# the version of the framework (MPilotFramework.VersionSig()), which
+# changes whenever the source of the libraries, or of the MPCore
+# modules that parse and validate commands, changes. A compiled program
+# whose key does not match is ignored and replaced.
+#
+# Each command is saved as its class, its command struct (see
+# MPilotCmdStruct.py), and whatever else its __init__() set. Loading
+# creates the command without running __init__() (and with it
+# _ValidateStrCmd()); its function description comes from its class.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotCompiled
+
+import cPickle as pickle
+import hashlib
+import os
+
+# Changes when what is saved changes
+_COMPILED_FORMAT = 2
+
+# Attributes of a command that are saved in their own form
+_CMD_ATTR_NMS = ['mptCmdStruct','fxnDesc','argValCache']
+
+def CompiledFNm(sourceProgFNm):
+    # Where the compiled form of a script is kept, e.g. a.mpt -> a.mptc
+    return '{}c'.format(sourceProgFNm)
+
+def ProgKey(mpFramework,sourceNm,progStr):
+    # Identifies a compiled program. sourceNm is what error messages
+    # name the script by, which is saved in each command.
+
+    return hashlib.sha1(repr((
+        _COMPILED_FORMAT,
+        mpFramework.VersionSig(),
+        sourceNm,
+        progStr
+        ))).hexdigest()
+
+# def ProgKey(mpFramework,sourceNm,progStr):
+
+def CmdState(mpCmd):
+
+    # The state of a parsed and validated command
+
+    attrs = dict([
+        (attrNm,attrVal) for attrNm,attrVal in mpCmd.__dict__.items() if attrNm not in _CMD_ATTR_NMS
+        ])
+
+    return (mpCmd.__class__,mpCmd.StrCmd(),attrs)
+
+# def CmdState(mpCmd):
+
+def CmdFromState(cmdState):
+
+    # The command saved by CmdState()
+
+    cmdCls,mptCmdStruct,attrs = cmdState
+
+    mpCmd = cmdCls.__new__(cmdCls)
+    mpCmd.__dict__.update(attrs)
+    mpCmd.mptCmdStruct = mptCmdStruct
+    mpCmd.argValCache = None
+
+    return mpCmd
+
+# def CmdFromState(cmdState):
+
+def Load(compiledFNm,key):
+
+    # The saved program state, None if there is none for this key.
+    # A compiled program that cannot be read is treated as missing.
+
+    if not os.path.isfile(compiledFNm):
+        return None
+
+    try:
+        with open(compiledFNm,'rb') as inF:
+            # The key is read first so a stale program is not unpickled
+            if pickle.load(inF) != key:
+                return None
+            return pickle.load(inF)
+    except Exception:
+        return None
+
+# def Load(compiledFNm,key):
+
+def Save(compiledFNm,key,progState):
+
+    # Written to a temporary file and renamed so that a partial
+    # compiled program is never read. Returns False if the program
+    # cannot be saved (e.g. the directory is read only), in which
+    # case the script is simply parsed again next time.
+
+    tmpFNm = '{}.{}.tmp'.format(compiledFNm,os.getpid())
+    try:
+        with open(tmpFNm,'wb') as outF:
+            pickle.dump(key,outF,pickle.HIGHEST_PROTOCOL)
+            pickle.dump(progState,outF,pickle.HIGHEST_PROTOCOL)
+        if os.path.exists(compiledFNm):
+            os.remove(compiledFNm)
+        os.rename(tmpFNm,compiledFNm)
+    except (IOError,OSError,pickle.PicklingError,TypeError):
+        if os.path.exists(tmpFNm):
+            os.remove(tmpFNm)
+        return False
+
+    return True
+
+# def Save(compiledFNm,key,progState):
@@ -0,0 +1,124 @@
+# Elimination of duplicate MPilot commands.
+#
+# Scripts, hand maintained or generated, often compute the same thing
+# more than once under different result names: the same field read
+# twice, the same conversion repeated for two branches of a model.
+# DuplicateCmds() finds commands whose function and arguments are the
+# same once every result name they use is replaced by the name of the
+# first command computing that result. Each is executed once, and each
+# duplicate is completed by taking the execution state of the command
+# it duplicates, sharing its result rather than copying it.
+#
+# Commands with side effects (see HasSideEffects() and OutputNms())
+# are never treated as duplicates. Reads are not side effects: the
+# same field read twice is read once. Commands whose results carry
+# their result name or command text (NetCDF variables) make them
+# their own when they take the state (see AdoptExecState()).
+#
+# File Log:
+# 2026.10.18
+#  Created with DuplicateCmds() and MPilotAliasCmd
+
+from collections import OrderedDict
+
+def _CanonArgVal(argVal,depNms,canonNms):
+
+    # An argument value, or each element of a list value, that is the
+    # name of a result the command depends on is replaced by that
+    # result's canonical name. Anything else (e.g. a file name that
+    # happens to contain a result name) is left as it is.
+
+    def CanonElem(elem):
+        if elem in depNms:
+            return canonNms.get(elem,elem)
+        return elem
+
+    if argVal.startswith('[') and argVal.endswith(']'):
+        return '[{}]'.format(','.join([CanonElem(elem) for elem in argVal[1:-1].split(',')]))
+
+    return CanonElem(argVal)
+
+# def _CanonArgVal(argVal,depNms,canonNms):
+
+def CanonicalSig(mpCmd,canonNms):
+
+    # The function name, arguments in name order with canonical result
+    # names, and any other inputs (ExecSigExtras()) of a command.
+    # canonNms maps the result name of each duplicate to that of the
+    # first command computing the same result.
+
+    parsedCmd = mpCmd.ParsedCmd()
+    if parsedCmd is None:
+        return None
+
+    depNms = set(mpCmd.DependencyNms() or [])
+    canonArgs = tuple(sorted([
+        (argNm,_CanonArgVal(argVal,depNms,canonNms))
+        for argNm,argVal in parsedCmd['arguments'].items()
+        ]))
+
+    return (mpCmd.FxnNm(),canonArgs,mpCmd.ExecSigExtras())
+
+# def CanonicalSig(mpCmd,canonNms):
+
+def DuplicateCmds(orderedMPCmds): # OrderedDict of commands in dependency order
+
+    # Returns an OrderedDict of result name: result name of the first
+    # command computing the same result, for each duplicate command.
+
+    canonNms = {}
+    firstNmBySig = {}
+    dupOf = OrderedDict()
+
+    for rsltNm,mpCmd in orderedMPCmds.items():
+
+        if mpCmd.HasSideEffects() or len(mpCmd.OutputNms()) > 0:
+            continue
+
+        cmdSig = CanonicalSig(mpCmd,canonNms)
+        if cmdSig is None:
+            continue
+
+        if cmdSig in firstNmBySig:
+            dupOf[rsltNm] = firstNmBySig[cmdSig]
+            canonNms[rsltNm] = firstNmBySig[cmdSig]
+        else:
+            firstNmBySig[cmdSig] = rsltNm
+
+    # for rsltNm,mpCmd in orderedMPCmds.items():
+
+    return dupOf
+
+# def DuplicateCmds(orderedMPCmds):
+
+class MPilotAliasCmd(object):
+
+    # Stands in for a duplicate command in the executor. It depends
+    # only on the command it duplicates and is never executed: the
+    # program completes it in the executor's load step (see
+    # MPilotProgram._LoadCmd()).
+
+    def __init__(self,mpCmd,origNm):
+
+        self.mpCmd = mpCmd
+        self.origNm = origNm
+
+    # def __init__(self,mpCmd,origNm):
+
+    def RsltNm(self): return self.mpCmd.RsltNm()
+
+    def FxnNm(self): return self.mpCmd.FxnNm()
+
+    def OrigNm(self): return self.origNm
+
+    def DependencyNms(self): return [self.origNm]
+
+    def HasSideEffects(self): return False
+
+    def ExecSerially(self): return False
+
+    def IsFusable(self): return False
+
+    def IsPrefetchable(self): return False
+
+# class MPilotAliasCmd(object):
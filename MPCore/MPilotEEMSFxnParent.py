@@ -25,6 +25,9 @@
 #  Created _MPilotEEMSParent
 
 import MPilotFxnParent as mpfp
+import MPilotEstimate as mpest
+import MPilotCmdStruct as mpcs
+import MPilotArgTypes as mpat
 import re
 import numpy as np
 import copy as cp
@@ -93,7 +96,7 @@ class _MPilotEEMSFxnParent(mpfp._MPilotFxnParent):
 
     def InitFromParsedCmd(self,parsedCmd):
         
-        self.mptCmdStruct['parsedCmd'] = cp.deepcopy(parsedCmd)
+        self.mptCmdStruct = self.mptCmdStruct.Replace(parsedCmd=mpcs.ParsedCmdFromDict(parsedCmd))
         self.InitRawCmdFromParsedCmd()
         self.InitCleanCmdFromParsedCmd()
         if 'DataType' in parsedCmd['arguments']:
@@ -103,7 +106,7 @@ class _MPilotEEMSFxnParent(mpfp._MPilotFxnParent):
         
     # def InitFromParsedCmd(self,parsedCmd):
 
-    def ValFromArgByNm(self,argNm):
+    def _ConvertArgByNm(self,argNm):
 
         # Return an actual value (be that a single value or a list)
         # of a argument. Arguments are read as strings, so this
@@ -255,87 +258,20 @@ class _MPilotEEMSFxnParent(mpfp._MPilotFxnParent):
 
         return rtrn
 
-    # def ValFromArgByNm(self,argNm):
+    # def _ConvertArgByNm(self,argNm):
+
+    # Argument types EEMS commands accept (see MPilotArgTypes.py)
+    _ARG_ELEM_CHECKS = dict(
+        mpat.COMMON_ELEM_CHECKS,
+        **{
+            'Truest Or Falsest':mpat.IsTruestOrFalsest,
+            'Data Type Desc':mpat.IsDataTypeDesc,
+            }
+        )
 
     # Used to check validity of mptCmdStruct argument types
     def _IsArgType(self,inStr,inType):
-
-        if re.match(r'.+ List$',inType):
-            theType = inType.replace(' List','',1)
-            if not re.match(r'\[.*\]',inStr): return False
-            theStr = inStr.replace('[','').replace(']','')
-        else:
-            theStr = inStr
-            theType = inType
-            
-        theStrs = theStr.split(',')
-        if len(theStrs) == 0: return False
-
-        for theStr in theStrs:
-            if theType == 'Any':
-                pass
-            elif theType == 'String':
-                pass
-            elif theType == 'File Name':
-                if not re.match(r'([a-zA-Z]:[\\/]){0,1}[\w\\/\.\- ~]*\w+\s*$',theStr):
-                    return False
-            elif theType == 'Field Name':
-                if not re.match(r'^[a-zA-Z][-\w]*$',theStr):
-                    return False
-            elif theType == 'Integer':
-                if not re.match(r'^[+-]{0,1}[0-9]+$',theStr):
-                    return False
-            elif theType == 'Positive Integer':
-                if not re.match(r'^[+]{0,1}^[0-9]$',theStr):
-                    return False
-                else:
-                    if int(theStr) < 1:
-                        return False
-            elif theType == 'Float':
-                if not re.match(r'^[+-]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
-                    return False
-            elif theType == 'Positive Float':
-                if not re.match(r'^[+]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
-                    return False
-            elif theType == 'Fuzzy Value':
-                if not re.match(r'^[+-]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
-                    return False
-                if not self.fuzzyMin <= float(theStr) <= self.fuzzyMax:
-                    return False
-            elif theType == 'Truest Or Falsest':
-                if not (inStr == '-1' or
-                    inStr == '1' or
-                    re.match(r'^[Tt][Rr][Uu][Ee][Ss][Tt]$',inStr) or
-                    re.match(r'^[Ff][Aa][Ll][Ss][Ee][Ss][Tt]$',inStr)):
-                    return False                
-            elif theType == 'Boolean':
-                if not (inStr == 'True' or inStr == 'False'):
-                    return False                
-            elif theType == 'Data Type Desc':
-                if not theStr in [
-                    'Any',
-                    'String',
-                    'File Name',
-                    'Field Name',
-                    'Integer',
-                    'Positive Integer',
-                    'Float',
-                    'Positive Float',
-                    'Fuzzy Value',
-                    'Fuzzy',
-                    ]:
-                    return False
-            else:
-                raise Exception(
-                    '{}{}{}'.format(
-                        '\n********************ERROR********************\n',
-                        'Class definition error.\n',
-                        'Illegal argument type in function descriptions: {}'.format(inType)
-                        )
-                    )
-        # for theStr in theStrs:
-
-        return True
+        return self._ArgTypeValidator(inType)(self,inStr)
     
     # def _IsArgType(self,inStr,type):
 
@@ -349,6 +285,91 @@ class _MPilotEEMSFxnParent(mpfp._MPilotFxnParent):
         
     # def _InsureFuzzy(self,arr):
 
+    def _InsureFuzzyBlock(self,block):
+        # _InsureFuzzy() for a block of a fused kernel
+        np.clip(block,self.fuzzyMin,self.fuzzyMax,out=block)
+
+    # Fusable commands (see IsFusable() and MPilotFusion.py) override
+    # FusedBlockExec(), and FusedInNms() if their inputs are not
+    # InFieldNames.
+
+    def FusedInNms(self):
+        # Names of the fields whose values are used elementwise
+        return self._ArgToList('InFieldNames')
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+        # Computes one block of the result into outBlock from blocks
+        # of the data of the inputs, in FusedInNms() order. Returns a
+        # boolean array of elements to mask beyond those masked in
+        # the inputs (e.g. non-finite results of a numpy.ma division),
+        # or None.
+
+        raise Exception(
+            '{}{}{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Programming error:\n',
+                '  Your program is using the inherited _MPilotEEMSFxnParent:FusedBlockExec() method.',
+                '  A fusable MPilot command (see IsFusable()) needs its own FusedBlockExec() method.',
+                '  Check and correct the class definition of the MPilot command: {}\n'.format(self.__class__.__name__),
+                ),
+            )
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def FusedRsltMinNeeded(self):
+        # True if SetFusedDataType() needs the minimum of the result
+        return False
+
+    def SetFusedDataType(self,rsltMin):
+        # For commands whose data type depends on their result.
+        # rsltMin is None if every element is masked.
+        pass
+
+    def EstimateRslt(self,depEsts):
+        # Tileable EEMS commands are elementwise, with float results
+        if self.IsTileable():
+            return mpest.ElementwiseEst(self,depEsts,np.float64)
+        return None
+
+    def GlobalStatNms(self):
+        # Statistics of the whole of the input named by
+        # GlobalStatInNm() that the command uses (any of 'min',
+        # 'max', 'mean', 'std'). In tiled execution these are
+        # computed before the tiles are processed. See MPilotTiler.py.
+        return []
+
+    def GlobalStatInNm(self):
+        return self.ArgByNm('InFieldName')
+
+    def _ArrStat(self,statNm,inArr):
+
+        # A statistic listed in GlobalStatNms(). In tiled execution
+        # inArr is only one tile, so the statistic comes from the
+        # tiler instead.
+
+        if self.tile is not None:
+            return self.tile.GlobalStat(self.RsltNm(),statNm)
+
+        if statNm == 'min':
+            return inArr.min()
+        elif statNm == 'max':
+            return inArr.max()
+        elif statNm == 'mean':
+            return np.ma.mean(inArr)
+        elif statNm == 'std':
+            return np.ma.std(inArr)
+
+        raise Exception(
+            '{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Class definition error.\n',
+                'Illegal statistic name: {}'.format(statNm)
+                )
+            )
+
+    # def _ArrStat(self,statNm,inArr):
+
+
     def _IsValidArgType(self,argStr,argTypes):
 
         rtrn = False
@@ -391,7 +412,7 @@ class _MPilotEEMSFxnParent(mpfp._MPilotFxnParent):
                     ),
                 )
 
-        self.mptCmdStruct['parsedCmd']['arguments'][argNm] = cp.deepcopy(value)
+        self.mptCmdStruct = self.mptCmdStruct.ReplaceArg(argNm,value)
         
     # def SetArg(self,argNm,value):
         
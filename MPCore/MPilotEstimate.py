@@ -0,0 +1,373 @@
+# Dry run estimates of the memory and time an MPilot program needs.
+#
+# Before a long run it is worth knowing whether the program's results
+# will fit in memory. MPilotEstimator walks a program's commands in
+# dependency order without executing them. Each command estimates its
+# result from the estimates of the results it depends on (see
+# EstimateRslt() in MPilotFxnParent.py): elementwise commands keep the
+# shape of their inputs, and commands that read files look only at the
+# file's header (e.g. the shape and type of a NetCDF variable).
+#
+# An estimate is a dict made by RsltEst(). From the estimates come the
+# bytes of each result, the peak bytes of live results when every
+# result is kept and when results are released once used (as with
+# MPilotProgram.Run(releaseRslts=True)), and a projected run time.
+# Peaks count results only, not the temporaries of a command's
+# arithmetic, and are for commands run one at a time.
+#
+# Projected times come from a calibration table: seconds per element
+# for each command, where an element is one element of the command's
+# result or of one of its inputs. CalibrationFromProfile() makes a
+# table from a profiled run on smaller data, and ReadCalibration() and
+# WriteCalibration() keep tables in JSON files. Commands not in the
+# table use DEFAULT_SECS_PER_ELEM.
+#
+# File Log:
+# 2026.10.18
+#  Created with RsltEst(), ElementwiseEst(), and MPilotEstimator
+
+from collections import OrderedDict
+import json
+import os
+import numpy as np
+
+# Seconds per element for commands not in the calibration table. About
+# what a numpy.ma operation on float64 data costs.
+DEFAULT_SECS_PER_ELEM = 2e-8
+
+CALIBRATION_DEFAULT_KEY = 'default'
+
+def RsltEst(
+    shape,          # tuple, () for a scalar or a result that is not an array
+    dtype,          # numpy data type, None for a result that is not an array
+    masked=False,   # True for a masked array with a full mask
+    extraBytes=0,   # bytes held beside the data, e.g. dimension variables
+    dimNms=None,    # dimension names, for results that have them
+    ):
+
+    return {
+        'shape':tuple(shape),
+        'dtype':None if dtype is None else np.dtype(dtype),
+        'masked':masked,
+        'extraBytes':extraBytes,
+        'dimNms':None if dimNms is None else list(dimNms),
+        }
+
+# def RsltEst(...)
+
+def NoRsltEst():
+    # For commands whose result is only a flag or message (writes,
+    # prints, graphics)
+    return RsltEst((),None)
+
+def EstNElems(est):
+    if est is None or est['dtype'] is None:
+        return 0
+    return int(np.prod(est['shape'],dtype=np.int64))
+
+def EstNBytes(est):
+    # Bytes held by an estimated result, None if unknown
+
+    if est is None:
+        return None
+
+    nElems = EstNElems(est)
+    nBytes = est['extraBytes']
+    if est['dtype'] is not None:
+        nBytes += nElems * est['dtype'].itemsize
+        if est['masked'] and len(est['shape']) > 0:
+            nBytes += nElems
+
+    return nBytes
+
+# def EstNBytes(est):
+
+def EstInNms(mpCmd):
+    # Results a command computes from: its dependencies other than
+    # PrecursorFieldNames, which only order commands.
+    precursorNms = set(mpCmd._ArgToList('PrecursorFieldNames'))
+    return [depNm for depNm in mpCmd.DependencyNms() or [] if depNm not in precursorNms]
+
+def FirstInEst(mpCmd,depEsts):
+    # Estimate for a command whose result is like its first input,
+    # e.g. a copy or a change of mask. None if that is unknown.
+    inNms = EstInNms(mpCmd)
+    if len(inNms) == 0 or depEsts.get(inNms[0]) is None:
+        return None
+    return dict(depEsts[inNms[0]])
+
+def ElementwiseEst(
+    mpCmd,          # the command
+    depEsts,        # dict of dependency result name: estimate or None
+    dtype=None,     # the result's type, None for that of numpy arithmetic on the inputs
+    masked=True,
+    ):
+
+    # Estimate for a command whose result has the shape of its first
+    # input array. None if any input is unknown.
+
+    inEsts = []
+    for inNm in EstInNms(mpCmd):
+        if depEsts.get(inNm) is None:
+            return None
+        if depEsts[inNm]['dtype'] is not None:
+            inEsts.append(depEsts[inNm])
+
+    if len(inEsts) == 0:
+        return None
+
+    if dtype is None:
+        dtype = np.result_type(*[inEst['dtype'] for inEst in inEsts])
+
+    return RsltEst(
+        inEsts[0]['shape'],
+        dtype,
+        masked=masked,
+        extraBytes=inEsts[0]['extraBytes'],
+        dimNms=inEsts[0]['dimNms']
+        )
+
+# def ElementwiseEst(...)
+
+def ReadCalibration(inFNm):
+    with open(inFNm,'r') as inF:
+        return json.load(inF)
+
+def WriteCalibration(calibration,outFNm):
+    with open(outFNm,'w') as outF:
+        json.dump(calibration,outF,indent=1,sort_keys=True)
+
+def CalibrationFromProfile(
+    profiler,       # MPilotProfiler of a run
+    estimator,      # MPilotEstimator of the same program
+    ):
+
+    # Calibration table of seconds per element for each command
+    # executed in the profiled run. Results loaded from a cache say
+    # nothing about a command's speed and are skipped.
+
+    secsByFxn = {}
+    elemsByFxn = {}
+    for rsltNm,record in profiler.Records().items():
+        if record['fromCache'] or rsltNm not in estimator.Records():
+            continue
+        workElems = estimator.Records()[rsltNm]['workElems']
+        if workElems == 0:
+            continue
+        fxnNm = record['fxnNm']
+        secsByFxn[fxnNm] = secsByFxn.get(fxnNm,0.) + record['wallSecs']
+        elemsByFxn[fxnNm] = elemsByFxn.get(fxnNm,0) + workElems
+
+    calibration = {CALIBRATION_DEFAULT_KEY:DEFAULT_SECS_PER_ELEM}
+    for fxnNm in secsByFxn:
+        calibration[fxnNm] = secsByFxn[fxnNm] / elemsByFxn[fxnNm]
+
+    totalElems = sum(elemsByFxn.values())
+    if totalElems > 0:
+        calibration[CALIBRATION_DEFAULT_KEY] = sum(secsByFxn.values()) / totalElems
+
+    return calibration
+
+# def CalibrationFromProfile(...)
+
+def _PhysMemBytes():
+
+    # Physical memory of the machine, None where it can't be found
+
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError,ValueError,OSError):
+        return None
+
+# def _PhysMemBytes():
+
+def _FormatBytes(nBytes):
+
+    if nBytes is None:
+        return '?'
+    for unit in ['B','KB','MB','GB']:
+        if nBytes < 1024:
+            return '{:.1f} {}'.format(nBytes,unit)
+        nBytes /= 1024.
+    return '{:.1f} TB'.format(nBytes)
+
+# def _FormatBytes(nBytes):
+
+class MPilotEstimator(object):
+
+    def __init__(
+        self,
+        orderedMPCmds,      # OrderedDict of commands in dependency order
+        calibration=None,   # dict of function name: seconds per element
+        keepRsltNms=None,   # Results never released, as with MPilotProgram.Run()
+        ):
+
+        self.orderedMPCmds = orderedMPCmds
+        self.calibration = {CALIBRATION_DEFAULT_KEY:DEFAULT_SECS_PER_ELEM}
+        if calibration is not None:
+            self.calibration.update(calibration)
+        self.keepRsltNms = set(keepRsltNms or [])
+        self.records = OrderedDict()
+        self.summary = None
+
+    # def __init__(...)
+
+    def _SecsPerElem(self,fxnNm):
+        return self.calibration.get(fxnNm,self.calibration[CALIBRATION_DEFAULT_KEY])
+
+    def _Peak(self,releaseRslts):
+
+        # Peak bytes of live results and the result after which it
+        # occurs, with commands executed in order. Unknown results
+        # count as nothing.
+
+        remainingUses = {}
+        if releaseRslts:
+            keepNms = set(self.keepRsltNms)
+            for mpCmd in self.orderedMPCmds.values():
+                keepNms.update(mpCmd.OutputNms())
+            for mpCmd in self.orderedMPCmds.values():
+                for depNm in set(mpCmd.DependencyNms() or []):
+                    if depNm not in keepNms and depNm in self.records:
+                        remainingUses[depNm] = remainingUses.get(depNm,0) + 1
+
+        liveBytes = 0
+        peakBytes = 0
+        peakRsltNm = None
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+            liveBytes += self.records[rsltNm]['nBytes'] or 0
+            if liveBytes > peakBytes:
+                peakBytes = liveBytes
+                peakRsltNm = rsltNm
+
+            for depNm in set(mpCmd.DependencyNms() or []):
+                if depNm not in remainingUses:
+                    continue
+                remainingUses[depNm] -= 1
+                if remainingUses[depNm] == 0:
+                    liveBytes -= self.records[depNm]['nBytes'] or 0
+
+        return peakBytes,peakRsltNm
+
+    # def _Peak(self,releaseRslts):
+
+    def Estimate(self):
+
+        self.records = OrderedDict()
+
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+            depEsts = {}
+            for depNm in mpCmd.DependencyNms() or []:
+                depEsts[depNm] = self.records[depNm]['est'] if depNm in self.records else None
+
+            est = mpCmd.EstimateRslt(depEsts)
+
+            # Work is the elements of the result and of its inputs
+            workElems = EstNElems(est)
+            for inNm in EstInNms(mpCmd):
+                workElems += EstNElems(depEsts.get(inNm))
+
+            self.records[rsltNm] = OrderedDict([
+                ('rsltNm',rsltNm),
+                ('fxnNm',mpCmd.FxnNm()),
+                ('est',est),
+                ('nBytes',EstNBytes(est)),
+                ('workElems',workElems),
+                ('secs',workElems * self._SecsPerElem(mpCmd.FxnNm())),
+                ])
+
+        # for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+        peakAllBytes,peakAllRsltNm = self._Peak(False)
+        peakReleasedBytes,peakReleasedRsltNm = self._Peak(True)
+
+        self.summary = {
+            'totalBytes':sum([record['nBytes'] or 0 for record in self.records.values()]),
+            'peakAllBytes':peakAllBytes,
+            'peakAllRsltNm':peakAllRsltNm,
+            'peakReleasedBytes':peakReleasedBytes,
+            'peakReleasedRsltNm':peakReleasedRsltNm,
+            'unknownRsltNms':[
+                rsltNm for rsltNm,record in self.records.items() if record['est'] is None
+                ],
+            'projectedSecs':sum([record['secs'] for record in self.records.values()]),
+            'physMemBytes':_PhysMemBytes(),
+            }
+
+        return self.summary
+
+    # def Estimate(self):
+
+    def Records(self):
+        return self.records
+
+    def Summary(self):
+        return self.summary
+
+    def FormattedReport(self,topN=20):
+
+        # Largest results first
+
+        records = sorted(
+            self.records.values(),
+            key=lambda record: record['nBytes'],
+            reverse=True
+            )
+        if topN is not None:
+            records = records[:topN]
+
+        rtrnStr = '{:<24} {:<24}{:>24}{:>10}{:>12}{:>10}\n'.format(
+            'Result','Command','Shape','DType','Bytes','Secs'
+            )
+        for record in records:
+            est = record['est']
+            if est is None:
+                shapeStr = dtypeStr = '?'
+            else:
+                shapeStr = 'x'.join([str(dimLen) for dimLen in est['shape']]) or '-'
+                dtypeStr = '-' if est['dtype'] is None else str(est['dtype'])
+            rtrnStr = '{}{:<24} {:<24}{:>24}{:>10}{:>12}{:>10.3f}\n'.format(
+                rtrnStr,
+                record['rsltNm'],
+                record['fxnNm'],
+                shapeStr,
+                dtypeStr,
+                _FormatBytes(record['nBytes']),
+                record['secs']
+                )
+
+        summary = self.summary
+        rtrnStr = '{}{}{}{}{}'.format(
+            rtrnStr,
+            '\nPeak live result bytes, all results kept: {}  After: {}\n'.format(
+                _FormatBytes(summary['peakAllBytes']),
+                summary['peakAllRsltNm']
+                ),
+            'Peak live result bytes, results released once used: {}  After: {}\n'.format(
+                _FormatBytes(summary['peakReleasedBytes']),
+                summary['peakReleasedRsltNm']
+                ),
+            'Physical memory: {}\n'.format(_FormatBytes(summary['physMemBytes'])),
+            'Projected run time: {:.3f} s\n'.format(summary['projectedSecs']),
+            )
+
+        if summary['physMemBytes'] is not None and \
+          summary['peakAllBytes'] > summary['physMemBytes']:
+            if summary['peakReleasedBytes'] > summary['physMemBytes']:
+                rtrnStr = '{}Results will not fit in memory. Consider a tiled run.\n'.format(rtrnStr)
+            else:
+                rtrnStr = '{}Results fit in memory only if released once used.\n'.format(rtrnStr)
+
+        if len(summary['unknownRsltNms']) > 0:
+            rtrnStr = '{}Results that could not be estimated (not counted): {}\n'.format(
+                rtrnStr,
+                ', '.join(summary['unknownRsltNms'])
+                )
+
+        return rtrnStr
+
+    # def FormattedReport(self,topN=20):
+
+# class MPilotEstimator(object):
@@ -0,0 +1,369 @@
+# Executes the commands of an MPilot program in dependency order.
+#
+# Commands can be run one after another (the default) or dispatched
+# to a pool of workers as soon as every command they depend on has
+# completed. Most of the heavy lifting in the MPilot libraries is done
+# by numpy, which releases the GIL for large array operations, so a
+# thread pool is usually sufficient. A process pool can be used for
+# commands that do most of their work in python.
+#
+# Results are identical to serial execution: a command only starts
+# after all of its dependencies are complete, and commands that have
+# side effects outside of the program (writing files, graphics,
+# printing) are run in script order relative to one another.
+#
+# With prefetchWorkers, the reads of input commands are done ahead of
+# time on a pool of I/O threads, so that I/O overlaps with computation
+# (see MPilotPrefetch.py). Not with useProcesses, where what was read
+# would have to be pickled to the worker anyway.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotExecutor
+#  Added profiling
+#  Added prefetching of input reads
+
+from multiprocessing.pool import ThreadPool
+import multiprocessing as mp
+import Queue
+import heapq
+import sys
+import traceback
+
+import MPilotPrefetch as mppre
+import MPilotProfiler as mpprof
+
+def _ProfiledExec(mpCmd,executedObjects,profile):
+    # Executes a command, returning its profiling stats (see
+    # MPilotProfiler.ProfiledCall()), or only its timing if not
+    # profiling (see MPilotProfiler.TimedCall())
+
+    if profile:
+        return mpprof.ProfiledCall(mpCmd.Exec,executedObjects)[1]
+
+    return mpprof.TimedCall(mpCmd.Exec,executedObjects)[1]
+
+# def _ProfiledExec(mpCmd,executedObjects,profile):
+
+def _ExecCmd(mpCmd,executedObjects,profile):
+    # Runs in a worker thread. Exceptions are passed back to the
+    # executor so that they can be raised in the calling thread
+    # with their original traceback.
+    try:
+        stats = _ProfiledExec(mpCmd,executedObjects,profile)
+        return (mpCmd.RsltNm(),mpCmd,None,stats)
+    except Exception:
+        return (mpCmd.RsltNm(),None,sys.exc_info(),None)
+
+# def _ExecCmd(mpCmd,executedObjects,profile):
+
+def _ExecCmdInProcess(mpCmd,depObjects,profile):
+    # Runs in a worker process. The command and the objects it
+    # depends on are pickled to the worker, and the executed command
+    # (with its result) is pickled back. Tracebacks cannot cross the
+    # process boundary, so the formatted traceback is returned.
+    try:
+        stats = _ProfiledExec(mpCmd,depObjects,profile)
+        return (mpCmd.RsltNm(),mpCmd,None,stats)
+    except Exception:
+        return (mpCmd.RsltNm(),None,traceback.format_exc(),None)
+
+# def _ExecCmdInProcess(mpCmd,depObjects,profile):
+
+class MPilotExecutor(object):
+
+    def __init__(
+        self,
+        orderedMPCmds,      # OrderedDict of commands in dependency order
+        executedObjects,    # dict to which executed commands add results
+        workers=None,       # number of workers, None or 1 for serial
+        useProcesses=False, # use a process pool instead of threads
+        loadFxn=None,       # see _Load()
+        profile=False,      # collect stats, see ExecStats()
+        prefetchWorkers=None,   # number of I/O threads, None for no prefetching
+        prefetchMaxBytes=mppre.DEFAULT_MAX_BYTES,
+        ):
+
+        self.orderedMPCmds = orderedMPCmds
+        self.executedObjects = executedObjects
+        self.workers = workers
+        self.useProcesses = useProcesses
+        self.loadFxn = loadFxn
+        self.profile = profile
+        self.prefetchWorkers = prefetchWorkers
+        self.prefetchMaxBytes = prefetchMaxBytes
+        self.prefetcher = None
+        self.execStats = {}
+
+    # def __init__(...)
+
+    def _BuildGraph(self):
+
+        # Dependencies are restricted to commands being executed.
+        # Anything else must already be in the executed objects.
+
+        self.cmdNdx = {}
+        self.dependents = {}
+        self.unmetCnt = {}
+        self.depNms = {}
+
+        for ndx,rsltNm in enumerate(self.orderedMPCmds):
+            self.cmdNdx[rsltNm] = ndx
+            self.dependents[rsltNm] = []
+
+        prevSerialNm = None
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+            depNms = set()
+            if mpCmd.DependencyNms() is not None:
+                depNms.update(
+                    [nm for nm in mpCmd.DependencyNms() if nm in self.cmdNdx]
+                    )
+
+            # Commands with side effects keep their script order
+            if mpCmd.ExecSerially():
+                if prevSerialNm is not None:
+                    depNms.add(prevSerialNm)
+                prevSerialNm = rsltNm
+
+            self.depNms[rsltNm] = depNms
+            self.unmetCnt[rsltNm] = len(depNms)
+            for depNm in depNms:
+                self.dependents[depNm].append(rsltNm)
+
+        # for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+    # def _BuildGraph(self):
+
+    def _Load(self,mpCmd):
+
+        # loadFxn(mpCmd,executedObjects) is called, in the calling
+        # thread, when a command is ready to run. It returns True if
+        # it supplied the command's result (e.g. from a cache), in
+        # which case the command is not executed.
+
+        if self.loadFxn is None:
+            return False
+
+        if self.profile:
+            loaded,stats = mpprof.ProfiledCall(self.loadFxn,mpCmd,self.executedObjects)
+        else:
+            loaded,stats = mpprof.TimedCall(self.loadFxn,mpCmd,self.executedObjects)
+
+        if loaded:
+            self.execStats[mpCmd.RsltNm()] = stats
+        return loaded
+
+    # def _Load(self,mpCmd):
+
+    def _Prefetched(self,mpCmd,loaded):
+
+        # mpCmd is about to be executed, or was loaded instead
+
+        if self.prefetcher is None:
+            return
+
+        if loaded:
+            self.prefetcher.Discard(mpCmd)
+        else:
+            self.prefetcher.Attach(mpCmd)
+
+    # def _Prefetched(self,mpCmd,loaded):
+
+    def _SerialExecIter(self):
+
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+            loaded = self._Load(mpCmd)
+            self._Prefetched(mpCmd,loaded)
+            if not loaded:
+                stats = _ProfiledExec(mpCmd,self.executedObjects,self.profile)
+                if stats is not None:
+                    self.execStats[rsltNm] = stats
+            yield rsltNm
+
+    # def _SerialExecIter(self):
+
+    def _Submit(self,pool,rsltNm,doneQ):
+
+        mpCmd = self.orderedMPCmds[rsltNm]
+
+        if self.useProcesses:
+            depObjects = {}
+            for depNm in mpCmd.DependencyNms() or []:
+                if depNm in self.executedObjects:
+                    depObjects[depNm] = self.executedObjects[depNm]
+            pool.apply_async(
+                _ExecCmdInProcess,
+                (mpCmd,depObjects,self.profile),
+                callback=doneQ.put
+                )
+        else:
+            pool.apply_async(
+                _ExecCmd,
+                (mpCmd,self.executedObjects,self.profile),
+                callback=doneQ.put
+                )
+
+    # def _Submit(self,pool,rsltNm,doneQ):
+
+    def _RaiseFailure(self,failures):
+
+        # Report the failure that serial execution would have hit first
+        rsltNm = min(failures,key=lambda nm: self.cmdNdx[nm])
+        excInfo = failures[rsltNm]
+
+        if self.useProcesses:
+            raise Exception(
+                '{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Command failed in worker process: {}\n'.format(rsltNm),
+                    'Worker traceback:\n{}\n'.format(excInfo)
+                    )
+                )
+        else:
+            raise excInfo[0],excInfo[1],excInfo[2]
+
+    # def _RaiseFailure(self,failures):
+
+    def _MakeDependentsReady(self,rsltNm,ready):
+
+        # rsltNm has completed
+
+        for depNm in self.dependents[rsltNm]:
+            self.unmetCnt[depNm] -= 1
+            if self.unmetCnt[depNm] == 0:
+                heapq.heappush(ready,(self.cmdNdx[depNm],depNm))
+
+    # def _MakeDependentsReady(self,rsltNm,ready):
+
+    def _ParallelExecIter(self):
+
+        self._BuildGraph()
+
+        if self.useProcesses:
+            pool = mp.Pool(self.workers)
+        else:
+            pool = ThreadPool(self.workers)
+
+        doneQ = Queue.Queue()
+        ready = [] # heap of (script order, rsltNm)
+        inFlight = 0
+        failures = {}
+
+        for rsltNm in self.orderedMPCmds:
+            if self.unmetCnt[rsltNm] == 0:
+                heapq.heappush(ready,(self.cmdNdx[rsltNm],rsltNm))
+
+        try:
+
+            while ready or inFlight > 0:
+
+                # Dispatch everything that can run, earliest in script first
+                while ready and not failures:
+                    ndx,rsltNm = heapq.heappop(ready)
+                    loaded = self._Load(self.orderedMPCmds[rsltNm])
+                    self._Prefetched(self.orderedMPCmds[rsltNm],loaded)
+                    if loaded:
+                        self._MakeDependentsReady(rsltNm,ready)
+                        yield rsltNm
+                    else:
+                        self._Submit(pool,rsltNm,doneQ)
+                        inFlight += 1
+
+                if inFlight == 0:
+                    break
+
+                # Wait with a timeout so that KeyboardInterrupt is
+                # delivered to the main thread
+                while True:
+                    try:
+                        rsltNm,rtrnCmd,excInfo,stats = doneQ.get(True,1.0)
+                        break
+                    except Queue.Empty:
+                        continue
+
+                inFlight -= 1
+
+                if excInfo is not None:
+                    failures[rsltNm] = excInfo
+                    continue
+
+                if stats is not None:
+                    self.execStats[rsltNm] = stats
+
+                if self.useProcesses:
+                    # Bring the worker's results back into our command
+                    mpCmd = self.orderedMPCmds[rsltNm]
+                    mpCmd.__dict__.update(rtrnCmd.__dict__)
+                    self.executedObjects[rsltNm] = mpCmd
+
+                self._MakeDependentsReady(rsltNm,ready)
+
+                if not failures:
+                    yield rsltNm
+
+            # while ready or inFlight > 0:
+
+        finally:
+
+            # Let commands already running finish before shutting down
+            while inFlight > 0:
+                try:
+                    doneQ.get(True,1.0)
+                    inFlight -= 1
+                except Queue.Empty:
+                    continue
+
+            pool.close()
+            pool.join()
+
+        if failures:
+            self._RaiseFailure(failures)
+
+    # def _ParallelExecIter(self):
+
+    def ExecStats(self,rsltNm):
+        # Stats for a completed command, see _ProfiledExec()
+        return self.execStats.get(rsltNm)
+
+    def _PrefetchedExecIter(self,execIter):
+
+        self.prefetcher = mppre.MPilotPrefetcher(
+            self.orderedMPCmds,
+            workers=self.prefetchWorkers,
+            maxBytes=self.prefetchMaxBytes
+            )
+
+        try:
+            for rsltNm in execIter:
+                yield rsltNm
+        finally:
+            self.prefetcher.Close()
+            self.prefetcher = None
+
+    # def _PrefetchedExecIter(self,execIter):
+
+    def ExecIter(self):
+        # Generator that executes the commands, yielding the result
+        # name of each command as it completes.
+
+        if self.workers is None or self.workers <= 1:
+            execIter = self._SerialExecIter()
+        else:
+            execIter = self._ParallelExecIter()
+
+        if self.prefetchWorkers and not self.useProcesses:
+            execIter = self._PrefetchedExecIter(execIter)
+
+        return execIter
+
+    # def ExecIter(self):
+
+    def Exec(self):
+
+        for rsltNm in self.ExecIter():
+            pass
+
+    # def Exec(self):
+
+# class MPilotExecutor(object):
@@ -1,7 +1,13 @@
 import re
 from MPCore import MPilotFxnParent as mpfp
+from MPCore import MPilotHash as mphash
+from MPCore import MPilotParse as mpparse
+from MPCore import MPilotParseMetadata as pmd
+from MPCore import MPilotRegistry as mpreg
+from MPCore import MPilotCmdStruct as mpcs
+from MPCore import MPilotArgTypes as mpat
 import importlib
-import inspect
+import hashlib
 from collections import OrderedDict
 
 class MPilotFramework(object):
@@ -18,6 +24,11 @@ class MPilotFramework(object):
     # if there is a package call MathLibs that contains a module
     # called Addition, you would pass in
     # ('.Addition','MathLibs')
+    #
+    # A module is not imported while its registry manifest (see
+    # MPilotRegistry.py) is current. Listing, describing and checking
+    # functions use the manifest, and the module is imported when one
+    # of its functions is created.
     
     def __init__(self, moduleSpecLst):
 
@@ -26,6 +37,8 @@ class MPilotFramework(object):
         self.moduleSpecLst = moduleSpecLst
         self.pilotFxnNmsByModule = {}
         self.pilotFxnClasses = {}
+        self.srcFNmsByModule = {}  # [(module name, source file), ...]
+        self.versionSig = None
         for modSpec in self.moduleSpecLst:
             self.AddModule(modSpec)
 
@@ -57,32 +70,35 @@ class MPilotFramework(object):
         # to the dict of PilotFxnClasses unless there is a name
         # conflict
 
+        # The functions of the module come from its registry manifest
+        # (see MPilotRegistry.py) if that is current, in which case
+        # the module is not imported until one of its functions is
+        # created (see _FxnClass()).
 
         # print 'importing', modSpec
 
-        if isinstance(modSpec,tuple):
-            mod = importlib.import_module(modSpec[0],package = modSpec[1])
-            modNm = '{}{}'.format(modSpec[1],modSpec[0])
-        else:
-            mod = importlib.import_module(modSpec)
-            modNm = modSpec
+        modNm = mpreg.ModuleNm(modSpec)
+
+        mod = None
+        manifest = None
+        srcFNm = mpreg.ModuleSrcFNm(modNm)
+        if srcFNm is not None:
+            manifest = mpreg.Load(mpreg.ManifestFNm(srcFNm),modNm)
+
+        if manifest is None:
+            mod = importlib.import_module(modNm)
+            manifest = mpreg.MakeManifest(mod,modNm)
+            if srcFNm is not None:
+                mpreg.Save(mpreg.ManifestFNm(srcFNm),manifest)
 
         self.pilotFxnNmsByModule[modNm] = []
+        self.srcFNmsByModule[modNm] = [
+            (srcModNm,srcFNm) for srcModNm,srcFNm,srcStat in manifest['srcStats']
+            ]
+        self.versionSig = None
             
-        for attNm in dir(mod):
-
-            attr = getattr(mod,attNm)
-
-            # We only want:
-            #   intended to be public
-            #   is a class
-            #   descended from mpfp._MPilotFxnParent
-            #   defined in the current module
-            if attNm.find('_') == 0: continue
-            if not inspect.isclass(attr): continue
-            if not issubclass(attr,mpfp._MPilotFxnParent): continue
-            if not getattr(mod,attNm).__module__ == modNm: continue
-            
+        for attNm,fxnDesc,formattedFxnDesc in manifest['fxns']:
+
             # Is it not a duplicate of loaded classes
             if attNm in self.pilotFxnClasses:
                 raise Exception(
@@ -95,11 +111,32 @@ class MPilotFramework(object):
                             )
                         )
                     )
-            self.pilotFxnClasses[attNm] = {'modNm':modNm,'mod':mod}
+            self.pilotFxnClasses[attNm] = {
+                'modNm':modNm,
+                'mod':mod,
+                'fxnDesc':fxnDesc,
+                'formattedFxnDesc':formattedFxnDesc,
+                }
             self.pilotFxnNmsByModule[modNm].append(attNm)
 
-        # for attNm in dir(mod):
+        # for attNm,fxnDesc,formattedFxnDesc in manifest['fxns']:
     # def AddModule(self,modNm):
+
+    def _FxnClass(self,pilotFxnNm):
+
+        # The class of a function, importing its module if it has
+        # not been
+
+        fxnClassInfo = self.pilotFxnClasses[pilotFxnNm]
+        if fxnClassInfo['mod'] is None:
+            modNm = fxnClassInfo['modNm']
+            mod = importlib.import_module(modNm)
+            for fxnNm in self.pilotFxnNmsByModule[modNm]:
+                self.pilotFxnClasses[fxnNm]['mod'] = mod
+
+        return getattr(fxnClassInfo['mod'],pilotFxnNm)
+
+    # def _FxnClass(self,pilotFxnNm):
         
     def CreateFxnObject(self,pilotFxnNm,mptCmdStruct=None):
 
@@ -113,19 +150,46 @@ class MPilotFramework(object):
                 )
         
         if mptCmdStruct is None:
-            rtrn = getattr(self.pilotFxnClasses[pilotFxnNm]['mod'],pilotFxnNm)()
+            rtrn = self._FxnClass(pilotFxnNm)()
         else:
-            rtrn = getattr(self.pilotFxnClasses[pilotFxnNm]['mod'],pilotFxnNm)(mptCmdStruct)
+            rtrn = self._FxnClass(pilotFxnNm)(mptCmdStruct)
 
         return rtrn
     # def CreateFxnObject(self,pilotFxnNm,pilotFxnArgs):
 
+    def CheckCmdStruct(self,mptCmdStruct):
+
+        # Checks that a parsed command names a function of the
+        # framework, with that function's arguments, without
+        # creating the command (and importing its library). Only
+        # names are checked: argument values need the library's
+        # validators, and are checked when the command is created.
+
+        pilotFxnNm = mptCmdStruct['parsedCmd']['cmd']
+        if pilotFxnNm not in self.pilotFxnClasses:
+            raise Exception(
+                '{}{}{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Function not in MPilot framework.\n',
+                    '  Function class name: {}\n'.format(pilotFxnNm),
+                    'File: {}  Line number: {}\n'.format(
+                        mptCmdStruct['cmdFileNm'],mptCmdStruct['lineNo']
+                        ),
+                    'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr'])
+                    )
+                )
+
+        mpfp.ValidateArgNms(self.pilotFxnClasses[pilotFxnNm]['fxnDesc'],mptCmdStruct)
+
+    # def CheckCmdStruct(self,mptCmdStruct):
+
     def GetAllFxnClassInfo(self):
         
+        # Copies of the shared descriptions, as OrderedDicts the
+        # caller may change
         rtrn = []
         for pilotFxnNm in sorted(self.pilotFxnClasses.keys()):
-            with getattr(self.pilotFxnClasses[pilotFxnNm]['mod'],pilotFxnNm)() as fxn:
-                rtrn.append(fxn.FxnDesc())
+            rtrn.append(self.pilotFxnClasses[pilotFxnNm]['fxnDesc'].AsOrderedDict())
 
         return rtrn
     
@@ -135,8 +199,7 @@ class MPilotFramework(object):
         
         rtrn = ''
         for pilotFxnNm in sorted(self.pilotFxnClasses.keys()):
-            with getattr(self.pilotFxnClasses[pilotFxnNm]['mod'],pilotFxnNm)() as fxn:
-                rtrn = '{}\n{}\n'.format(rtrn,fxn.FormattedFxnDesc())
+            rtrn = '{}\n{}\n'.format(rtrn,self.pilotFxnClasses[pilotFxnNm]['formattedFxnDesc'])
 
         return rtrn
     
@@ -144,13 +207,39 @@ class MPilotFramework(object):
 
     def FxnNames(self): return sorted(self.pilotFxnClasses.keys())
 
+    def VersionSig(self):
+
+        # Hash of the source of the modules defining the framework's
+        # functions and their parent classes, of the parsers, and of
+        # the command structs and argument validators. It
+        # changes when anything that parses or validates a command
+        # changes (see MPilotCompiled.py).
+
+        if self.versionSig is None:
+
+            srcFNms = dict([
+                (mod.__name__,mpreg.SrcFNm(mod)) for mod in [mpparse,pmd,mpcs,mpat]
+                ])
+            for modSrcFNms in self.srcFNmsByModule.values():
+                srcFNms.update(modSrcFNms)
+
+            modSigs = [
+                (modNm,mphash.FileHash(srcFNm))
+                for modNm,srcFNm in srcFNms.items() if srcFNm is not None
+                ]
+
+            self.versionSig = hashlib.sha1(repr(sorted(modSigs))).hexdigest()
+
+        return self.versionSig
+
+    # def VersionSig(self):
+
     def GetFxnFormattedClassInfo(self,pilotFxnNm):
 
         rtrn = None
         
-        if pilotFxnNm in self.pilotFxnClasses.keys():
-            with getattr(self.pilotFxnClasses[pilotFxnNm]['mod'],pilotFxnNm)() as fxn:
-                rtrn = fxn.FormattedFxnDesc()
+        if pilotFxnNm in self.pilotFxnClasses:
+            rtrn = self.pilotFxnClasses[pilotFxnNm]['formattedFxnDesc']
 
         return rtrn
     
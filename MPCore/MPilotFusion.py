@@ -0,0 +1,324 @@
+# Fused execution of chains of elementwise MPilot commands.
+#
+# EEMS models are mostly chains of elementwise operations on arrays
+# (CvtToFuzzy -> FuzzyNot -> FuzzyAnd -> FuzzyWeightedUnion, ...).
+# Executed one command at a time, each command allocates a full
+# array for its result, plus full sized temporaries for each step of
+# its arithmetic, and makes several passes over memory.
+#
+# FuseCmds() finds groups of elementwise commands where every result
+# but the last is used by exactly one command in the group and by
+# nothing else. MPilotFusedCmd evaluates such a group one block of
+# elements at a time, with block sized buffers for the intermediate
+# results, so only the last result of the group is a full array.
+#
+# Commands take part by overriding IsFusable(), FusedInNms(), and
+# FusedBlockExec() (see MPilotEEMSFxnParent.py). Before the blocks are
+# computed, the commands of a group are executed normally on the first
+# element of each input. This validates them exactly as Exec() would
+# and gives the data type and fill value of each result.
+#
+# File Log:
+# 2026.10.18
+#  Created with FuseCmds() and MPilotFusedCmd
+
+from collections import OrderedDict
+import copy as cp
+import numpy as np
+
+# Elements per block. With float64 data a block of each intermediate
+# result and its mask fits comfortably in a per core L2 cache.
+BLOCK_ELEMS = 1 << 14
+
+def FuseCmds(
+    staleCmds,      # OrderedDict of commands to run, in dependency order
+    allCmds,        # all of the program's commands
+    keepNms,        # results that must be kept as full arrays
+    ):
+
+    # Returns the commands to run, with each group replaced by an
+    # MPilotFusedCmd in the place of its last command, and a dict of
+    # the MPilotFusedCmds by result name.
+
+    # Users are found from the commands' current arguments, which
+    # SetArg() may have changed since the program was ordered
+    dependentNms = {}
+    for mpCmd in allCmds.values():
+        for depNm in mpCmd.DependencyNms() or []:
+            dependentNms.setdefault(depNm,set()).add(mpCmd.RsltNm())
+
+    # Commands folded into the command that uses their result
+    consumerNms = {}
+    for rsltNm,mpCmd in staleCmds.items():
+
+        if rsltNm in keepNms or not mpCmd.IsFusable():
+            continue
+
+        usedByNms = set(dependentNms.get(rsltNm,[]))
+        if len(usedByNms) != 1:
+            continue
+
+        consumerNm = usedByNms.pop()
+        if consumerNm not in staleCmds or \
+          not staleCmds[consumerNm].IsFusable() or \
+          rsltNm not in staleCmds[consumerNm].FusedInNms():
+            continue
+
+        consumerNms[rsltNm] = consumerNm
+
+    # for rsltNm,mpCmd in staleCmds.items():
+
+    # Group members by the command whose result the group computes.
+    # Commands are in dependency order, so that command comes last.
+    groups = {}
+    for rsltNm in staleCmds:
+        rootNm = rsltNm
+        while rootNm in consumerNms:
+            rootNm = consumerNms[rootNm]
+        groups.setdefault(rootNm,[]).append(staleCmds[rsltNm])
+
+    runCmds = OrderedDict()
+    fusedCmds = {}
+    for rsltNm,mpCmd in staleCmds.items():
+        if rsltNm in consumerNms:
+            continue
+        if len(groups[rsltNm]) > 1:
+            fusedCmds[rsltNm] = MPilotFusedCmd(groups[rsltNm])
+            runCmds[rsltNm] = fusedCmds[rsltNm]
+        else:
+            runCmds[rsltNm] = mpCmd
+
+    return runCmds,fusedCmds
+
+# def FuseCmds(...)
+
+class MPilotFusedCmd(object):
+
+    # Stands in for a group of commands in the executor. Looks like
+    # the group's last command, whose result it computes.
+
+    def __init__(self,memberCmds): # in dependency order, last is the root
+
+        self.memberCmds = memberCmds
+
+        memberNms = set([mpCmd.RsltNm() for mpCmd in memberCmds])
+
+        self.depNms = []
+        self.inNms = []
+        for mpCmd in memberCmds:
+            for depNm in mpCmd.DependencyNms() or []:
+                if depNm not in memberNms and depNm not in self.depNms:
+                    self.depNms.append(depNm)
+            for inNm in mpCmd.FusedInNms():
+                if inNm not in memberNms and inNm not in self.inNms:
+                    self.inNms.append(inNm)
+
+    # def __init__(self,memberCmds):
+
+    def RsltNm(self): return self.memberCmds[-1].RsltNm()
+
+    def RootCmd(self): return self.memberCmds[-1]
+
+    def MemberNms(self): return [mpCmd.RsltNm() for mpCmd in self.memberCmds]
+
+    def DependencyNms(self): return self.depNms
+
+    def HasSideEffects(self): return False
+
+    def ExecSerially(self): return False
+
+    def IsPrefetchable(self): return False
+
+    # Tiled execution (see MPilotTiler.py). Fusable commands are
+    # elementwise, so they neither read the grid nor need statistics
+    # of a whole array.
+
+    def FxnNm(self): return self.RootCmd().FxnNm()
+
+    def IsTileable(self): return all([mpCmd.IsTileable() for mpCmd in self.memberCmds])
+
+    def TileSourceShape(self): return None
+
+    def GlobalStatNms(self): return []
+
+    def OutputNms(self): return self.RootCmd().OutputNms()
+
+    @property
+    def tile(self): return self.RootCmd().tile
+
+    @tile.setter
+    def tile(self,tile):
+        for mpCmd in self.memberCmds:
+            mpCmd.tile = tile
+
+    @property
+    def execRslt(self): return self.RootCmd().execRslt
+
+    @execRslt.setter
+    def execRslt(self,execRslt):
+        for mpCmd in self.memberCmds:
+            mpCmd.execRslt = execRslt
+
+    def _CanFuse(self,executedObjects):
+
+        # Inputs must be non-empty numeric arrays of the same shape
+
+        shape = None
+        for inNm in self.inNms:
+            inArr = executedObjects[inNm].ExecRslt()
+            if not isinstance(inArr,np.ndarray) or \
+              inArr.ndim == 0 or inArr.size == 0 or \
+              inArr.dtype.kind not in 'biuf':
+                return False
+            if shape is None:
+                shape = inArr.shape
+            elif inArr.shape != shape:
+                return False
+
+        return True
+
+    # def _CanFuse(self,executedObjects):
+
+    def _ExecUnfused(self,executedObjects):
+
+        groupObjects = dict([(nm,executedObjects[nm]) for nm in self.depNms])
+        for mpCmd in self.memberCmds:
+            mpCmd.Exec(groupObjects)
+
+        for mpCmd in self.memberCmds[:-1]:
+            mpCmd.execRslt = None
+
+        executedObjects[self.RsltNm()] = self.RootCmd()
+
+    # def _ExecUnfused(self,executedObjects):
+
+    def _Probe(self,executedObjects):
+
+        # Executes the group on the first element of each input.
+        # Returns the (dtype, fill value) of each member's result.
+
+        probeObjects = {}
+        for depNm in self.depNms:
+            probeObjects[depNm] = executedObjects[depNm]
+        for inNm in self.inNms:
+            inArr = executedObjects[inNm].ExecRslt()
+            probeObjects[inNm] = cp.copy(executedObjects[inNm])
+            probeObjects[inNm].execRslt = inArr[(slice(0,1),) * inArr.ndim]
+
+        rtrn = {}
+        for mpCmd in self.memberCmds:
+            mpCmd.Exec(probeObjects)
+            probeRslt = mpCmd.ExecRslt()
+            rtrn[mpCmd.RsltNm()] = (
+                probeRslt.dtype,
+                getattr(probeRslt,'fill_value',None)
+                )
+
+        return rtrn
+
+    # def _Probe(self,executedObjects):
+
+    def Exec(self,executedObjects):
+
+        if not self._CanFuse(executedObjects):
+            self._ExecUnfused(executedObjects)
+            return
+
+        rsltInfo = self._Probe(executedObjects)
+
+        inArr = executedObjects[self.inNms[0]].ExecRslt()
+        shape = inArr.shape
+        nElems = inArr.size
+
+        # Flattened data and masks of the inputs. Masks are None when
+        # nothing is masked.
+        datas = {}
+        masks = {}
+        for inNm in self.inNms:
+            inArr = executedObjects[inNm].ExecRslt()
+            datas[inNm] = np.ascontiguousarray(np.ma.getdata(inArr)).reshape(-1)
+            inMask = np.ma.getmask(inArr)
+            if inMask is np.ma.nomask or not inMask.any():
+                masks[inNm] = None
+            else:
+                masks[inNm] = np.ascontiguousarray(inMask).reshape(-1)
+
+        # Block buffers for intermediate results, full arrays for the root
+        blockElems = min(BLOCK_ELEMS,nElems)
+        rootCmd = self.RootCmd()
+        bufs = {}
+        maskBufs = {}
+        for mpCmd in self.memberCmds[:-1]:
+            bufs[mpCmd.RsltNm()] = np.empty(blockElems,dtype=rsltInfo[mpCmd.RsltNm()][0])
+            maskBufs[mpCmd.RsltNm()] = np.empty(blockElems,dtype=bool)
+        rootData = np.empty(nElems,dtype=rsltInfo[rootCmd.RsltNm()][0])
+        rootMask = np.zeros(nElems,dtype=bool)
+
+        rsltMins = dict([(mpCmd.RsltNm(),None) for mpCmd in self.memberCmds])
+
+        for blockStart in range(0,nElems,blockElems):
+
+            blockEnd = min(blockStart + blockElems,nElems)
+            blockLen = blockEnd - blockStart
+
+            blockDatas = {}
+            blockMasks = {}
+            for inNm in self.inNms:
+                blockDatas[inNm] = datas[inNm][blockStart:blockEnd]
+                if masks[inNm] is None:
+                    blockMasks[inNm] = None
+                else:
+                    blockMasks[inNm] = masks[inNm][blockStart:blockEnd]
+
+            for mpCmd in self.memberCmds:
+
+                rsltNm = mpCmd.RsltNm()
+                if mpCmd is rootCmd:
+                    outBlock = rootData[blockStart:blockEnd]
+                    outMask = rootMask[blockStart:blockEnd]
+                else:
+                    outBlock = bufs[rsltNm][:blockLen]
+                    outMask = maskBufs[rsltNm][:blockLen]
+                    outMask[:] = False
+
+                inNms = mpCmd.FusedInNms()
+                extraMask = mpCmd.FusedBlockExec(
+                    [blockDatas[inNm] for inNm in inNms],
+                    outBlock
+                    )
+
+                # Masked where any input is masked, as with numpy.ma
+                for inNm in set(inNms):
+                    if blockMasks[inNm] is not None:
+                        np.logical_or(outMask,blockMasks[inNm],out=outMask)
+                if extraMask is not None:
+                    np.logical_or(outMask,extraMask,out=outMask)
+
+                blockDatas[rsltNm] = outBlock
+                blockMasks[rsltNm] = outMask
+
+                if mpCmd.FusedRsltMinNeeded() and not outMask.all():
+                    blockMin = outBlock[~outMask].min()
+                    if rsltMins[rsltNm] is None or blockMin < rsltMins[rsltNm]:
+                        rsltMins[rsltNm] = blockMin
+
+            # for mpCmd in self.memberCmds:
+
+        # for blockStart in range(0,nElems,blockElems):
+
+        for mpCmd in self.memberCmds:
+            mpCmd.SetFusedDataType(rsltMins[mpCmd.RsltNm()])
+            if mpCmd is not rootCmd:
+                mpCmd.execRslt = None
+
+        rootCmd.execRslt = np.ma.array(
+            rootData.reshape(shape),
+            mask=rootMask.reshape(shape),
+            fill_value=rsltInfo[rootCmd.RsltNm()][1]
+            )
+
+        executedObjects[self.RsltNm()] = rootCmd
+
+    # def Exec(self,executedObjects):
+
+# class MPilotFusedCmd(object):
@@ -0,0 +1,216 @@
+# Function descriptions of MPilot commands.
+#
+# A command class describes its function in _SetFxnDesc(), which fills
+# in an OrderedDict of the function's name, display name, description,
+# return type, and required and optional arguments with their types.
+# _MPilotFxnParent runs _SetFxnDesc() once for each class and keeps the
+# result as an MPilotFxnDesc, which every command of the class shares
+# as its fxnDesc (see _MPilotFxnParent._FxnDescOfClass()). Because it
+# is shared it cannot be changed; a command that needs a different
+# description gives itself a new one with Replace(). AsOrderedDict()
+# gives a copy that can be changed.
+#
+# An MPilotFxnDesc is read like the OrderedDict it replaces, e.g.
+# fxnDesc['ReqArgs']['InFieldName']. Its dicts and lists are read only
+# as well, and its lists are still lists, as code checking argument
+# types expects. For validation, it keeps the names of the required and
+# optional arguments as sets, and the types each argument can be as a
+# list.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotFxnDesc
+
+from collections import OrderedDict
+
+def _ReadOnlyError(obj):
+    return TypeError('{} of a function description cannot be changed'.format(type(obj).__name__))
+
+class _ReadOnlyDict(object):
+
+    # A dict in a function description, e.g. ReqArgs. It keeps the
+    # order of the dict it was made from, which help output follows.
+
+    __slots__ = ('_keys','_vals')
+
+    def __init__(self,items=()):
+        vals = {}
+        keys = []
+        for key,val in items:
+            if key not in vals:
+                keys.append(key)
+            vals[key] = val
+        object.__setattr__(self,'_keys',tuple(keys))
+        object.__setattr__(self,'_vals',vals)
+
+    def __setattr__(self,attrNm,attrVal): raise _ReadOnlyError(self)
+
+    def __getitem__(self,key): return self._vals[key]
+
+    def __contains__(self,key): return key in self._vals
+
+    def __iter__(self): return iter(self._keys)
+
+    def __len__(self): return len(self._keys)
+
+    def get(self,key,default=None): return self._vals.get(key,default)
+
+    def keys(self): return list(self._keys)
+
+    def values(self): return [self._vals[key] for key in self._keys]
+
+    def items(self): return [(key,self._vals[key]) for key in self._keys]
+
+    def iterkeys(self): return iter(self._keys)
+
+    def itervalues(self): return iter(self.values())
+
+    def iteritems(self): return iter(self.items())
+
+    def __eq__(self,other):
+        if isinstance(other,_ReadOnlyDict):
+            return self._vals == other._vals
+        return self._vals == other
+
+    def __ne__(self,other): return not self == other
+
+    def __repr__(self):
+        return '{{{}}}'.format(', '.join(['{!r}: {!r}'.format(key,val) for key,val in self.items()]))
+
+    # Immutable, so copies are the original
+    def __copy__(self): return self
+
+    def __deepcopy__(self,memo): return self
+
+    def __reduce__(self): return (_ReadOnlyDict,(self.items(),))
+
+# class _ReadOnlyDict(object):
+
+class _ReadOnlyList(list):
+
+    # A list in a function description, e.g. the types an argument
+    # can be
+
+    def _Refuse(self,*args,**kwargs): raise _ReadOnlyError(self)
+
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _Refuse
+    __iadd__ = __imul__ = _Refuse
+    append = extend = insert = pop = remove = reverse = sort = _Refuse
+
+    # Immutable, so copies are the original
+    def __copy__(self): return self
+
+    def __deepcopy__(self,memo): return self
+
+    def __reduce__(self): return (_ReadOnlyList,(list(self),))
+
+# class _ReadOnlyList(list):
+
+def _ReadOnly(descVal):
+
+    # descVal, with the dicts and lists in it read only
+
+    if isinstance(descVal,dict):
+        return _ReadOnlyDict([(key,_ReadOnly(val)) for key,val in descVal.items()])
+    if isinstance(descVal,list):
+        return _ReadOnlyList([_ReadOnly(val) for val in descVal])
+    return descVal
+
+# def _ReadOnly(descVal):
+
+def _Changeable(descVal):
+
+    # descVal, with its read only dicts and lists copied to
+    # OrderedDicts and lists
+
+    if isinstance(descVal,_ReadOnlyDict):
+        return OrderedDict([(key,_Changeable(val)) for key,val in descVal.items()])
+    if isinstance(descVal,_ReadOnlyList):
+        return [_Changeable(val) for val in descVal]
+    return descVal
+
+# def _Changeable(descVal):
+
+class MPilotFxnDesc(object):
+
+    __slots__ = ('_desc','reqArgNms','optArgNms','argNms','argTypeItems')
+
+    def __init__(self,descItems):
+
+        desc = OrderedDict()
+        for descKey,descVal in descItems:
+            desc[descKey] = _ReadOnly(descVal)
+        object.__setattr__(self,'_desc',desc)
+
+        reqArgs = desc.get('ReqArgs',_ReadOnlyDict())
+        optArgs = desc.get('OptArgs',_ReadOnlyDict())
+
+        # (argument name, [type, ...]), required arguments first.
+        # Where an argument is both required and optional, its
+        # optional types are used.
+        argTypes = OrderedDict(reqArgs.items())
+        argTypes.update(optArgs.items())
+        argTypeItems = []
+        for argNm,argType in argTypes.items():
+            if not isinstance(argType,list):
+                argType = _ReadOnlyList([argType])
+            argTypeItems.append((argNm,argType))
+
+        object.__setattr__(self,'reqArgNms',frozenset(reqArgs))
+        object.__setattr__(self,'optArgNms',frozenset(optArgs))
+        object.__setattr__(self,'argNms',frozenset(argTypes))
+        object.__setattr__(self,'argTypeItems',tuple(argTypeItems))
+
+    # def __init__(self,descItems):
+
+    def __setattr__(self,attrNm,attrVal): raise _ReadOnlyError(self)
+
+    def __getitem__(self,descKey): return self._desc[descKey]
+
+    def __contains__(self,descKey): return descKey in self._desc
+
+    def __iter__(self): return iter(self._desc)
+
+    def __len__(self): return len(self._desc)
+
+    def get(self,descKey,default=None): return self._desc.get(descKey,default)
+
+    def keys(self): return self._desc.keys()
+
+    def values(self): return self._desc.values()
+
+    def items(self): return self._desc.items()
+
+    def iterkeys(self): return self._desc.iterkeys()
+
+    def itervalues(self): return self._desc.itervalues()
+
+    def iteritems(self): return self._desc.iteritems()
+
+    def Replace(self,**descVals):
+        # A copy with entries set to descVals
+        desc = OrderedDict(self._desc)
+        desc.update(descVals)
+        return MPilotFxnDesc(desc.items())
+
+    def AsOrderedDict(self):
+        # A copy that can be changed, as _SetFxnDesc() made it
+        return OrderedDict([(descKey,_Changeable(descVal)) for descKey,descVal in self._desc.items()])
+
+    def __eq__(self,other):
+        if isinstance(other,MPilotFxnDesc):
+            return self._desc == other._desc
+        return self._desc == other
+
+    def __ne__(self,other): return not self == other
+
+    def __repr__(self): return 'MPilotFxnDesc({!r})'.format(self._desc.items())
+
+    # Immutable, so copies are the original
+    def __copy__(self): return self
+
+    def __deepcopy__(self,memo): return self
+
+    def __reduce__(self): return (MPilotFxnDesc,(self._desc.items(),))
+
+# class MPilotFxnDesc(object):
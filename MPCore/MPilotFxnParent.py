@@ -9,44 +9,116 @@
 from collections import OrderedDict
 import copy as cp
 import MPilotParseMetadata as pmd
+import MPilotCmdStruct as mpcs
+import MPilotArgTypes as mpat
+import MPilotFxnDesc as mpfd
+
+def ValidateArgNms(fxnDesc,mptCmdStruct):
+
+    # Checks that a command has the required arguments of the
+    # function MPilotFxnDesc fxnDesc describes, and no arguments the
+    # function does not have. Needs only the description, not the
+    # function (see MPilotFramework.CheckCmdStruct()).
+
+    reqArgsSet = fxnDesc.reqArgNms
+    inArgsSet = set(mptCmdStruct['parsedCmd']['arguments'].keys())
+
+    # are all required args there?
+    if not reqArgsSet.issubset(inArgsSet):
+        raise Exception(
+            '{}{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Missing input argument(s):\n  {}\n'.format(
+                    ' '.join(reqArgsSet - inArgsSet)
+                    ),
+                'File: {}  Line number: {}\n'.format(
+                    mptCmdStruct['cmdFileNm'],mptCmdStruct['lineNo']
+                    ),
+                'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr'])
+                ),
+            )
+
+    # are all of the args either optional or required?
+    if not inArgsSet.issubset(fxnDesc.argNms):
+        raise Exception(
+            '{}{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Invalid input argument(s):\n  {}\n'.format(
+                    ' '.join(inArgsSet - fxnDesc.argNms)
+                    ),
+                'File: {}  Line number: {}\n'.format(
+                    mptCmdStruct['cmdFileNm'],mptCmdStruct['lineNo']
+                    ),
+                'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr'])
+                ),
+            )
+
+# def ValidateArgNms(fxnDesc,mptCmdStruct):
+
+class _ClassFxnDesc(object):
+
+    # The fxnDesc attribute of commands: the MPilotFxnDesc of the
+    # command's class (see _MPilotFxnParent._FxnDescOfClass()), unless
+    # the command has been given one of its own
+
+    def __get__(self,mpCmd,cls): return cls._FxnDescOfClass()
+
+# class _ClassFxnDesc(object):
 
 class _MPilotFxnParent(object):
 
+    fxnDesc = _ClassFxnDesc()
+
     def __init__(self,mptCmdStruct = None):
 
         # self.mptCmdStruct contains information about the MPilot command
         # that is used to order commands, check command validity,
         # and provide detailed information in error messages.
+        # It is an MPilotCmdStruct, which cannot be changed in place,
+        # so it is shared with the parser and with copies of this
+        # command rather than copied (see MPilotCmdStruct.py).
 
         # The arguments that are used in executing the command
         
         self.execRslt = None
-        self.fxnDesc = OrderedDict()
-        self.fxnDesc['Name'] = self.__class__.__name__
-        self._SetFxnDesc()
+        self.tile = None    # MPilotTile during tiled execution
+        self.prefetched = None  # see SetPrefetched()
+        self.argValCache = None  # see ValFromArgByNm()
 
         if mptCmdStruct is None:
             
-            self.mptCmdStruct = {
-                'cmdFileNm':None,
-                'lineNo':None,
-                'rawCmdStr':None,
-                'cleanCmdStr':None,
-                'parsedCmd':None
-                }
-
-            self.mptCmdStruct['parsedCmd'] = {}
-            self.mptCmdStruct['parsedCmd']['arguments'] = {}
+            self.mptCmdStruct = mpcs.EMPTY_CMD_STRUCT
                 
         else:
             
-            self.mptCmdStruct = cp.deepcopy(mptCmdStruct)
+            self.mptCmdStruct = mpcs.CmdStructFromDict(mptCmdStruct)
             self._ValidateStrCmd()
             
         # if mptCmdStruct is None:
 
     # def __init__(...)
 
+    @classmethod
+    def _FxnDescOfClass(cls):
+
+        # The description of the class's function, made by
+        # _SetFxnDesc() the first time it is asked for and shared by
+        # all commands of the class (see MPilotFxnDesc.py)
+
+        fxnDesc = cls.__dict__.get('_clsFxnDesc')
+        if fxnDesc is None:
+            protoCmd = cls.__new__(cls)
+            protoCmd.mptCmdStruct = mpcs.EMPTY_CMD_STRUCT
+            protoCmd.fxnDesc = OrderedDict()
+            protoCmd.fxnDesc['Name'] = cls.__name__
+            protoCmd._SetFxnDesc()
+            fxnDesc = mpfd.MPilotFxnDesc(protoCmd.fxnDesc.items())
+            cls._clsFxnDesc = fxnDesc
+
+        return fxnDesc
+
+    # def _FxnDescOfClass(cls):
+
     def _SetFxnDesc(self):
         # description of command used for validation and
         # information display Each Pilot fxn command should have its
@@ -91,62 +163,26 @@ class _MPilotFxnParent(object):
         # Assumes syntax of parsed command is valid
         # Right now, does not check result name
 
-        cmdArgs = self.mptCmdStruct['parsedCmd']['arguments']
+        fxnDesc = self.fxnDesc
+        cmdArgs = self.mptCmdStruct.parsedCmd.arguments
 
-        reqArgsSet = set(self.fxnDesc['ReqArgs'])
-        optArgSet = set(self.fxnDesc['OptArgs'])
-        inArgsSet = set(cmdArgs.keys())
-
-        # are all required args there?
-        if not reqArgsSet.issubset(inArgsSet):
-            raise Exception(
-                '{}{}{}{}'.format(
-                    '\n********************ERROR********************\n',
-                    'Missing input argument(s):\n  {}\n'.format(
-                        ' '.join(reqArgsSet - inArgsSet)
-                        ),
-                    'File: {}  Line number: {}\n'.format(
-                        self.mptCmdStruct['cmdFileNm'],self.mptCmdStruct['lineNo']
-                        ),
-                    'Full command:\n{}\n'.format(self.mptCmdStruct['rawCmdStr'])
-                    ),
-                )
-
-        # are all of the args either optional or required?
-        if not inArgsSet.issubset(set.union(reqArgsSet,optArgSet)):
-            raise Exception(
-                '{}{}{}{}'.format(
-                    '\n********************ERROR********************\n',
-                    'Invalid input argument(s):\n  {}\n'.format(
-                        ' '.join(inArgsSet - set.union(reqArgsSet,optArgSet))
-                        ),
-                    'File: {}  Line number: {}\n'.format(
-                        self.mptCmdStruct['cmdFileNm'],self.mptCmdStruct['lineNo']
-                        ),
-                    'Full command:\n{}\n'.format(self.mptCmdStruct['rawCmdStr'])
-                    ),
-                )
+        # are all required args there, and all of the args either
+        # optional or required?
+        ValidateArgNms(fxnDesc,self.mptCmdStruct)
 
         # Is the result name a valid field name
-        self._ValidateArgType(self.mptCmdStruct['parsedCmd']['rsltNm'],'Field Name')
+        self._ValidateArgType(self.mptCmdStruct.parsedCmd.rsltNm,'Field Name')
         
         # Are the all the args of the correct type?
-        # loop through the allowed argument
-        descArgs = cp.deepcopy(self.fxnDesc['ReqArgs'])
-        descArgs.update(self.fxnDesc['OptArgs'])
-
-        for descArgNm,descArgType in descArgs.items():
+        # loop through the allowed argument, each with a list
+        # of the types it can be
+        for descArgNm,descArgType in fxnDesc.argTypeItems:
 
             # if the arg was not in the input args,
             # don't worry about it
-            if descArgNm not in inArgsSet: 
+            if descArgNm not in cmdArgs: 
                 continue
             
-            # arg type spec can be list, if not make it a
-            # list for ease of coding this
-            if not isinstance(descArgType,list):
-                descArgType = [descArgType]
-
             # loop through the valid arg types
             
             argIsValid = False
@@ -341,6 +377,75 @@ class _MPilotFxnParent(object):
             )
     
     # def _IsArgType(self,inStr,inType):
+
+    # Element checks of the argument types a command accepts (see
+    # MPilotArgTypes.py), set by the parent classes that define
+    # _IsArgType() with _ArgTypeValidator()
+    _ARG_ELEM_CHECKS = {}
+
+    @classmethod
+    def _MakeArgTypeValidator(cls,argType):
+        return mpat.MakeValidator(argType,cls._ARG_ELEM_CHECKS)
+
+    @classmethod
+    def _ArgTypeValidator(cls,argType):
+
+        # The validator for argType, made once for each class
+
+        validators = cls.__dict__.get('_argTypeValidators')
+        if validators is None:
+            validators = {}
+            cls._argTypeValidators = validators
+
+        validator = validators.get(argType)
+        if validator is None:
+            validator = cls._MakeArgTypeValidator(argType)
+            validators[argType] = validator
+
+        return validator
+
+    # def _ArgTypeValidator(cls,argType):
+
+    def ValFromArgByNm(self,argNm):
+
+        # The value of an argument, converted from its string by
+        # _ConvertArgByNm() the first time it is asked for. The values
+        # are kept with the command struct they came from, so changing
+        # an argument (SetArg()) means converting again. Lists are
+        # copied because callers change them.
+
+        argValCache = self.argValCache
+        if argValCache is None or argValCache[0] is not self.mptCmdStruct:
+            argValCache = (self.mptCmdStruct,{})
+            self.argValCache = argValCache
+
+        argVals = argValCache[1]
+        if argNm in argVals:
+            rtrn = argVals[argNm]
+        else:
+            rtrn = self._ConvertArgByNm(argNm)
+            argVals[argNm] = rtrn
+
+        if isinstance(rtrn,list):
+            rtrn = list(rtrn)
+
+        return rtrn
+
+    # def ValFromArgByNm(self,argNm):
+
+    def _ConvertArgByNm(self,argNm):
+
+        raise Exception(
+            '{}{}{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Programming error:\n',
+                '  Your program is using the inherited _MPilotFxnParent:_ConvertArgByNm() method.',
+                '  There should be a unique _ConvertArgByNm() method for the defined MPilot command.',
+                '  Check and correct the class definition of the MPilot command: {}\n'.format(self.fxnDesc['Name']),
+                ),
+            )
+
+    # def _ConvertArgByNm(self,argNm):
                     
     def __enter__(self):
         return(self)
@@ -353,7 +458,7 @@ class _MPilotFxnParent(object):
 
     def InitFromParsedCmd(self,parsedCmd):
         
-        self.mptCmdStruct['parsedCmd'] = cp.deepcopy(parsedCmd)
+        self.mptCmdStruct = self.mptCmdStruct.Replace(parsedCmd=mpcs.ParsedCmdFromDict(parsedCmd))
         self.InitRawCmdFromParsedCmd()
         self.InitCleanCmdFromParsedCmd()
         
@@ -379,26 +484,29 @@ class _MPilotFxnParent(object):
 
     # def ArgTypesFromArg(self,argNm):
     
-    def SetRsltNm(self,nm): self.mptCmdStruct['parsedCmd']['rsltNm'] = nm
+    # Each of these gives this command a new struct, leaving the one
+    # it had to whatever else shares it
+
+    def SetRsltNm(self,nm): self.mptCmdStruct = self.mptCmdStruct.ReplaceParsed(rsltNm=nm)
 
     def SetArg(self,argNm,value):
-        self.mptCmdStruct['parsedCmd']['arguments'][argNm] = cp.deepcopy(value)
+        self.mptCmdStruct = self.mptCmdStruct.ReplaceArg(argNm,value)
 
-    def SetCmdFileNm(self,nm): self.mptCmdStruct['cmdFileNm'] = nm
+    def SetCmdFileNm(self,nm): self.mptCmdStruct = self.mptCmdStruct.Replace(cmdFileNm=nm)
         
-    def SetLinNo(self,num): self.mptCmdStruct['LineNo'] = nm
+    def SetLinNo(self,num): self.mptCmdStruct = self.mptCmdStruct.Replace(lineNo=num)
         
-    def SetRawCmdStr(self,cmdStr): self.mptCmdStruct['rawCmdStr'] = cmdStr
+    def SetRawCmdStr(self,cmdStr): self.mptCmdStruct = self.mptCmdStruct.Replace(rawCmdStr=cmdStr)
         
-    def SetCleanCmdStr(self,cmdStr): self.mptCmdStruct['cleanCmdStr'] = cmdStr
+    def SetCleanCmdStr(self,cmdStr): self.mptCmdStruct = self.mptCmdStruct.Replace(cleanCmdStr=cmdStr)
         
     # MPilot Function description access
     def ArgExists(self,nm):
         
         rtrn = False
         if self.mptCmdStruct is not None:
-            if 'parsedCmd' in self.mptCmdStruct:
-                rtrn = nm in self.mptCmdStruct['parsedCmd']['arguments']
+            if self.mptCmdStruct.parsedCmd is not None:
+                rtrn = nm in self.mptCmdStruct.parsedCmd.arguments
         return rtrn
     
     def RsltNm(self): return self.mptCmdStruct['parsedCmd']['rsltNm']
@@ -447,15 +555,15 @@ class _MPilotFxnParent(object):
 
     def StrCmd(self): return self.mptCmdStruct
         
-    def CmdFileNm(self): return self.mptCmdStruct['cmdFileNm']
+    def CmdFileNm(self): return self.mptCmdStruct.cmdFileNm
         
-    def LineNo(self): return self.mptCmdStruct['lineNo']
+    def LineNo(self): return self.mptCmdStruct.lineNo
         
-    def RawCmdStr(self): return self.mptCmdStruct['rawCmdStr']
+    def RawCmdStr(self): return self.mptCmdStruct.rawCmdStr
         
-    def CleanCmdStr(self): return self.mptCmdStruct['cleanCmdStr']
+    def CleanCmdStr(self): return self.mptCmdStruct.cleanCmdStr
         
-    def ParsedCmd(self): return self.mptCmdStruct['parsedCmd']
+    def ParsedCmd(self): return self.mptCmdStruct.parsedCmd
 
     def FormattedCmd(self):
         
@@ -497,22 +605,22 @@ class _MPilotFxnParent(object):
         self.SetCleanCmdStr(newCmdStr)
         
     def RsltNm(self):
-        if self.mptCmdStruct['parsedCmd'] is not None:
-            return self.mptCmdStruct['parsedCmd']['rsltNm']
+        if self.mptCmdStruct.parsedCmd is not None:
+            return self.mptCmdStruct.parsedCmd.rsltNm
         else:
             return None
         
     def Args(self):
-        if self.mptCmdStruct['parsedCmd'] is not None:
-            return self.mptCmdStruct['parsedCmd']['arguments']
+        if self.mptCmdStruct.parsedCmd is not None:
+            return self.mptCmdStruct.parsedCmd.arguments
         else:
             return None
         
     def ArgByNm(self, argNm):
         rtrn = None
-        if self.mptCmdStruct['parsedCmd'] is not None:
-            if argNm in self.mptCmdStruct['parsedCmd']['arguments']:
-                rtrn = self.mptCmdStruct['parsedCmd']['arguments'][argNm]
+        parsedCmd = self.mptCmdStruct.parsedCmd
+        if parsedCmd is not None:
+            rtrn = parsedCmd.arguments.get(argNm)
         return rtrn
 
     def MetadataByKey(self, metaDataKey):
@@ -536,6 +644,127 @@ class _MPilotFxnParent(object):
         # and return them
         return None
 
+    def HasSideEffects(self):
+        # Commands with side effects outside of the program (writing
+        # files, graphics, printing) return True. They are always
+        # executed: their results are never taken from a cache, and
+        # they are never treated as duplicates of another command.
+        return False
+
+    def ExecSerially(self):
+        # Commands that, when a program is run in parallel, must be
+        # run in script order relative to one another return True.
+        # By default, those with side effects.
+        return self.HasSideEffects()
+
+    def AdoptExecState(self):
+        # Called after the command is given the execution state of
+        # another command computing the same result (the command it
+        # duplicates, or a cached result) instead of being executed.
+        # Commands whose results carry their own result name or
+        # command text make those the command's own here.
+        return
+
+    def ExecSigExtras(self):
+        # Anything other than the command's function, arguments,
+        # input files, and dependencies that its result depends on.
+        # Used in keys for cached results.
+        return ()
+
+    def OutputNms(self):
+        # Names of the results this command writes out of the
+        # program. These are kept when a program is run with
+        # releaseRslts.
+        return []
+
+    def IsFusable(self):
+        # Elementwise commands that can be evaluated block by block
+        # in a fused kernel return True. See MPilotFusion.py.
+        return False
+
+    def IsTileable(self):
+        # Commands that can be executed one tile of the data at a
+        # time return True. See MPilotTiler.py.
+        return False
+
+    def IsPrefetchable(self):
+        # Commands that do their reading in ReadInput() return True.
+        # Their reads can then be done ahead of Exec(), in a
+        # background thread. See MPilotPrefetch.py.
+        return False
+
+    def ReadInput(self):
+        # For prefetchable commands, reads and returns the input
+        # Exec() needs. Must not use other results, or change the
+        # command.
+        return None
+
+    def SetPrefetched(self,prefetched):
+        # prefetched has a Take() method returning what ReadInput()
+        # returned, or None if it wasn't read ahead
+        self.prefetched = prefetched
+
+    def _TakeInput(self):
+        # For Exec(): the input read ahead of time, or read now
+
+        prefetched = self.prefetched
+        self.prefetched = None
+
+        inputData = None
+        if prefetched is not None:
+            inputData = prefetched.Take()
+        if inputData is None:
+            inputData = self.ReadInput()
+
+        return inputData
+
+    # def _TakeInput(self):
+
+    def TileSourceShape(self):
+        # Commands that read data return the shape of the full grid
+        # they read, for tiled execution.
+        return None
+
+    def EstimateRslt(self,depEsts):
+        # For a dry run, an estimate of the command's result made
+        # without executing it, from depEsts, a dict of dependency
+        # result name: estimate (None where unknown). Returns an
+        # estimate from MPilotEstimate.RsltEst(), or None if the
+        # result can't be estimated. See MPilotEstimate.py.
+        return None
+
+    def _FileArgVals(self,isOut):
+
+        # Values of the command's File Name arguments. Arguments
+        # whose names start with Out are for output.
+        
+        rtrn = []
+        if self.Args() is None:
+            return rtrn
+        
+        for argNm in self.Args():
+            
+            if argNm.startswith('Out') != isOut:
+                continue
+            
+            argTypes = self.ArgTypesFromArg(argNm)
+            if not isinstance(argTypes,list): argTypes = [argTypes]
+            
+            if 'File Name' in argTypes or 'File Name List' in argTypes:
+                rtrn += self._ArgToList(argNm)
+
+        return rtrn
+
+    # def _FileArgVals(self,isOut):
+
+    def InFileNms(self):
+        # Files the command reads
+        return self._FileArgVals(False)
+
+    def OutFileNms(self):
+        # Files (or directories) the command may write
+        return self._FileArgVals(True)
+
     # Execute the command
     def Exec(self,executedObjects):
         # This is where the the execution string gets built
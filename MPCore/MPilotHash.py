@@ -0,0 +1,64 @@
+# Signatures of MPilot commands and the files they read, used to
+# tell whether a command needs to be executed again.
+#
+# File Log:
+# 2026.10.18
+#  Created with ArgsSig(), FileStat(), and FileHash()
+#  Added CmdKey()
+
+import hashlib
+import os
+
+def ArgsSig(mpCmd):
+    # The function name and parsed arguments of a command in a form
+    # that can be compared and hashed. Argument order in the script
+    # does not matter.
+
+    parsedCmd = mpCmd.ParsedCmd()
+    if parsedCmd is None:
+        return (mpCmd.FxnNm(),())
+
+    return (mpCmd.FxnNm(),tuple(sorted(parsedCmd['arguments'].items())))
+
+# def ArgsSig(mpCmd):
+
+def FileStat(fNm):
+    # (size, modification time) of a file, None if it does not exist
+
+    try:
+        fStat = os.stat(fNm)
+    except OSError:
+        return None
+
+    return (fStat.st_size,fStat.st_mtime)
+
+# def FileStat(fNm):
+
+def FileHash(fNm,blockSize=1<<20):
+    # sha1 of a file's contents, None if it does not exist
+
+    if not os.path.isfile(fNm):
+        return None
+
+    fHash = hashlib.sha1()
+    with open(fNm,'rb') as inF:
+        while True:
+            block = inF.read(blockSize)
+            if not block:
+                break
+            fHash.update(block)
+
+    return fHash.hexdigest()
+
+# def FileHash(fNm,blockSize=1<<20):
+
+def CmdKey(cmdSig,sigExtras,depKeys):
+    # Hash identifying the result of a command: its signature (see
+    # MPilotProgram._CmdSig()), anything else its result depends on
+    # (ExecSigExtras()), and the keys of the commands it depends on
+    # as (result name, key) pairs. Because dependency keys are
+    # included, a key covers the command's whole upstream graph.
+
+    return hashlib.sha1(repr((cmdSig,sigExtras,tuple(sorted(depKeys))))).hexdigest()
+
+# def CmdKey(cmdSig,sigExtras,depKeys):
@@ -0,0 +1,453 @@
+# Macro substitution in MPilot scripts, done before a script is parsed.
+#
+# A script defines macros with lines like these:
+#
+#   # MACRO SrchStr:RepStr
+#   # MACRO SrchStr(Param1,Param2):RepStr using Param1 and Param2
+#
+# Each line after a definition has every occurrence of SrchStr
+# replaced by RepStr. With parameters, SrchStr(Arg1,Arg2) is replaced
+# by RepStr with each parameter, as a whole word, replaced by its
+# argument. Arguments are separated by commas outside of brackets, and
+# cannot contain parentheses. A macro defined again replaces the first
+# definition from then on. The definition lines themselves are kept,
+# unchanged, as comments.
+#
+#   # INCLUDE FileName
+#
+# puts the expansion of a script fragment, e.g. a model shared by
+# several scripts, after the INCLUDE line. The fragment is expanded
+# with the macros defined so far, and the macros it defines are
+# defined for the rest of the including script. A relative FileName is
+# relative to the directory of the including script. Fragments are
+# kept parsed (see _FragmentItems()) while their files are unchanged,
+# so a fragment included many times, or by the scenarios of a sweep,
+# is read once.
+#
+# Substitution was a str.replace() for each macro on each line, with
+# the result built up a line at a time. Now all the macros are one
+# regular expression, applied to the whole text between two MACRO or
+# INCLUDE lines at once. At each place in the text, the longest macro
+# name that matches is replaced, and replacement text is not searched
+# again for macros. This is the same as before except where one macro
+# name contains another, or a replacement contains a macro name.
+#
+# Only the standard library and MPilotHash are imported, so that
+# clients start quickly.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotMacro
+
+from collections import OrderedDict
+import os
+import re
+
+import MPilotHash as mphash
+
+# MACRO and INCLUDE lines, found in the whole text at once
+_DIRECTIVE_RE = re.compile(
+    r'^[ \t]*#[ \t]*(?:'
+    r'MACRO[ \t]+(?P<macroNm>[^\s:(]+)(?:\((?P<paramNms>[^()\n]*)\))?[ \t]*:(?P<macroVal>\S[^\n]*?)'
+    r'|INCLUDE[ \t]+(?P<inclFNm>\S[^\n]*?)'
+    r')[ \t]*$',
+    re.MULTILINE
+    )
+
+_PARAM_NM_RE = re.compile(r'^\w+$')
+
+# Kinds of parsed items
+_TEXT = 0
+_MACRO = 1
+_INCLUDE = 2
+
+# Parsed fragments, absolute file name: (FileStat(), items)
+_fragmentCache = {}
+
+def _Error(msgStr,srcFNm,lineNo):
+    return Exception(
+        '{}{}{}'.format(
+            '\n********************ERROR********************\n',
+            msgStr,
+            'File: {}  Line number: {}\n'.format(srcFNm,lineNo)
+            )
+        )
+
+# def _Error(msgStr,srcFNm,lineNo):
+
+def _NormalizedText(inStr):
+    # inStr with \n line ends, ending with one if it is not empty,
+    # as it was when built up from inStr.splitlines()
+
+    if '\r' in inStr:
+        inStr = inStr.replace('\r\n','\n').replace('\r','\n')
+    if len(inStr) > 0 and not inStr.endswith('\n'):
+        inStr = '{}\n'.format(inStr)
+
+    return inStr
+
+# def _NormalizedText(inStr):
+
+def _SplitArgs(argsStr):
+    # The arguments of a parameterized macro, e.g. 'a,[b,c]' ->
+    # ['a','[b,c]']
+
+    if '[' not in argsStr:
+        return [arg.strip() for arg in argsStr.split(',')]
+
+    args = []
+    depth = 0
+    argStart = 0
+    for chNdx,ch in enumerate(argsStr):
+        if ch == '[':
+            depth += 1
+        elif ch == ']':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            args.append(argsStr[argStart:chNdx].strip())
+            argStart = chNdx + 1
+    args.append(argsStr[argStart:].strip())
+
+    return args
+
+# def _SplitArgs(argsStr):
+
+def _DirectiveMatches(text):
+
+    # The MACRO and INCLUDE lines of text, in order. Only lines with
+    # a # are tried, which is much faster than finditer() trying the
+    # start of every line.
+
+    chNdx = text.find('#')
+    while chNdx >= 0:
+
+        lineStart = text.rfind('\n',0,chNdx) + 1
+        dirMatch = _DIRECTIVE_RE.match(text,lineStart)
+        if dirMatch is not None:
+            yield dirMatch
+
+        lineEnd = text.find('\n',chNdx)
+        if lineEnd < 0:
+            break
+        chNdx = text.find('#',lineEnd)
+
+    # while chNdx >= 0:
+
+# def _DirectiveMatches(text):
+
+def _ParseItems(inStr,srcFNm):
+
+    # The items of a script or fragment, in order:
+    #   (_TEXT, text, first line number)
+    #   (_MACRO, definition line, line number, macro name,
+    #     parameter names or None, macro value)
+    #   (_INCLUDE, include line, line number, absolute file name)
+
+    text = _NormalizedText(inStr)
+    if srcFNm is not None:
+        srcDirNm = os.path.dirname(os.path.abspath(srcFNm))
+    else:
+        srcDirNm = os.getcwd()
+
+    items = []
+    textStart = 0
+    lineNo = 1
+    for dirMatch in _DirectiveMatches(text):
+
+        if dirMatch.start() > textStart:
+            textStr = text[textStart:dirMatch.start()]
+            items.append((_TEXT,textStr,lineNo))
+            lineNo += textStr.count('\n')
+
+        # The directive line, with its line end
+        lineEnd = dirMatch.end() + 1
+        dirLine = text[dirMatch.start():lineEnd]
+
+        if dirMatch.group('macroNm') is not None:
+
+            paramNms = dirMatch.group('paramNms')
+            if paramNms is not None:
+                paramNms = [paramNm.strip() for paramNm in paramNms.split(',')]
+                for paramNm in paramNms:
+                    if _PARAM_NM_RE.match(paramNm) is None:
+                        raise _Error(
+                            'Illegal macro parameter name: {}\n'.format(paramNm),
+                            srcFNm,
+                            lineNo
+                            )
+
+            items.append((
+                _MACRO,
+                dirLine,
+                lineNo,
+                dirMatch.group('macroNm'),
+                paramNms,
+                dirMatch.group('macroVal')
+                ))
+
+        else:
+
+            inclFNm = os.path.join(srcDirNm,os.path.expanduser(dirMatch.group('inclFNm')))
+            items.append((_INCLUDE,dirLine,lineNo,os.path.abspath(inclFNm)))
+
+        # if dirMatch.group('macroNm') is not None:...else
+
+        textStart = lineEnd
+        lineNo += 1
+
+    # for dirMatch in _DirectiveMatches(text):
+
+    if textStart < len(text):
+        items.append((_TEXT,text[textStart:],lineNo))
+
+    return items
+
+# def _ParseItems(inStr,srcFNm):
+
+def _FragmentItems(inclFNm,srcFNm,lineNo):
+
+    # The parsed items of an included fragment, parsed again only if
+    # its file has changed
+
+    fStat = mphash.FileStat(inclFNm)
+    if fStat is None:
+        raise _Error('Included file does not exist: {}\n'.format(inclFNm),srcFNm,lineNo)
+
+    cached = _fragmentCache.get(inclFNm)
+    if cached is not None and cached[0] == fStat:
+        return cached[1]
+
+    with open(inclFNm,'r') as inF:
+        items = _ParseItems(inF.read(),inclFNm)
+    _fragmentCache[inclFNm] = (fStat,items)
+
+    return items
+
+# def _FragmentItems(inclFNm,srcFNm,lineNo):
+
+class _MacroTable(object):
+
+    # The macros defined so far, and the regular expression that finds
+    # all of them, made again only when a macro has been defined since
+    # it was last used
+
+    def __init__(self,skipComments=False):
+
+        # name: (parameter names or None, value, value parts or None).
+        # The value parts of a macro with parameters are its value
+        # split at the parameters, which are the odd numbered parts.
+        self.macros = OrderedDict()
+        self.skipComments = skipComments
+        self.macroRe = None
+        self.plainVals = None
+        self.allPlain = True
+        self.isStale = True
+
+    # def __init__(self,skipComments=False):
+
+    def Define(self,macroNm,paramNms,macroVal):
+
+        valParts = None
+        if paramNms is not None:
+            valParts = re.split(r'\b({})\b'.format('|'.join([re.escape(nm) for nm in paramNms])),macroVal)
+
+        self.macros[macroNm] = (paramNms,macroVal,valParts)
+        self.isStale = True
+
+    # def Define(self,macroNm,paramNms,macroVal):
+
+    def _MakeRe(self):
+
+        # One group around all of the alternatives, so that split()
+        # gives the text between matches and the matches, in turn.
+        # Longest names first, so the longest name matching at a place
+        # is the one replaced. A parameterized macro matches only with
+        # its arguments. Every alternative starts with its name, not
+        # a group, so re can skip quickly to where a name could start.
+
+        self.plainVals = {}
+        paramMacroNms = []
+        for macroNm,(paramNms,macroVal,valParts) in self.macros.items():
+            if paramNms is None:
+                self.plainVals[macroNm] = macroVal
+            else:
+                paramMacroNms.append(macroNm)
+
+        alts = []
+        if self.skipComments:
+            alts.append(r'^#[^\n]*')
+        for macroNm in sorted(paramMacroNms,key=len,reverse=True):
+            alts.append(r'{}\([^()\n]*\)'.format(re.escape(macroNm)))
+        if len(self.plainVals) > 0:
+            alts.append('|'.join([re.escape(nm) for nm in sorted(self.plainVals,key=len,reverse=True)]))
+
+        # Every match is a plain macro unless there are others
+        self.allPlain = len(alts) == 1 and len(paramMacroNms) == 0
+
+        if len(self.macros) == 0:
+            self.macroRe = None
+        else:
+            self.macroRe = re.compile('({})'.format('|'.join(alts)),re.MULTILINE)
+
+        self.isStale = False
+
+    # def _MakeRe(self):
+
+    def _CallVal(self,callStr):
+
+        # The value of a call of a parameterized macro, e.g.
+        # Nm(Arg1,Arg2), None if it has the wrong number of arguments.
+        # Macros in the arguments are replaced first.
+
+        macroNm = callStr[:callStr.index('(')]
+        paramNms,macroVal,valParts = self.macros[macroNm]
+
+        argsStr = callStr[len(macroNm) + 1:-1]
+        args = _SplitArgs(argsStr)
+        if len(args) != len(paramNms):
+            return None
+
+        # Arguments cannot hold calls, so substituting cannot fail
+        if self.macroRe.search(argsStr) is not None:
+            args = [self.Substitute(arg,None,None) for arg in args]
+
+        argsByNm = dict(zip(paramNms,args))
+        valParts = list(valParts)
+        valParts[1::2] = [argsByNm[paramNm] for paramNm in valParts[1::2]]
+
+        return ''.join(valParts)
+
+    # def _CallVal(self,callStr):
+
+    def Substitute(self,textStr,srcFNm,lineNo):
+
+        # textStr with its macros replaced. textStr starts at line
+        # lineNo of srcFNm.
+
+        if self.isStale:
+            self._MakeRe()
+        if self.macroRe is None:
+            return textStr
+
+        # Odd numbered parts are the matches
+        parts = self.macroRe.split(textStr)
+        plainVals = self.plainVals
+
+        if self.allPlain:
+            parts[1::2] = [plainVals[part] for part in parts[1::2]]
+            return ''.join(parts)
+
+        for partNdx in xrange(1,len(parts),2):
+
+            part = parts[partNdx]
+            if part in plainVals:
+                parts[partNdx] = plainVals[part]
+                continue
+            if self.skipComments and part.startswith('#'):
+                continue
+
+            callVal = self._CallVal(part)
+            if callVal is None:
+                macroNm = part[:part.index('(')]
+                raise _Error(
+                    'Macro {} takes {} argument(s), {} given:\n  {}\n'.format(
+                        macroNm,
+                        len(self.macros[macroNm][0]),
+                        len(_SplitArgs(part[len(macroNm) + 1:-1])),
+                        part
+                        ),
+                    srcFNm,
+                    lineNo + sum([prevPart.count('\n') for prevPart in parts[:partNdx]])
+                    )
+            parts[partNdx] = callVal
+
+        # for partNdx in xrange(1,len(parts),2):
+
+        return ''.join(parts)
+
+    # def Substitute(self,textStr,srcFNm,lineNo):
+
+# class _MacroTable(object):
+
+def _Expand(items,macroTable,srcFNm,inclFNms,outStrs):
+
+    # Appends the expansion of items to outStrs. inclFNms are the
+    # files being included, to catch a file that includes itself.
+
+    for item in items:
+
+        if item[0] == _TEXT:
+
+            outStrs.append(macroTable.Substitute(item[1],srcFNm,item[2]))
+
+        elif item[0] == _MACRO:
+
+            outStrs.append(item[1])
+            macroTable.Define(item[3],item[4],item[5])
+
+        else:
+
+            inclFNm = item[3]
+            if inclFNm in inclFNms:
+                raise _Error(
+                    'File includes itself: {}\n'.format(inclFNm),
+                    srcFNm,
+                    item[2]
+                    )
+
+            outStrs.append(item[1])
+            _Expand(
+                _FragmentItems(inclFNm,srcFNm,item[2]),
+                macroTable,
+                inclFNm,
+                inclFNms + [inclFNm],
+                outStrs
+                )
+
+        # if item[0] == _TEXT:...elif...else
+
+    # for item in items:
+
+# def _Expand(items,macroTable,srcFNm,inclFNms,outStrs):
+
+def MacroSub(inStr,inFNm=None):
+
+    # inStr, a script read from inFNm if it was read from a file, with
+    # its INCLUDEs and MACROs expanded
+
+    if inFNm is not None:
+        inFNm = os.path.abspath(inFNm)
+        inclFNms = [inFNm]
+    else:
+        inclFNms = []
+
+    outStrs = []
+    _Expand(_ParseItems(inStr,inFNm),_MacroTable(),inFNm,inclFNms,outStrs)
+
+    return ''.join(outStrs)
+
+# def MacroSub(inStr,inFNm=None):
+
+def MacroSubFile(inFNm):
+
+    with open(inFNm,'r') as inF:
+        inStr = inF.read()
+
+    return MacroSub(inStr,inFNm)
+
+# def MacroSubFile(inFNm):
+
+def MacroIt(inStr,macroList):
+
+    # inStr with the macros of macroList, entries like MacroNm:MacroVal,
+    # substituted on the lines not starting with #. MACRO and INCLUDE
+    # lines are left for MacroSub().
+
+    macroTable = _MacroTable(skipComments=True)
+    for macroDef in macroList:
+        srch,repl = macroDef.split(':')
+        macroTable.Define(srch,None,repl)
+
+    return macroTable.Substitute(_NormalizedText(inStr),None,1)
+
+# def MacroIt(inStr,macroList):
@@ -0,0 +1,15 @@
+# Lock on the netCDF library.
+#
+# The netCDF and HDF5 libraries are not thread safe, and netCDF4
+# releases the GIL while it is in them. Commands hold NC_LOCK while
+# they have a dataset open, so that they can be executed, or have
+# their input prefetched (see MPilotPrefetch.py), in threads.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotNCLock
+
+import threading
+
+# Reentrant, so a command can open a dataset while it has another open
+NC_LOCK = threading.RLock()
@@ -1,7 +1,9 @@
 from collections import OrderedDict
 import MPilotParseMetadata as pmd
+import MPilotCmdStruct as mpcs
 import re
 import copy as cp
+import gc
 
 '''
 MPilot parser
@@ -35,6 +37,27 @@ tjs 2017.05.11
 
 '''
 
+# Whitespace as matched by \s, removed from lines of commands
+_WS_CHARS = ' \t\n\r\x0b\x0c'
+_WS_UNICODE_TABLE = dict.fromkeys([ord(c) for c in _WS_CHARS])
+
+# Parentheses are the only tokens ParseStringToCommands() looks at
+_PAREN_RE = re.compile(r'[()]')
+_TRAILING_COMMA_RE = re.compile(r',+([\]\)])')
+
+# Used by ParseCommandToArgs()
+_WS_RE = re.compile(r'\s+')
+_CMD_MATCH_RE = re.compile(r'([^=]+)=([^\(]+)\(([^\)]+)\)')
+_RSLT_NM_RE = re.compile(r'^[a-zA-Z0-9\-\_]+$')
+_RSLT_NM_LIST_RE = re.compile(r'^\[[a-zA-Z0-9\-\_,]+\]$')
+_LIST_ARG_PAIR_RE = re.compile(r'\s*([^=]*=\s*\[[^\[]*\])\s*,*\s*')
+_ARG_PAIR_RE = re.compile(r'\s*([^=,]*=\s*[^,]*)\s*,*\s*')
+
+def _StripWS(inStr):
+    if isinstance(inStr,unicode):
+        return inStr.translate(_WS_UNICODE_TABLE)
+    return inStr.translate(None,_WS_CHARS)
+
 def ParseStringToCommands(
     inStr,
     objNm=None
@@ -42,43 +65,64 @@ def ParseStringToCommands(
     # Each command must start on a new line
     # a mptCmdStruct is a list of dicts for the command string
 
+    # Parsing creates many objects that live on, and each batch of
+    # them would set the cyclic garbage collector scanning all of
+    # those made before, so the collector is paused while parsing.
+
+    gcWasEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _ParseStringToCommands(inStr,objNm)
+    finally:
+        if gcWasEnabled:
+            gc.enable()
+
+# def ParseStringToCommands(inStr,objNm=None):
+
+def _ParseStringToCommands(inStr,objNm):
+
+    # The input is scanned once, a line at a time. Each line is
+    # stripped of comments and whitespace by slicing and translate(),
+    # and only its parentheses are examined, to track the depth of
+    # the command being gathered. The lines of a command are kept in
+    # lists and joined once the command is complete, so the time
+    # taken is linear in the length of the input.
+
     mptCmdStructs = OrderedDict()
-    mptCmdStructstartLineNo = 0
     if objNm is None: objNm = 'Input string'
 
-    cmdLine = ''      # buffer to build command from lines of input file
+    rawLines = []     # lines of the command being gathered
+    cleanLines = []   # the same lines without comments and whitespace
     inParens = False  # whether or not parsing is within parentheses
     parenCnt = 0      # count of parenthesis levels
-    inLineCnt = 0     # line number of input file for error messages.
+    mptCmdStructStartLineNum = 0
 
-    rawCmd = ''
-    cleanCmd = ''
-
-    # Basically a finite state machine to build individual commands
-    
-    for inLine in inStr.split('\n'):
+    for inLineNdx,inLine in enumerate(inStr.split('\n')):
 
-        inLineCnt +=1
+        commentNdx = inLine.find('#')
+        if commentNdx < 0:
+            cleanLine = _StripWS(inLine)
+        else:
+            cleanLine = _StripWS(inLine[:commentNdx])
 
-        cleanLine = re.sub('#.*$','',inLine)
-        cleanLine = re.sub('\s+','',cleanLine)
-        
         # Only start gathering a command where
         # a command starts
-        if rawCmd == '':
+        if len(rawLines) == 0:
             if cleanLine == '':
                 continue
             else:
-                mptCmdStructstartLineNum = inLineCnt
+                mptCmdStructStartLineNum = inLineNdx + 1
+
+        rawLines.append(inLine)
+        cleanLines.append(cleanLine)
 
-        rawCmd = '{}{}\n'.format(rawCmd,inLine)
+        cmdDone = False
+        for parenMatch in _PAREN_RE.finditer(cleanLine):
 
-        for charNdx in range(len(cleanLine)):
-            cleanCmd += cleanLine[charNdx]
-            if cleanLine[charNdx] == '(':
+            if parenMatch.group() == '(':
                 inParens = True
                 parenCnt += 1
-            elif cleanLine[charNdx] == ')':
+            else:
                 parenCnt -= 1
 
             if parenCnt < 0:
@@ -86,72 +130,75 @@ def ParseStringToCommands(
                     '{}{}{}{}'.format(
                         '\n********************ERROR********************\n',
                         'Unmatched right paren *)*\n',
-                        '  input: {}, line {}:\n'.format(objNm,inLineCnt),
+                        '  input: {}, line {}:\n'.format(objNm,inLineNdx + 1),
                         '  {}\n'.format(inLine),
                         )
                     )
             if inParens and parenCnt == 0:
-                if charNdx < (len(cleanLine)-1):
+                if parenMatch.end() < len(cleanLine):
                     raise Exception(
                         '{}{}{}{}'.format(
                             '\n********************ERROR********************\n',
                             'Extraneous characters beyond end of command\n',
-                            '  Input: {}, line {}:\n'.format(objNm,inLineCnt),
+                            '  Input: {}, line {}:\n'.format(objNm,inLineNdx + 1),
                             '  {}\n'.format(inLine),
                             )
                         )
+                cmdDone = True
 
-                else:
-
-                    cleanCmd = re.sub(',+([\]\)])',r'\1',cleanCmd)
-                    
-                    mptCmdStructTmp = ({
-                        'cmdFileNm':objNm,
-                        'lineNo':mptCmdStructstartLineNum,
-                        'rawCmdStr':rawCmd,
-                        'cleanCmdStr':cleanCmd,
-                        })
-
-                    mptCmdStructTmp['parsedCmd'] = ParseCommandToArgs(mptCmdStructTmp)
-                    
-                    rsltNm = mptCmdStructTmp['parsedCmd']['rsltNm']
-
-                    if mptCmdStructTmp['parsedCmd']['rsltNm'] in mptCmdStructs:
-                        raise Exception(
-                            '{}{}{}{}{}{}'.format(
-                                '\n********************ERROR********************\n',
-                                'Result appears more than once in input: {}.\n'.format(objNm),
-                                'First occurence: line {}:\n'.format(mptCmdStructs[rsltNm]['lineNo']),
-                                '  Command:\n{}\n'.format(mptCmdStructs[rsltNm]['rawCmdStr']),
-                                'Second occurence: line {}:\n'.format(mptCmdStructTmp['lineNo']),
-                                '  Command:\n{}\n'.format(mptCmdStructTmp['rawCmdStr']),
-                                )
-                            )
+        # for parenMatch in _PAREN_RE.finditer(cleanLine):
+
+        if not cmdDone:
+            continue
 
-                    mptCmdStructs[mptCmdStructTmp['parsedCmd']['rsltNm']] = cp.deepcopy(mptCmdStructTmp)
+        mptCmdStructTmp = mpcs.MPilotCmdStruct(
+            objNm,
+            mptCmdStructStartLineNum,
+            '{}\n'.format('\n'.join(rawLines)),
+            _TRAILING_COMMA_RE.sub(r'\1',''.join(cleanLines)),
+            None
+            )
 
-                    rawCmd = ''
-                    cleanCmd = ''
-                    inParens = False
-                    parenCnt = 0
+        mptCmdStructTmp = mptCmdStructTmp.Replace(parsedCmd=ParseCommandToArgs(mptCmdStructTmp))
 
-        # for charNdx in range(len(cleanLine)):
-    # for inLine in inStr.split('\n'):
+        rsltNm = mptCmdStructTmp['parsedCmd']['rsltNm']
 
-    #    if cleanCmd != '':
-    if rawCmd != '':
+        if rsltNm in mptCmdStructs:
+            raise Exception(
+                '{}{}{}{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Result appears more than once in input: {}.\n'.format(objNm),
+                    'First occurence: line {}:\n'.format(mptCmdStructs[rsltNm]['lineNo']),
+                    '  Command:\n{}\n'.format(mptCmdStructs[rsltNm]['rawCmdStr']),
+                    'Second occurence: line {}:\n'.format(mptCmdStructTmp['lineNo']),
+                    '  Command:\n{}\n'.format(mptCmdStructTmp['rawCmdStr']),
+                    )
+                )
+
+        # The struct cannot be changed, so it is not copied by the
+        # commands created from it
+        mptCmdStructs[rsltNm] = mptCmdStructTmp
+
+        rawLines = []
+        cleanLines = []
+        inParens = False
+        parenCnt = 0
+
+    # for inLineNdx,inLine in enumerate(inStr.split('\n')):
+
+    if len(rawLines) > 0:
         raise Exception(
             '{}{}{}{}'.format(
                 '\n********************ERROR********************\n',
                 'Incomplete command in file:\n',
-                '  input: {}, line {}:\n'.format(objNm,mptCmdStructstartLineNum),
-                'Command:\n{}\n'.format(rawCmd),
+                '  input: {}, line {}:\n'.format(objNm,mptCmdStructStartLineNum),
+                'Command:\n{}\n'.format('{}\n'.format('\n'.join(rawLines))),
                 )
             )
 
     return mptCmdStructs
 
-# def ParseStringToCommands(inFDef):
+# def _ParseStringToCommands(inStr,objNm):
 
 def ParseFileToCommands(inFDef):
     
@@ -168,20 +215,20 @@ def ParseFileToCommands(inFDef):
 # def ParseFileToCommands(inFDef):
 
 def ParseCommandToArgs(mptCmdStruct):
-    # mptCmdStruct is a dict:
+    # mptCmdStruct is an MPilotCmdStruct (or a dict) with:
     # 'lineNo': the command's line within the input file
     # 'rawCmdStr': the command string as it appeared in the input
     #    file, comments, line breaks, and all
     # 'cleanCmdStr': the command string stripped of all its
     #    comments, line breaks, and all
+    # Returns an MPilotParsedCmd
 
     # strip white space
-    cmdStr = re.sub('\s+','',mptCmdStruct['cleanCmdStr'])
+    cmdStr = _WS_RE.sub('',mptCmdStruct['cleanCmdStr'])
 
     # parse the command string into result, command name, and arguments
 
-    cmdMatchRE = re.compile(r'([^=]+)=([^\(]+)\(([^\)]+)\)')
-    exprParse = cmdMatchRE.match(cmdStr)
+    exprParse = _CMD_MATCH_RE.match(cmdStr)
     
     if not exprParse or len(exprParse.groups()) != 3:
         raise Exception(
@@ -193,8 +240,6 @@ def ParseCommandToArgs(mptCmdStruct):
                 )
 
 
-    parsedCmd = OrderedDict()
-    
     # Every command must have a result
     if exprParse.groups()[0] is None:
         raise Exception(
@@ -206,10 +251,10 @@ def ParseCommandToArgs(mptCmdStruct):
             )
 
 
-    parsedCmd['rsltNm'] = exprParse.groups()[0]
+    rsltNm = exprParse.groups()[0]
 
-    if (not re.match(r'^[a-zA-Z0-9\-\_]+$',parsedCmd['rsltNm']) and
-        not re.match(r'^\[[a-zA-Z0-9\-\_,]+\]$',parsedCmd['rsltNm'])
+    if (not _RSLT_NM_RE.match(rsltNm) and
+        not _RSLT_NM_LIST_RE.match(rsltNm)
         ):
         raise Exception(
             '{}{}{}{}'.format(
@@ -220,53 +265,54 @@ def ParseCommandToArgs(mptCmdStruct):
             )
 
 
-    parsedCmd['cmd'] = exprParse.groups()[1]
+    cmd = exprParse.groups()[1]
     
     # Parse out the arguments
+    # Each argument is matched where the last one ended, rather
+    # than on a copy of the rest of the string
     argStr = exprParse.groups()[2]
+    argNdx = 0
     argPairs = []
 
-    while argStr != '':
-        argPairMatchObj = re.match(r'\s*([^=]*=\s*\[[^\[]*\])\s*,*\s*(.*)',argStr)
+    while argNdx < len(argStr):
+        argPairMatchObj = _LIST_ARG_PAIR_RE.match(argStr,argNdx)
         if argPairMatchObj:
             argPairs.append(argPairMatchObj.groups()[0])
-            argStr = argPairMatchObj.groups()[1]
+            argNdx = argPairMatchObj.end()
         else:
-            argPairMatchObj = re.match(r'\s*([^=,]*=\s*[^,]*)\s*,*\s*(.*)',argStr)
+            argPairMatchObj = _ARG_PAIR_RE.match(argStr,argNdx)
             if argPairMatchObj:
                 argPairs.append(argPairMatchObj.groups()[0])
-                argStr = argPairMatchObj.groups()[1]
+                argNdx = argPairMatchObj.end()
             else:
                 raise Exception(
                     '{}{}{}{}{}'.format(
                         '\n********************ERROR********************\n',
                         'Invalid argument specification.\n',
                         'File: {}  Line number: {}\n'.format(mptCmdStruct['cmdFileNm'],mptCmdStruct['lineNo']),
-                        'Section of command: {}\n'.format(argStr),
+                        'Section of command: {}\n'.format(argStr[argNdx:]),
                         'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr']),
                         )
                     )
 
         # if argPair:...else:
 
-    # while argStr != '':
+    # while argNdx < len(argStr):
 
-    parsedCmd['arguments'] = OrderedDict()
+    argItems = []
     for argPair in argPairs:
 
-        argTokens = re.split(r'\s*=\s*',argPair,2)
+        # cmdStr has no whitespace, so there is none to remove
+        # around the =, brackets and commas
+        argTokens = argPair.split('=',2)
 
         argTokens[0] = argTokens[0].strip()
         argTokens[1] = argTokens[1].strip()
 
-        argTokens[1] = re.sub(r'\s*\[\s*','[',argTokens[1])
-        argTokens[1] = re.sub(r'\s*\]\s*',']',argTokens[1])
-        argTokens[1] = re.sub(r'\s*,\s*',',',argTokens[1])
-
         if (len(argTokens) != 2
             or argTokens[0] == ''
             or argTokens[1] == ''
-            or argTokens[0] in parsedCmd
+            or argTokens[0] in mpcs.MPilotParsedCmd.__slots__
             ):
 
             raise Exception(
@@ -278,11 +324,11 @@ def ParseCommandToArgs(mptCmdStruct):
                     )
                 )
 
-        parsedCmd['arguments'][argTokens[0]] = argTokens[1]
+        argItems.append((argTokens[0],argTokens[1]))
             
     # for argPair in argPairs:
 
-    return parsedCmd
+    return mpcs.MPilotParsedCmd(rsltNm,cmd,mpcs.MPilotArgs(argItems))
 
 # def ParseCommandToArgs(inCmd):
     
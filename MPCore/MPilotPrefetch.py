@@ -0,0 +1,208 @@
+# Background prefetching of the input reads of an MPilot program, so
+# that reading from slow (e.g. network attached) storage overlaps with
+# computation.
+#
+# Commands that read their input with ReadInput() (see
+# MPilotFxnParent.IsPrefetchable()) are read ahead, in script order, on
+# a pool of I/O threads. When the executor reaches such a command it
+# hands it its prefetch (see Attach()) and the command's Exec() takes
+# what was read instead of reading it itself.
+#
+# What has been read but not yet taken is bounded by maxBytes. A read
+# is admitted, in script order, when its estimated size (see
+# EstimateRslt(), or the size of the files read if there is no
+# estimate) fits in what remains of maxBytes, or when nothing else is
+# held. Once taken, its bytes belong to the program.
+#
+# A command that takes its prefetch before the read has been admitted
+# cancels it and reads for itself, so commands never wait on the
+# budget. A read that fails is left to the command, which reads again
+# and reports the error where it would have without prefetching.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotPrefetch
+
+from multiprocessing.pool import ThreadPool
+import os
+import threading
+
+import MPilotEstimate as mpest
+import MPilotRsltInfo as mprslt
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_BYTES = 2**30
+
+class _MPilotPrefetch(object):
+
+    # The read ahead of one command
+
+    def __init__(self,prefetcher,mpCmd,ndx):
+
+        self.prefetcher = prefetcher
+        self.mpCmd = mpCmd
+        self.ndx = ndx           # admission order
+        self.state = 'queued'    # reading, done, failed, taken or cancelled
+        self.data = None
+        self.nBytes = 0
+
+    # def __init__(self,prefetcher,mpCmd,ndx):
+
+    def Take(self):
+        # What was read, None if the command must read for itself
+        return self.prefetcher._Take(self)
+
+# class _MPilotPrefetch(object):
+
+class MPilotPrefetcher(object):
+
+    def __init__(
+        self,
+        orderedMPCmds,                # OrderedDict of commands in dependency order
+        workers=DEFAULT_WORKERS,      # number of I/O threads
+        maxBytes=DEFAULT_MAX_BYTES,   # bound on bytes read but not yet taken
+        ):
+
+        self.maxBytes = maxBytes
+        self.cond = threading.Condition()
+        self.heldBytes = 0
+        self.admitNdx = 0
+
+        self.prefetches = {}
+        # Commands already given their input are not read ahead
+        for mpCmd in orderedMPCmds.values():
+            if mpCmd.IsPrefetchable() and mpCmd.prefetched is None:
+                self.prefetches[mpCmd.RsltNm()] = _MPilotPrefetch(self,mpCmd,len(self.prefetches))
+
+        self.pool = None
+        if len(self.prefetches) > 0:
+            self.pool = ThreadPool(workers)
+            # The pool starts tasks in the order they are given
+            for prefetch in sorted(self.prefetches.values(),key=lambda pf: pf.ndx):
+                self.pool.apply_async(self._Read,(prefetch,))
+
+    # def __init__(...)
+
+    def _EstBytes(self,mpCmd):
+
+        nBytes = mpest.EstNBytes(mpCmd.EstimateRslt({}))
+        if nBytes is None:
+            nBytes = sum([
+                os.path.getsize(fNm) for fNm in mpCmd.InFileNms() if os.path.isfile(fNm)
+                ])
+
+        return nBytes
+
+    # def _EstBytes(self,mpCmd):
+
+    def _Read(self,prefetch):
+
+        # Runs in an I/O thread. Errors are left for the command's
+        # Exec() to report.
+
+        try:
+            estBytes = self._EstBytes(prefetch.mpCmd)
+        except Exception:
+            estBytes = 0
+
+        with self.cond:
+
+            while self.admitNdx != prefetch.ndx:
+                self.cond.wait()
+
+            while prefetch.state == 'queued' and self.heldBytes > 0 and \
+              self.heldBytes + estBytes > self.maxBytes:
+                self.cond.wait()
+
+            if prefetch.state == 'queued':
+                prefetch.state = 'reading'
+                prefetch.nBytes = estBytes
+                self.heldBytes += estBytes
+
+            self.admitNdx += 1
+            self.cond.notify_all()
+
+            if prefetch.state != 'reading':
+                return
+
+        # with self.cond:
+
+        try:
+            data = prefetch.mpCmd.ReadInput()
+            nBytes = mprslt.RsltNBytes(data) or estBytes
+        except Exception:
+            data = None
+            nBytes = 0
+
+        with self.cond:
+            self.heldBytes += nBytes - prefetch.nBytes
+            prefetch.nBytes = nBytes
+            prefetch.data = data
+            prefetch.state = 'done' if data is not None else 'failed'
+            self.cond.notify_all()
+
+    # def _Read(self,prefetch):
+
+    def _Take(self,prefetch):
+
+        with self.cond:
+
+            if prefetch.state == 'queued':
+                prefetch.state = 'cancelled'
+                self.cond.notify_all()
+                return None
+
+            while prefetch.state == 'reading':
+                self.cond.wait()
+
+            data = prefetch.data
+            prefetch.data = None
+            if prefetch.state in ['done','failed']:
+                self.heldBytes -= prefetch.nBytes
+            prefetch.state = 'taken'
+            self.cond.notify_all()
+
+            return data
+
+    # def _Take(self,prefetch):
+
+    def Attach(self,mpCmd):
+        # Called when mpCmd is about to be executed
+        if mpCmd.RsltNm() in self.prefetches:
+            mpCmd.SetPrefetched(self.prefetches[mpCmd.RsltNm()])
+
+    def Discard(self,mpCmd):
+        # Called when mpCmd's result was had without executing it
+        if mpCmd.RsltNm() in self.prefetches:
+            self._Take(self.prefetches[mpCmd.RsltNm()])
+
+    def HeldBytes(self):
+        # Bytes read, or being read, and not yet taken
+        return self.heldBytes
+
+    def Close(self):
+
+        # Cancels reads not yet started and waits for the rest.
+        # Prefetches never taken are dropped.
+
+        if self.pool is None:
+            return
+
+        with self.cond:
+            for prefetch in self.prefetches.values():
+                if prefetch.state == 'queued':
+                    prefetch.state = 'cancelled'
+                prefetch.mpCmd.SetPrefetched(None)
+            self.cond.notify_all()
+
+        self.pool.close()
+        self.pool.join()
+
+        for prefetch in self.prefetches.values():
+            prefetch.data = None
+        self.heldBytes = 0
+        self.pool = None
+
+    # def Close(self):
+
+# class MPilotPrefetcher(object):
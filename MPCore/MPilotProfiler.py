@@ -0,0 +1,222 @@
+# Per command profiling of MPilot program runs.
+#
+# For each command executed, the profiler records the wall clock time,
+# the CPU time, how much the process's peak resident memory grew while
+# the command ran, and the size and data type of the command's result,
+# along with where the command is in the script. The records can be
+# printed as a table sorted by any of these, and written as a timeline
+# in the Chrome trace event format (load the file in chrome://tracing
+# or https://ui.perfetto.dev).
+#
+# When commands run in parallel (see MPilotExecutor.py) CPU time and
+# peak memory are measured for the whole process, so they include
+# whatever else was running at the same time.
+#
+# File Log:
+# 2026.10.18
+#  Created with ProfiledCall() and MPilotProfiler
+
+from collections import OrderedDict
+import json
+import os
+import sys
+import threading
+import time
+
+import MPilotRsltInfo as mprslt
+
+try:
+    import resource
+except ImportError:     # Not available on Windows
+    resource = None
+
+def _PeakRSSBytes():
+
+    if resource is None:
+        return None
+
+    maxRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return maxRSS
+    return maxRSS * 1024
+
+# def _PeakRSSBytes():
+
+def ProfiledCall(fxn,*args):
+    # Calls fxn(*args), returning its return value and a dict of
+    # what the call cost. Exceptions from fxn pass through.
+
+    startPeakRSS = _PeakRSSBytes()
+    startCPU = time.clock()
+    startWall = time.time()
+
+    rtrn = fxn(*args)
+
+    endWall = time.time()
+    endCPU = time.clock()
+    endPeakRSS = _PeakRSSBytes()
+
+    stats = {
+        'start':startWall,
+        'wallSecs':endWall - startWall,
+        'cpuSecs':endCPU - startCPU,
+        'peakRSSDelta':None,
+        'pid':os.getpid(),
+        'tid':threading.current_thread().ident,
+        }
+    if startPeakRSS is not None:
+        stats['peakRSSDelta'] = endPeakRSS - startPeakRSS
+
+    return rtrn,stats
+
+# def ProfiledCall(fxn,*args):
+
+def TimedCall(fxn,*args):
+    # As ProfiledCall(), with only the start and wall clock times,
+    # which cost next to nothing to measure
+
+    startWall = time.time()
+    rtrn = fxn(*args)
+
+    return rtrn,{'start':startWall,'wallSecs':time.time() - startWall}
+
+# def TimedCall(fxn,*args):
+
+class MPilotProfiler(object):
+
+    # Columns of the report: (record key, heading, format)
+    _COLS = [
+        ('wallSecs','Wall s','{:>10.4f}'),
+        ('cpuSecs','CPU s','{:>10.4f}'),
+        ('peakRSSDelta','Peak RSS +','{:>12}'),
+        ('nBytes','Rslt bytes','{:>12}'),
+        ('dtype','DType','{:>10}'),
+        ]
+
+    def __init__(self):
+
+        self.records = OrderedDict()
+        self.runStart = time.time()
+
+    # def __init__(...)
+
+    def Record(self,mpCmd,stats,fromCache=False):
+
+        # stats are from ProfiledCall()
+
+        rslt = mpCmd.ExecRslt()
+
+        record = OrderedDict([
+            ('rsltNm',mpCmd.RsltNm()),
+            ('fxnNm',mpCmd.FxnNm()),
+            ('cmdFileNm',mpCmd.mptCmdStruct['cmdFileNm']),
+            ('lineNo',mpCmd.mptCmdStruct['lineNo']),
+            ('fromCache',fromCache),
+            ('nBytes',mprslt.RsltNBytes(rslt)),
+            ('dtype',mprslt.RsltDType(rslt)),
+            ])
+        record.update(stats)
+
+        self.records[record['rsltNm']] = record
+
+    # def Record(self,mpCmd,stats,fromCache=False):
+
+    def Records(self):
+        return self.records
+
+    def SortedRecords(self,sortBy='wallSecs'):
+
+        # Largest first. Missing values (e.g. peakRSSDelta on Windows)
+        # sort last.
+        return sorted(
+            self.records.values(),
+            key=lambda record: (record[sortBy] is not None,record[sortBy]),
+            reverse=True
+            )
+
+    # def SortedRecords(self,sortBy='wallSecs'):
+
+    def FormattedReport(self,topN=20,sortBy='wallSecs'):
+
+        records = self.SortedRecords(sortBy)
+        if topN is not None:
+            records = records[:topN]
+
+        rtrnStr = 'Profile: {} commands, {:.4f} s total wall, sorted by {}\n'.format(
+            len(self.records),
+            sum([record['wallSecs'] for record in self.records.values()]),
+            sortBy
+            )
+
+        rtrnStr = '{}{:<24} {:<24}{}  {}\n'.format(
+            rtrnStr,
+            'Result',
+            'Command',
+            ''.join(['{:>12}'.format(heading) for key,heading,fmt in self._COLS]),
+            'Line'
+            )
+
+        for record in records:
+
+            colStrs = []
+            for key,heading,fmt in self._COLS:
+                if record[key] is None:
+                    colStrs.append('{:>12}'.format('-'))
+                else:
+                    colStrs.append('{:>12}'.format(fmt.format(record[key]).strip()))
+
+            where = '{}:{}'.format(record['cmdFileNm'],record['lineNo'])
+            if record['fromCache']:
+                where = '{} (cached)'.format(where)
+
+            rtrnStr = '{}{:<24} {:<24}{}  {}\n'.format(
+                rtrnStr,
+                record['rsltNm'],
+                record['fxnNm'],
+                ''.join(colStrs),
+                where
+                )
+
+        # for record in records:
+
+        return rtrnStr
+
+    # def FormattedReport(self,topN=20,sortBy='wallSecs'):
+
+    def ChromeTrace(self):
+
+        # Trace event format, one complete ('X') event per command.
+        # Times are in microseconds from the start of the run.
+
+        traceEvents = []
+        for record in self.records.values():
+
+            args = OrderedDict()
+            for key in ['fxnNm','cmdFileNm','lineNo','fromCache','cpuSecs','peakRSSDelta','nBytes','dtype']:
+                args[key] = record[key]
+
+            traceEvents.append(OrderedDict([
+                ('name',record['rsltNm']),
+                ('cat',record['fxnNm']),
+                ('ph','X'),
+                ('ts',int((record['start'] - self.runStart) * 1e6)),
+                ('dur',int(record['wallSecs'] * 1e6)),
+                ('pid',record['pid']),
+                ('tid',record['tid']),
+                ('args',args),
+                ]))
+
+        return {'traceEvents':traceEvents,'displayTimeUnit':'ms'}
+
+    # def ChromeTrace(self):
+
+    def WriteChromeTrace(self,outFNm):
+
+        with open(outFNm,'w') as outF:
+            json.dump(self.ChromeTrace(),outF,indent=1,default=str)
+
+    # def WriteChromeTrace(self,outFNm):
+
+# class MPilotProfiler(object):
@@ -1,7 +1,21 @@
 import MPilotParse as mpparse
+import MPilotExecutor as mpexec
+import MPilotRsltInfo as mprslt
+import MPilotHash as mphash
+import MPilotRsltCache as mpcache
+import MPilotProfiler as mpprof
+import MPilotFusion as mpfuse
+import MPilotTiler as mptile
+import MPilotDedup as mpdedup
+import MPilotEstimate as mpest
+import MPilotCheckpoint as mpckpt
+import MPilotPrefetch as mppre
+import MPilotCompiled as mpcomp
 from collections import OrderedDict
+from collections import deque
 import os.path
 import datetime
+import json
 
 class MPilotProgram(object):
     
@@ -10,12 +24,26 @@ class MPilotProgram(object):
         mpFramework,          # An MPilot Framework
         sourceProgFNm = None, # File name for MPilot script
         sourceProgStr = None, # MPilot script as a single string
+        compiledFNm = None,   # keep the compiled program in this file, see MPilotCompiled.py
         ):
 
         self.unorderedMPCmds = OrderedDict()
         self.orderedMPCmds = None
+        self.dependentNms = None
         self.mpFramework = mpFramework
         self.rslts = {}
+        self.liveBytes = {}
+        self.memReport = None
+        self.execSigs = {}        # signatures of commands as last executed
+        self.fileSigs = {}        # size, mtime, and hash of files read, see _FileSig()
+        self.releasedNms = set()  # results freed by releaseRslts
+        self.rsltCache = None     # MPilotRsltCache during a cached run
+        self.cacheKeys = None
+        self.cacheLoadedNms = set()
+        self.profiler = None      # MPilotProfiler of the last profiled run
+        self.dupOf = {}           # duplicate result name: name it duplicates
+        self.checkpoint = None    # MPilotCheckpoint during a checkpointed run
+        self.resumedNms = set()   # results restored from a checkpoint
 
         if sourceProgFNm is not None:
             
@@ -29,11 +57,11 @@ class MPilotProgram(object):
                     )
                 )
                 
-            self.LoadMptFile(sourceProgFNm)
+            self.LoadMptFile(sourceProgFNm,compiledFNm)
 
         elif sourceProgStr is not None:
             
-            self.LoadMptStr(sourceProgStr)
+            self.LoadMptStr(sourceProgStr,compiledFNm)
             
         # if sourceProgFNm is not None:
         
@@ -48,93 +76,234 @@ class MPilotProgram(object):
 
     def _OrderCmds(self):
 
+        # Orders commands so that each command comes after all of
+        # the commands it depends on (Kahn's algorithm). Runs in time
+        # linear in the number of commands plus the number of
+        # dependencies. Ties are broken by script order.
+
         # If an item has a dependency that is not the result
         # of any command, then there is an unfulfillable
         # dependency
 
-        for rsltNm,mpCmd in self.unorderedMPCmds.items():
+        self.dependentNms = OrderedDict()
+        unmetCnts = {}
         
-            if mpCmd.DependencyNms() is not None:
-                if not set(mpCmd.DependencyNms()).issubset(set(self.unorderedMPCmds)):
-                    raise Exception(
-                        '{}{}{}{}'.format(
-                            '\n********************ERROR********************\n',
-                            'Required variable(s) for computing a result is(are) missing:\n  {}\n'.format(
-                                ' '.join(set(mpCmd.DependencyNms()) - set(self.unorderedMPCmds))
-                            ),
-                            'File: {}  Line number: {}\n'.format(
-                                mpCmd.CmdFileNm(),
-                                mpCmd.LineNo()
-                            ),
-                            'Full command:\n{}\n'.format(mpCmd.RawCmdStr())
-                        )
-                    )
-                    
-        # Now to order commands...    
-        # Idea is to iteratively go through the unordered commands
-        # list, moving items whose dependencies are in the ordered
-        # commands to the end of the ordered commands.
-        # The first items to go into the ordered commands will be
-        # those with no dependencies.
-        # If an interation moves no items to the ordered commands,
-        # then there is a circular reference somewhere in the
-        # unordered commands.
-
-        self.orderedMPCmds = OrderedDict()
-        unorderedCmdNms = self.unorderedMPCmds.keys()
-        
-        while len(unorderedCmdNms) > 0:
-            startUnorderedLen = len(unorderedCmdNms)
-            for rsltNm in unorderedCmdNms:
-                if self.unorderedMPCmds[rsltNm].DependencyNms() is None:
-                    # Command has no dependencies and thus is good to run
-                    self.orderedMPCmds[rsltNm] = self.unorderedMPCmds[rsltNm]
-                    unorderedCmdNms.remove(rsltNm)
-                elif set(self.unorderedMPCmds[rsltNm].DependencyNms()).issubset(set(self.orderedMPCmds)):
-                    # All dependencies are already in ordered commands
-                    self.orderedMPCmds[rsltNm] = self.unorderedMPCmds[rsltNm]
-                    unorderedCmdNms.remove(rsltNm)
-        
-            if startUnorderedLen == len(unorderedCmdNms):
+        for rsltNm in self.unorderedMPCmds:
+            self.dependentNms[rsltNm] = []
+
+        for rsltNm,mpCmd in self.unorderedMPCmds.items():
+
+            depNms = set(mpCmd.DependencyNms() or [])
+            missingNms = [nm for nm in depNms if nm not in self.unorderedMPCmds]
+            
+            if len(missingNms) > 0:
                 raise Exception(
-                    '{}{}{}{}{}'.format(
+                    '{}{}{}{}'.format(
                         '\n********************ERROR********************\n',
-                        'Circular reference in script. One or more of the\n',
-                        '  result variables in the script depends on itself.\n',
-                        'File: {}\n'.format(mpCmd.CmdFileNm()),
-                        'Cicular reference among commands for these variables:\n  {}'.format(
-                            ' '.join(self.unorderedMPCmds)
+                        'Required variable(s) for computing a result is(are) missing:\n  {}\n'.format(
+                            ' '.join(missingNms)
+                        ),
+                        'File: {}  Line number: {}\n'.format(
+                            mpCmd.CmdFileNm(),
+                            mpCmd.LineNo()
+                        ),
+                        'Full command:\n{}\n'.format(mpCmd.RawCmdStr())
+                    )
+                )
+
+            unmetCnts[rsltNm] = len(depNms)
+            for depNm in depNms:
+                self.dependentNms[depNm].append(rsltNm)
+
+        # for rsltNm,mpCmd in self.unorderedMPCmds.items():
+
+        # Now to order commands...
+        # Commands with no unmet dependencies are ready. As each
+        # ready command is moved to the ordered commands, the
+        # unmet dependency counts of the commands that depend on
+        # it are decremented, making them ready when they hit zero.
+        # Anything never made ready is in, or depends on, a
+        # circular reference.
+
+        orderedMPCmds = OrderedDict()
+        readyNms = deque([nm for nm in self.unorderedMPCmds if unmetCnts[nm] == 0])
+
+        while len(readyNms) > 0:
+            rsltNm = readyNms.popleft()
+            orderedMPCmds[rsltNm] = self.unorderedMPCmds[rsltNm]
+            for dependentNm in self.dependentNms[rsltNm]:
+                unmetCnts[dependentNm] -= 1
+                if unmetCnts[dependentNm] == 0:
+                    readyNms.append(dependentNm)
+
+        if len(orderedMPCmds) != len(self.unorderedMPCmds):
+
+            cycleNms = self._FindCycle(
+                [nm for nm in self.unorderedMPCmds if nm not in orderedMPCmds]
+                )
+
+            raise Exception(
+                '{}{}{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Circular reference in script. One or more of the\n',
+                    '  result variables in the script depends on itself.\n',
+                    'Circular reference: {}\n'.format(' -> '.join(cycleNms)),
+                    'Commands in the circular reference:\n{}'.format(
+                        ''.join([
+                            '  {}  File: {}  Line number: {}\n'.format(
+                                nm,
+                                self.unorderedMPCmds[nm].CmdFileNm(),
+                                self.unorderedMPCmds[nm].LineNo()
+                                )
+                            for nm in cycleNms[:-1]
+                            ])
                         )
                     )
                 )
+
+        self.orderedMPCmds = orderedMPCmds
         
     # def _OrderCommands()
 
-    def _ParseDict(self,rsltNm,treeImage,lvl):
+    def _FindCycle(self,unorderedNms):
+
+        # Every command that could not be ordered depends on at least
+        # one other command that could not be ordered. Following those
+        # dependencies from any of them must eventually revisit a
+        # command, and the path from the first visit is a cycle.
 
-        treeImage.append((rsltNm,lvl))
-        lvl += 1
+        unorderedNmSet = set(unorderedNms)
+        pathNms = []
+        pathNdxs = {}
+        rsltNm = unorderedNms[0]
+
+        while rsltNm not in pathNdxs:
+            pathNdxs[rsltNm] = len(pathNms)
+            pathNms.append(rsltNm)
+            for depNm in self.unorderedMPCmds[rsltNm].DependencyNms():
+                if depNm in unorderedNmSet:
+                    rsltNm = depNm
+                    break
+
+        # Each command in the cycle depends on the one after it
+        cycleNms = pathNms[pathNdxs[rsltNm]:]
+        cycleNms.append(rsltNm)
+
+        return cycleNms
+
+    # def _FindCycle(self,unorderedNms):
+
+    def _CmdTreeEntries(self,expandShared):
+
+        # The command tree as (rsltNm, level, refNdx), depth first
+        # from each command no other command depends on, in script
+        # order. Unless expandShared, a command that others share is
+        # expanded only the first time it is reached; later it is a
+        # reference to that expansion, without its dependencies, and
+        # refNdx is the index of the expansion's entry. Otherwise
+        # refNdx is None. Iterative, and without expandShared linear
+        # in the number of commands plus dependencies.
+
+        if self.orderedMPCmds is None:
+            self._OrderCmds()
 
-        if self.orderedMPCmds[rsltNm].DependencyNms() is not None:
-            for subRsltNm in self.orderedMPCmds[rsltNm].DependencyNms():
-                self._ParseDict(subRsltNm,treeImage,lvl)
+        depNmsByRslt = dict([
+            (rsltNm,mpCmd.DependencyNms() or []) for rsltNm,mpCmd in self.orderedMPCmds.items()
+            ])
 
-        return treeImage
+        # The top node(s), upon which no others depend
+        topNodeNms = [
+            rsltNm for rsltNm in self.orderedMPCmds if len(self.dependentNms[rsltNm]) == 0
+            ]
 
-    # def _ParseDict(self,rsltNm,treeImage,lvl):
+        treeEntries = []
+        expandedNdxs = {}   # rsltNm: index of the entry expanding it
+        for topNodeNm in topNodeNms:
+
+            stack = [(topNodeNm,0)]
+            while len(stack) > 0:
+
+                rsltNm,lvl = stack.pop()
+                depNms = depNmsByRslt[rsltNm]
+
+                if not expandShared and rsltNm in expandedNdxs and len(depNms) > 0:
+                    treeEntries.append((rsltNm,lvl,expandedNdxs[rsltNm]))
+                    continue
+
+                if rsltNm not in expandedNdxs:
+                    expandedNdxs[rsltNm] = len(treeEntries)
+                treeEntries.append((rsltNm,lvl,None))
+
+                # Reversed, so the first dependency is popped first
+                for depNm in reversed(depNms):
+                    stack.append((depNm,lvl + 1))
+
+            # while len(stack) > 0:
+        # for topNodeNm in topNodeNms:
+
+        return treeEntries
+
+    # def _CmdTreeEntries(self,expandShared):
 
     def _ClearCmds(self):
 
         self.unorderedMPCmds = OrderedDict()
         self.orderedMPCmds = None
+        self.dependentNms = None
+        self.execSigs = {}
+        self.releasedNms = set()
         
     # def _ClearCmds(self):
-    
+
+    def _CompiledState(self):
+        # What a compiled program holds: the commands, in script order,
+        # and the order they execute in
+        return {
+            'cmdStates':[mpcomp.CmdState(mpCmd) for mpCmd in self.unorderedMPCmds.values()],
+            'orderedNms':self.orderedMPCmds.keys(),
+            'dependentNms':self.dependentNms.items(),
+            }
+
+    def _LoadCompiled(self,compiledFNm,progKey):
+
+        # Loads the compiled program if it matches progKey. Returns
+        # whether it did.
+
+        progState = mpcomp.Load(compiledFNm,progKey)
+        if progState is None:
+            return False
+
+        for cmdState in progState['cmdStates']:
+            mpCmd = mpcomp.CmdFromState(cmdState)
+            self.unorderedMPCmds[mpCmd.RsltNm()] = mpCmd
+
+        self.orderedMPCmds = OrderedDict([
+            (rsltNm,self.unorderedMPCmds[rsltNm]) for rsltNm in progState['orderedNms']
+            ])
+        self.dependentNms = OrderedDict(progState['dependentNms'])
+        self.mptCmdStructs = OrderedDict([
+            (rsltNm,mpCmd.StrCmd()) for rsltNm,mpCmd in self.unorderedMPCmds.items()
+            ])
+
+        return True
+
+    # def _LoadCompiled(self,compiledFNm,progKey):
+
+    def _CreateCmds(self,mptCmdStructs):
+
+        self.mptCmdStructs = mptCmdStructs
+        for rsltNm,mptCmdStruct in self.mptCmdStructs.items():
+            self.unorderedMPCmds[rsltNm] = \
+              self.mpFramework.CreateFxnObject(mptCmdStruct['parsedCmd']['cmd'],mptCmdStruct)
+
+    # def _CreateCmds(self,mptCmdStructs):
+
     # public classes
 
-    def LoadMptFile(self,sourceProgFNm):
+    def LoadMptFile(self,sourceProgFNm,compiledFNm=None):
         # Replaces current set of commands with new commands
-        # from a file.
+        # from a file. With compiledFNm, the compiled program in
+        # that file is used if it is current, and otherwise written.
 
         self._ClearCmds()
         
@@ -147,31 +316,42 @@ class MPilotProgram(object):
                         )
                     )
 
-            self.mptCmdStructs = mpparse.ParseFileToCommands(sourceProgFNm)
-                
-            for rsltNm,mptCmdStruct in self.mptCmdStructs.items():
-                self.unorderedMPCmds[rsltNm] = \
-                  self.mpFramework.CreateFxnObject(mptCmdStruct['parsedCmd']['cmd'],mptCmdStruct)
+            if compiledFNm is not None:
+                with open(sourceProgFNm,'r') as inF:
+                    progKey = mpcomp.ProgKey(self.mpFramework,sourceProgFNm,inF.read())
+                if self._LoadCompiled(compiledFNm,progKey):
+                    return
 
+            self._CreateCmds(mpparse.ParseFileToCommands(sourceProgFNm))
             self._OrderCmds()
 
-    # def LoadMptFile(self,sourceProgFNm):
+            if compiledFNm is not None:
+                mpcomp.Save(compiledFNm,progKey,self._CompiledState())
 
-    def LoadMptStr(self,inStr): # The string is a complete program
+    # def LoadMptFile(self,sourceProgFNm,compiledFNm=None):
+
+    def LoadMptStr(self,inStr,compiledFNm=None): # The string is a complete program
         # Replaces current set of commands with new commands
-        # from a string.
+        # from a string. With compiledFNm, as LoadMptFile(), and
+        # the commands are ordered now rather than when first
+        # needed.
 
         self._ClearCmds()
-        
-        # Parse the string into commands
-        self.mptCmdStructs = mpparse.ParseStringToCommands(inStr,'Script string')
 
-        # Create the commands and save them in this program object
-        for rsltNm,mptCmdStruct in self.mptCmdStructs.items():
-            self.unorderedMPCmds[rsltNm] = \
-              self.mpFramework.CreateFxnObject(mptCmdStruct['parsedCmd']['cmd'],mptCmdStruct)
+        if compiledFNm is not None:
+            progKey = mpcomp.ProgKey(self.mpFramework,'Script string',inStr)
+            if self._LoadCompiled(compiledFNm,progKey):
+                return
+
+        # Parse the string into commands and save them in this
+        # program object
+        self._CreateCmds(mpparse.ParseStringToCommands(inStr,'Script string'))
 
-    # def LoadMptStr(self,sourceProgFNm):
+        if compiledFNm is not None:
+            self._OrderCmds()
+            mpcomp.Save(compiledFNm,progKey,self._CompiledState())
+
+    # def LoadMptStr(self,inStr,compiledFNm=None):
         
     def MPFramework(self):
         # Access to the underlying mpFramework. Not necessarily
@@ -200,8 +380,25 @@ class MPilotProgram(object):
             )
                     
         self.unorderedMPCmds[mpCmd.RsltNm()] = mpCmd
-        
-        self.orderedMPCmds = None # invalidate ordering
+
+        # No existing command can depend on the new one (the ordering
+        # would have failed), so if everything the new command depends
+        # on is already ordered, it can go at the end of the ordering.
+        # Otherwise the ordering is invalid until the missing commands
+        # are added.
+
+        if self.orderedMPCmds is not None:
+            
+            depNms = set(mpCmd.DependencyNms() or [])
+            
+            if all([nm in self.orderedMPCmds for nm in depNms]):
+                self.orderedMPCmds[mpCmd.RsltNm()] = mpCmd
+                self.dependentNms[mpCmd.RsltNm()] = []
+                for depNm in depNms:
+                    self.dependentNms[depNm].append(mpCmd.RsltNm())
+            else:
+                self.orderedMPCmds = None # invalidate ordering
+                self.dependentNms = None
         
     # def AddCmd(self,mpCmd):
 
@@ -219,10 +416,30 @@ class MPilotProgram(object):
         
     def DelCmdByRsltNm(self,rsltNm):
         
-        if rsltNm in self.unorderedMPCmds:
-            del self.unorderedMPCmds[rsltNm]
+        if rsltNm not in self.unorderedMPCmds:
+            return
 
-        self.orderedMPCmds = None # invalidate ordering
+        mpCmd = self.unorderedMPCmds[rsltNm]
+        del self.unorderedMPCmds[rsltNm]
+        self.execSigs.pop(rsltNm,None)
+        self.releasedNms.discard(rsltNm)
+
+        # Removing a command nothing depends on leaves a valid
+        # ordering. Removing one that other commands depend on leaves
+        # those commands with a missing dependency, which is reported
+        # the next time the commands are ordered.
+
+        if self.orderedMPCmds is not None:
+
+            if len(self.dependentNms[rsltNm]) == 0:
+                del self.orderedMPCmds[rsltNm]
+                del self.dependentNms[rsltNm]
+                for depNm in set(mpCmd.DependencyNms() or []):
+                    if rsltNm in self.dependentNms.get(depNm,[]):
+                        self.dependentNms[depNm].remove(rsltNm)
+            else:
+                self.orderedMPCmds = None # invalidate ordering
+                self.dependentNms = None
         
     # def DelCmd(self,mpCmd):
         
@@ -244,64 +461,775 @@ class MPilotProgram(object):
 
     def CmdTree(self):
 
-        if self.orderedMPCmds is None:
-            self._OrderCmds()
-            
-        # find the top node(s)
-        
-        # Create a dictionary of all the rsltNms that are
-        # depended upon
-        depends = {}
-        for rsltNm,mpCmd in self.orderedMPCmds.items():
-            if mpCmd.DependencyNms() is not None:
-                for depRsltNm in mpCmd.DependencyNms():
-                    depends[depRsltNm] = True
+        # (rsltNm, level) of the commands in the tree of commands
+        # and their dependencies. A shared command is listed with its
+        # dependencies under every command that uses it, so the tree
+        # can grow exponentially with sharing. CompactCmdTree() lists
+        # them once.
 
-        # Compare depends{} contents with all commands to find those
-        # upon which no others depend
-        
-        topNodeFlds = []
-        for rsltNm in self.orderedMPCmds.keys():
-            if rsltNm not in depends.keys():
-                topNodeFlds.append(rsltNm)
+        return [(rsltNm,lvl) for rsltNm,lvl,refNdx in self._CmdTreeEntries(True)]
+    
+    # def CmdTree(self):
 
-        topNodeFlds = []
-        for rsltNm in self.orderedMPCmds.keys():
-            if rsltNm not in depends.keys():
-                topNodeFlds.append(rsltNm)
+    def CompactCmdTree(self):
 
-        # order nodes by dependency, tracking depth
+        # (rsltNm, level, refNdx) of the commands in the tree of
+        # commands and their dependencies. A shared command's
+        # dependencies are listed once, under its first appearance.
+        # Later appearances have the index of that one as refNdx,
+        # others None (see _CmdTreeEntries()).
 
-        treeImage = []
-        for topNodeFld in topNodeFlds:
-            self._ParseDict(topNodeFld,treeImage,0)
+        return self._CmdTreeEntries(False)
 
-        return treeImage
-    
-    # def CmdTree(self):
+    # def CompactCmdTree(self):
+
+    def CmdTreeWithLines(self,expandShared=False):
 
-    def CmdTreeWithLines(self):
+        # Unless expandShared, a command already shown with its
+        # dependencies is marked with the line it is shown on
+        # rather than shown again
         
-        rtrn = ''
-        for rsltNm,lvl in self.CmdTree():
+        lines = []
+        for rsltNm,lvl,refNdx in self._CmdTreeEntries(expandShared):
             if lvl > 0:
-                rtrn += '{}'.format((lvl-1) * '|   ')
-                rtrn += '|---'
-                rtrn += '{}\n'.format(rsltNm)
+                line = '{}|---{}'.format((lvl-1) * '|   ',rsltNm)
             else:
-                rtrn += '{}\n'.format(rsltNm)
+                line = rsltNm
+            if refNdx is not None:
+                line = '{} (shown above, line {})'.format(line,refNdx + 1)
+            lines.append('{}\n'.format(line))
 
-        return rtrn
+        return ''.join(lines)
                 
-    # def CmdTreeWithLines(self):
+    # def CmdTreeWithLines(self,expandShared=False):
+
+    def CmdGraph(self):
+
+        # The commands and their dependencies as lists of nodes and
+        # edges, in execution order:
+        #   'nodes': [{'id':rsltNm,'fxnNm','cmdFileNm','lineNo'}, ...]
+        #   'edges': [[rsltNm, rsltNm of a command it depends on], ...]
+
+        if self.orderedMPCmds is None:
+            self._OrderCmds()
+
+        nodes = []
+        edges = []
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+            nodes.append({
+                'id':rsltNm,
+                'fxnNm':mpCmd.FxnNm(),
+                'cmdFileNm':mpCmd.CmdFileNm(),
+                'lineNo':mpCmd.LineNo(),
+                })
+
+            # One edge per dependency, however often it is named
+            edgeNms = set()
+            for depNm in mpCmd.DependencyNms() or []:
+                if depNm not in edgeNms:
+                    edgeNms.add(depNm)
+                    edges.append([rsltNm,depNm])
+
+        # for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+        return {'nodes':nodes,'edges':edges}
+
+    # def CmdGraph(self):
+
+    def WriteCmdGraph(self,outFNm):
+
+        # Encoded in one piece, which is much faster than json.dump()
+        # writing it piece by piece
+        graphStr = json.dumps(self.CmdGraph(),sort_keys=True)
+        with open(outFNm,'w') as outF:
+            outF.write(graphStr)
 
-    def Run(self):
+    # def WriteCmdGraph(self,outFNm):
+
+    def _FileSig(self,fNm,fileSigs,hashFiles):
+
+        # (size, modification time, content hash) of a file. The
+        # contents are hashed only when the size or modification time
+        # differs from when the file was last seen, or when hashFiles
+        # and they have not been hashed yet. Otherwise the hash is
+        # None, and the file is known by its size and modification
+        # time alone, so a file that was never hashed and is touched
+        # without being changed makes the commands reading it stale.
+
+        if fNm in fileSigs:
+            return fileSigs[fNm]
+
+        fStat = mphash.FileStat(fNm)
+        lastSig = self.fileSigs.get(fNm)
+        if fStat is None:
+            fileSig = None
+        elif lastSig is not None and lastSig[:2] == fStat and \
+          (lastSig[2] is not None or not hashFiles):
+            fileSig = lastSig
+        elif lastSig is not None or hashFiles:
+            fileSig = fStat + (mphash.FileHash(fNm),)
+        else:
+            fileSig = fStat + (None,)
+
+        fileSigs[fNm] = fileSig
+        return fileSig
+
+    # def _FileSig(self,fNm,fileSigs,hashFiles):
+
+    def _CmdSig(self,mpCmd,fileSigs,hashFiles):
+
+        # A command needs to be executed again when its signature
+        # changes: its function and arguments, and the contents of
+        # the files it reads, as their hashes where they have been
+        # hashed (see _FileSig()).
+
+        inFileSigs = []
+        for fNm in mpCmd.InFileNms():
+            fileSig = self._FileSig(fNm,fileSigs,hashFiles)
+            if fileSig is None:
+                inFileSigs.append((fNm,None))
+            elif fileSig[2] is None:
+                inFileSigs.append((fNm,fileSig[:2]))
+            else:
+                inFileSigs.append((fNm,fileSig[2]))
+
+        return (mphash.ArgsSig(mpCmd),tuple(inFileSigs))
+
+    # def _CmdSig(self,mpCmd,fileSigs,hashFiles):
+
+    def _StaleCmds(self,hashFiles=False):
+
+        # Finds the commands that need to be executed: those that
+        # have not been executed, whose signature has changed, that
+        # write files that no longer exist, or that depend on any of
+        # these. Results freed by releaseRslts are recomputed only
+        # when a stale command needs them, which includes a stale
+        # duplicate of the command (see self.dupOf).
+        #
+        # Returns the stale commands, in order, and the signatures of
+        # all commands. With hashFiles, the signatures include the
+        # hash of every file read, as the keys of cached and
+        # checkpointed results need.
+
+        if self.orderedMPCmds is None:
+            self._OrderCmds()
+
+        fileSigs = {}
+        cmdSigs = {}
+        dirtyNms = set()
         
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+            cmdSigs[rsltNm] = self._CmdSig(mpCmd,fileSigs,hashFiles)
+            
+            if cmdSigs[rsltNm] != self.execSigs.get(rsltNm):
+                dirtyNms.add(rsltNm)
+            elif mpCmd.HasSideEffects() and \
+              not all([os.path.exists(fNm) for fNm in mpCmd.OutFileNms()]):
+                dirtyNms.add(rsltNm)
+            elif any([depNm in dirtyNms for depNm in mpCmd.DependencyNms() or []]):
+                dirtyNms.add(rsltNm)
+
+        # for rsltNm,mpCmd in self.orderedMPCmds.items():
+
+        self.fileSigs.update(fileSigs)
+
+        dupNms = {}
+        for dupNm,origNm in self.dupOf.items():
+            dupNms.setdefault(origNm,[]).append(dupNm)
+
+        staleNms = set()
+        for rsltNm in reversed(self.orderedMPCmds.keys()):
+            if rsltNm in dirtyNms:
+                staleNms.add(rsltNm)
+            elif rsltNm in self.releasedNms and \
+              any([nm in staleNms for nm in self.dependentNms[rsltNm] + dupNms.get(rsltNm,[])]):
+                staleNms.add(rsltNm)
+
+        staleCmds = OrderedDict()
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+            if rsltNm in staleNms:
+                staleCmds[rsltNm] = mpCmd
+
+        return staleCmds,cmdSigs
+
+    # def _StaleCmds(self):
+
+    def _AncestorNms(self,targetNms):
+
+        # The target results and every result they depend on,
+        # directly or indirectly. A duplicate (see self.dupOf)
+        # depends on the command it duplicates.
+
+        for targetNm in targetNms:
+            if targetNm not in self.unorderedMPCmds:
+                raise Exception(
+                    '{}{}'.format(
+                        '\n********************ERROR********************\n',
+                        'Target result is not in the program: {}\n'.format(targetNm)
+                        )
+                    )
+
+        ancestorNms = set(targetNms)
+        toVisitNms = list(targetNms)
+        while len(toVisitNms) > 0:
+            rsltNm = toVisitNms.pop()
+            depNms = list(self.unorderedMPCmds[rsltNm].DependencyNms() or [])
+            if rsltNm in self.dupOf:
+                depNms.append(self.dupOf[rsltNm])
+            for depNm in depNms:
+                if depNm not in ancestorNms:
+                    ancestorNms.add(depNm)
+                    toVisitNms.append(depNm)
+
+        return ancestorNms
+
+    # def _AncestorNms(self,targetNms):
+
+    def _CacheKeys(self,cmdSigs):
+
+        # Keys for cached results, computed in dependency order so
+        # that each key includes the keys of the commands it depends
+        # on. See MPilotHash.CmdKey().
+
+        cacheKeys = {}
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+            depKeys = [(nm,cacheKeys[nm]) for nm in set(mpCmd.DependencyNms() or [])]
+            cacheKeys[rsltNm] = mphash.CmdKey(
+                cmdSigs[rsltNm],
+                mpCmd.ExecSigExtras(),
+                depKeys
+                )
+
+        return cacheKeys
+
+    # def _CacheKeys(self,cmdSigs):
+
+    def _LoadFromCache(self,mpCmd,executedObjects):
+
+        # Called by the executor for each command that is ready to
+        # run. Commands with side effects are always executed.
+
+        if self.rsltCache is None or mpCmd.HasSideEffects():
+            return False
+
+        execState = self.rsltCache.Load(self.cacheKeys[mpCmd.RsltNm()])
+        if execState is None:
+            return False
+
+        # mpCmd may be standing in for the program's command (see
+        # MPilotFusion.py)
+        rsltCmd = self.unorderedMPCmds[mpCmd.RsltNm()]
+        mpcache.SetExecState(rsltCmd,execState)
+        executedObjects[mpCmd.RsltNm()] = rsltCmd
+        self.cacheLoadedNms.add(mpCmd.RsltNm())
+
+        return True
+
+    # def _LoadFromCache(self,mpCmd,executedObjects):
+
+    def _LoadCmd(self,mpCmd,executedObjects):
+
+        # Called by the executor for each command that is ready to
+        # run. A duplicate takes the execution state of the command it
+        # duplicates, which has completed. The result is shared, not
+        # copied.
+
+        if not isinstance(mpCmd,mpdedup.MPilotAliasCmd):
+            return self._LoadFromCache(mpCmd,executedObjects)
+
+        rsltCmd = self.unorderedMPCmds[mpCmd.RsltNm()]
+        mpcache.SetExecState(
+            rsltCmd,
+            mpcache.ExecState(self.unorderedMPCmds[mpCmd.OrigNm()])
+            )
+        executedObjects[mpCmd.RsltNm()] = rsltCmd
+
+        return True
+
+    # def _LoadCmd(self,mpCmd,executedObjects):
+
+    def _StoreInCache(self,rsltNm):
+
+        mpCmd = self.unorderedMPCmds[rsltNm]
+        if rsltNm in self.cacheLoadedNms or rsltNm in self.dupOf or mpCmd.HasSideEffects():
+            return
+
+        self.rsltCache.Store(self.cacheKeys[rsltNm],mpcache.ExecState(mpCmd))
+
+    # def _StoreInCache(self,rsltNm):
+
+    def _Resume(self,staleCmds,cmdSigs,cmdKeys,releaseRslts,keepRsltNms):
+
+        # Removes from staleCmds the commands completed in the
+        # checkpointed run being resumed, restoring their results.
+        # With releaseRslts, only the results that the remaining
+        # commands need, and those that would be kept (see
+        # _RemainingUses()), are read. The rest are treated as
+        # released. A result that can't be read is computed again.
+        #
+        # Commands come after those they depend on, so in reverse
+        # order the commands that need a result are decided before it.
+
+        neededNms = set(keepRsltNms or [])
+        usedNms = set()
+        for mpCmd in self.orderedMPCmds.values():
+            neededNms.update(mpCmd.OutputNms())
+            usedNms.update(mpCmd.DependencyNms() or [])
+
+        for rsltNm in reversed(staleCmds.keys()):
+
+            mpCmd = staleCmds[rsltNm]
+
+            isDone = self.checkpoint.IsComplete(mpCmd,cmdKeys[rsltNm])
+            if isDone and releaseRslts and \
+              rsltNm not in neededNms and rsltNm in usedNms:
+                mpCmd.execRslt = None
+                self.rslts.pop(rsltNm,None)
+                self.releasedNms.add(rsltNm)
+            elif isDone:
+                execState = self.checkpoint.Load(cmdKeys[rsltNm])
+                if execState is None:
+                    isDone = False
+                else:
+                    mpcache.SetExecState(mpCmd,execState)
+                    self.rslts[rsltNm] = mpCmd
+                    self.releasedNms.discard(rsltNm)
+
+            if isDone:
+                self.execSigs[rsltNm] = cmdSigs[rsltNm]
+                self.resumedNms.add(rsltNm)
+                del staleCmds[rsltNm]
+            else:
+                neededNms.update(mpCmd.DependencyNms() or [])
+                if rsltNm in self.dupOf:
+                    neededNms.add(self.dupOf[rsltNm])
+
+        # for rsltNm in reversed(staleCmds.keys()):
+
+    # def _Resume(...)
+
+    def _RemainingUses(self,runMPCmds,keepRsltNms):
+
+        # For each result that may be released, the number of
+        # commands being run that use it. Results written out of the program
+        # by a command (see OutputNms()) or listed in keepRsltNms
+        # are never released, nor are results that no command uses.
+
+        keepNms = set(keepRsltNms or [])
+        for mpCmd in self.orderedMPCmds.values():
+            keepNms.update(mpCmd.OutputNms())
+
+        remainingUses = {}
+        for mpCmd in runMPCmds.values():
+            for depNm in set(mpCmd.DependencyNms() or []):
+                if depNm not in keepNms:
+                    remainingUses[depNm] = remainingUses.get(depNm,0) + 1
+
+        return remainingUses
+
+    # def _RemainingUses(self,keepRsltNms):
+
+    def _TrackRslt(self,rsltNm):
+
+        # Update live result bytes with a newly completed result
+
+        rslt = self.unorderedMPCmds[rsltNm].ExecRslt()
+        nBytes = mprslt.RsltNBytes(rslt)
+
+        # A duplicate's result is that of the command it duplicates
+        if rsltNm in self.dupOf and \
+          rslt is self.unorderedMPCmds[self.dupOf[rsltNm]].ExecRslt():
+            nBytes = 0
+        self.liveBytes[rsltNm] = nBytes
+        self.memReport['liveBytes'] += nBytes
+
+        if self.memReport['liveBytes'] > self.memReport['peakLiveBytes']:
+            self.memReport['peakLiveBytes'] = self.memReport['liveBytes']
+            self.memReport['peakRsltNm'] = rsltNm
+
+    # def _TrackRslt(self,rsltNm):
+
+    def _ReleaseDeadRslts(self,mpCmd,remainingUses):
+
+        # mpCmd has completed. Release any of its inputs that
+        # no remaining command uses.
+
+        for depNm in set(mpCmd.DependencyNms() or []):
+            
+            if depNm not in remainingUses:
+                continue
+            
+            remainingUses[depNm] -= 1
+            
+            if remainingUses[depNm] == 0:
+                self.ReleaseRslt(depNm)
+                self.memReport['releasedRsltNms'].append(depNm)
+
+    # def _ReleaseDeadRslts(self,mpCmd,remainingUses):
+
+    def _PublishFused(self,fusedCmd,cmdSigs):
+
+        # A fused group of commands has completed. When run in a
+        # worker process its commands were copies, so the result is
+        # brought back into the program's command. The results of the
+        # rest of the group were never kept. They are treated as
+        # released, and recomputed if a stale command needs them.
+
+        rsltNm = fusedCmd.RsltNm()
+        rootCmd = self.unorderedMPCmds[rsltNm]
+        if fusedCmd.RootCmd() is not rootCmd:
+            mpcache.SetExecState(rootCmd,mpcache.ExecState(fusedCmd.RootCmd()))
+        self.rslts[rsltNm] = rootCmd
+
+        for memberNm in fusedCmd.MemberNms()[:-1]:
+            self.execSigs[memberNm] = cmdSigs[memberNm]
+            self.ReleaseRslt(memberNm)
+
+    # def _PublishFused(self,fusedCmd,cmdSigs):
+
+    def Run(self,**runArgs):
+
+        # Executes the program. Takes the arguments of RunIter().
+
+        for rsltNm,rslt,timing in self.RunIter(**runArgs):
+            pass
+
+    # def Run(self,**runArgs):
+
+    def RunIter(
+        self,
+        workers=None,       # Number of commands to execute at once
+        useProcesses=False, # Use worker processes instead of threads
+        releaseRslts=False, # Free intermediate results once used
+        keepRsltNms=None,   # Results never freed by releaseRslts
+        cacheDir=None,      # Directory for results cached across runs
+        cacheMaxBytes=mpcache.DEFAULT_MAX_BYTES,
+        targets=None,       # Only compute these results
+        profile=False,      # Record what each command costs
+        fuse=False,         # Fuse chains of elementwise commands
+        dedup=False,        # Execute duplicate commands once
+        checkpointDir=None, # Directory for a checkpoint of the run
+        resume=False,       # Resume the run checkpointed in checkpointDir
+        prefetchWorkers=None,   # Number of threads reading input ahead
+        prefetchMaxBytes=mppre.DEFAULT_MAX_BYTES,
+        ):
+
+        # Generator that executes the program, yielding (rsltNm,
+        # rslt, timing) as each command completes, so that results
+        # can be used before the whole program has run. timing is a
+        # dict with the command's start time and wallSecs, plus the
+        # rest of MPilotProfiler.ProfiledCall()'s stats when
+        # profiling. For a command whose result was loaded rather
+        # than computed (from the cache, or a duplicate's), it is the
+        # loading that is timed.
+        #
+        # Closing the generator, e.g. by breaking out of a loop over
+        # it, cancels the run. Commands already executing complete,
+        # and no more are started. Commands not completed stay stale,
+        # so the next run executes only them.
+        #
+        # With workers of None or 1, commands are executed one at a
+        # time in dependency order. Otherwise each command is handed
+        # to a pool of workers as soon as all the commands it depends
+        # on have completed. Results are the same either way.
+        #
+        # With releaseRslts, each intermediate result is released
+        # as soon as the last command that uses it has completed.
+        # See _RemainingUses() for the results that are kept.
+        # MemReport() gives the peak bytes held by live results.
+        #
+        # Only stale commands are executed (see _StaleCmds()), so
+        # running a program again after SetArg() or after changing an
+        # input file only executes the commands affected by the
+        # change. ClearRslts() forces everything to be executed.
+        #
+        # With a cacheDir, each stale command's result is loaded from
+        # the cache when an identical command with identical inputs
+        # has been executed before, in this or any other script, and
+        # is stored in the cache otherwise. See MPilotRsltCache.py.
+        #
+        # With targets, a list of result names, only the commands
+        # needed to compute those results are executed.
+        #
+        # With profile, the time and memory used by each command
+        # executed are recorded. See ProfileReport() and
+        # MPilotProfiler.py.
+        #
+        # With fuse, chains of elementwise commands whose
+        # intermediate results are used only within the chain are
+        # evaluated together, block by block, and only the last result
+        # of each chain is kept. See MPilotFusion.py.
+        #
+        # With dedup, commands that compute the same thing as an
+        # earlier command under a different result name are not
+        # executed. They share the earlier command's result. See
+        # MPilotDedup.py.
+        #
+        # With a checkpointDir, each command's result is stored there
+        # as it completes. If the run fails, running again with resume
+        # restores the results of the commands that completed, when
+        # their commands and the files and results they depend on are
+        # unchanged, and executes only the rest. See MPilotCheckpoint.py.
+        #
+        # With prefetchWorkers, commands that read input files read
+        # ahead of their turn on that many background threads, holding
+        # at most prefetchMaxBytes of what was read until it is used.
+        # See MPilotPrefetch.py.
+
         if self.orderedMPCmds is None:
             self._OrderCmds()
+
+        self.dupOf = {}
+        if dedup:
+            self.dupOf = mpdedup.DuplicateCmds(self.orderedMPCmds)
+        
+        staleCmds,cmdSigs = self._StaleCmds(
+            hashFiles=cacheDir is not None or checkpointDir is not None
+            )
+
+        if targets is not None:
+            targetNms = self._AncestorNms(targets)
+            for rsltNm in staleCmds.keys():
+                if rsltNm not in targetNms:
+                    del staleCmds[rsltNm]
+            keepRsltNms = list(keepRsltNms or []) + list(targets)
+
+        cmdKeys = None
+        if cacheDir is not None or checkpointDir is not None:
+            cmdKeys = self._CacheKeys(cmdSigs)
+
+        self.resumedNms = set()
+        if checkpointDir is not None:
+            self.checkpoint = mpckpt.MPilotCheckpoint(checkpointDir,resume)
+            if resume:
+                self._Resume(staleCmds,cmdSigs,cmdKeys,releaseRslts,keepRsltNms)
+
+        # Stale commands stay stale if the run fails before they
+        # complete
+        for rsltNm in staleCmds:
+            self.execSigs.pop(rsltNm,None)
+
+        self.liveBytes = {}
+        self.memReport = OrderedDict([
+            ('liveBytes',0),
+            ('peakLiveBytes',0),
+            ('peakRsltNm',None),
+            ('releasedRsltNms',[]),
+            ])
+
+        for rsltNm in self.orderedMPCmds:
+            if rsltNm not in staleCmds and rsltNm not in self.releasedNms:
+                self._TrackRslt(rsltNm)
+
+        runCmds = staleCmds
+        if len(self.dupOf) > 0:
+            runCmds = OrderedDict()
+            for rsltNm,mpCmd in staleCmds.items():
+                if rsltNm in self.dupOf:
+                    runCmds[rsltNm] = mpdedup.MPilotAliasCmd(mpCmd,self.dupOf[rsltNm])
+                else:
+                    runCmds[rsltNm] = mpCmd
+
+        fusedCmds = {}
+        if fuse:
+            keepNms = set(keepRsltNms or [])
+            for mpCmd in self.orderedMPCmds.values():
+                keepNms.update(mpCmd.OutputNms())
+            # Duplicates need the results they share
+            keepNms.update(self.dupOf.values())
+            runCmds,fusedCmds = mpfuse.FuseCmds(runCmds,self.orderedMPCmds,keepNms)
+
+        if releaseRslts:
+            remainingUses = self._RemainingUses(runCmds,keepRsltNms)
+
+        self.cacheLoadedNms = set()
+        if cacheDir is not None:
+            self.rsltCache = mpcache.MPilotRsltCache(cacheDir,cacheMaxBytes)
+            self.cacheKeys = cmdKeys
+
+        executor = mpexec.MPilotExecutor(
+            runCmds,
+            self.rslts,
+            workers=workers,
+            useProcesses=useProcesses,
+            loadFxn=self._LoadCmd,
+            profile=profile,
+            prefetchWorkers=prefetchWorkers,
+            prefetchMaxBytes=prefetchMaxBytes
+            )
+
+        self.profiler = None
+        if profile:
+            self.profiler = mpprof.MPilotProfiler()
+
+        execIter = executor.ExecIter()
+
+        try:
+
+            for rsltNm in execIter:
+
+                if rsltNm in fusedCmds:
+                    self._PublishFused(fusedCmds[rsltNm],cmdSigs)
+
+                self.execSigs[rsltNm] = cmdSigs[rsltNm]
+                self.releasedNms.discard(rsltNm)
+                self._TrackRslt(rsltNm)
+
+                if self.profiler is not None:
+                    self.profiler.Record(
+                        self.unorderedMPCmds[rsltNm],
+                        executor.ExecStats(rsltNm),
+                        fromCache=rsltNm in self.cacheLoadedNms
+                        )
+
+                if self.rsltCache is not None:
+                    self._StoreInCache(rsltNm)
+
+                # A duplicate is restored with the command it duplicates
+                if self.checkpoint is not None and rsltNm not in self.dupOf:
+                    self.checkpoint.Record(self.unorderedMPCmds[rsltNm],cmdKeys[rsltNm])
+
+                if releaseRslts:
+                    self._ReleaseDeadRslts(runCmds[rsltNm],remainingUses)
+
+                yield (
+                    rsltNm,
+                    self.unorderedMPCmds[rsltNm].ExecRslt(),
+                    executor.ExecStats(rsltNm)
+                    )
+
+        finally:
+
+            # Waits for commands already executing
+            execIter.close()
             
-        for mpCmdNm,mpCmd in self.orderedMPCmds.items():
-            mpCmd.Exec(self.rslts)
+            self.rsltCache = None
+            self.cacheKeys = None
+            self.checkpoint = None
+
+    # def RunIter(...)
+
+    def RunTiled(
+        self,
+        tileShape,          # Tile size along the leading dimensions
+        workers=None,       # Number of commands to execute at once
+        targets=None,       # Only compute these results
+        fuse=False,         # Fuse chains of elementwise commands
+        processes=None,     # Number of tiles to execute at once
+        ):
+
+        # Executes the program one tile of the data at a time, for
+        # data too large to hold in memory. Every command must be
+        # tileable. Results are written to output files as each tile
+        # completes and none are kept, so every command is stale
+        # afterwards. See MPilotTiler.py.
+        #
+        # With processes, tiles are executed in that many worker
+        # processes. Output files are the same as with one.
+
+        if self.orderedMPCmds is None:
+            self._OrderCmds()
+
+        tileCmds = self.orderedMPCmds
+        if targets is not None:
+            targetNms = self._AncestorNms(targets)
+            tileCmds = OrderedDict([
+                (rsltNm,mpCmd) for rsltNm,mpCmd in self.orderedMPCmds.items()
+                if rsltNm in targetNms
+                ])
+
+        runCmds = tileCmds
+        if fuse:
+            keepNms = set(targets or [])
+            for mpCmd in tileCmds.values():
+                keepNms.update(mpCmd.OutputNms())
+            runCmds,_ = mpfuse.FuseCmds(tileCmds,self.orderedMPCmds,keepNms)
+
+        tiler = mptile.MPilotTiler(
+            runCmds,
+            tileShape,
+            workers=workers,
+            processes=processes
+            )
+
+        self.ClearRslts()
+        tiler.Exec()
+
+    # def RunTiled(...)
+
+    def Estimate(
+        self,
+        calibration=None,   # dict of function name: seconds per element
+        targets=None,       # Only estimate these results
+        keepRsltNms=None,   # Results never freed by releaseRslts
+        ):
+
+        # Estimates the memory and time Run() needs without executing
+        # anything. Returns the MPilotEstimator. See MPilotEstimate.py.
+
+        estCmds = self.OrderedCmds()
+        if targets is not None:
+            targetNms = self._AncestorNms(targets)
+            estCmds = OrderedDict([
+                (rsltNm,mpCmd) for rsltNm,mpCmd in estCmds.items()
+                if rsltNm in targetNms
+                ])
+
+        estimator = mpest.MPilotEstimator(
+            estCmds,
+            calibration=calibration,
+            keepRsltNms=set(keepRsltNms or []) | set(targets or [])
+            )
+        estimator.Estimate()
+
+        return estimator
+
+    # def Estimate(...)
+
+    def ReleaseRslt(self,rsltNm):
+
+        # Frees the result of a command
+
+        if rsltNm in self.unorderedMPCmds:
+            self.unorderedMPCmds[rsltNm].execRslt = None
+        if rsltNm in self.rslts:
+            del self.rslts[rsltNm]
+        self.releasedNms.add(rsltNm)
+        if rsltNm in self.liveBytes:
+            self.memReport['liveBytes'] -= self.liveBytes[rsltNm]
+            del self.liveBytes[rsltNm]
+
+    # def ReleaseRslt(self,rsltNm):
+
+    def MemReport(self):
+        return self.memReport
+
+    def CacheLoadedRsltNms(self):
+        # Results loaded from the cache in the last run
+        return self.cacheLoadedNms
+
+    def ResumedRsltNms(self):
+        # Results restored from a checkpoint in the last run
+        return self.resumedNms
+
+    def FormattedMemReport(self):
+
+        return '{}{}{}'.format(
+            'Peak live result bytes: {}  After: {}\n'.format(
+                self.memReport['peakLiveBytes'],
+                self.memReport['peakRsltNm']
+                ),
+            'Live result bytes at end of run: {}\n'.format(self.memReport['liveBytes']),
+            'Results released: {}\n'.format(len(self.memReport['releasedRsltNms'])),
+            )
+
+    # def FormattedMemReport(self):
+
+    def ProfileReport(self):
+        # MPilotProfiler for the last run with profile, None otherwise
+        return self.profiler
 
     def Rslts(self):
         rtrn = OrderedDict()
@@ -315,6 +1243,13 @@ class MPilotProgram(object):
     def CmdByNm(self,nm):
         return self.unorderedMPCmds[nm]
 
-    def ClearRslts(self): self.rslts = {}
+    def StaleCmdNms(self):
+        # Result names of the commands the next Run() will execute
+        return self._StaleCmds()[0].keys()
+
+    def ClearRslts(self):
+        self.rslts = {}
+        self.execSigs = {}
+        self.releasedNms = set()
 
 # class MPilotProgram(object):
@@ -0,0 +1,212 @@
+# Registry manifests of MPilot libraries: the functions a library
+# module defines and their descriptions, saved so that a framework can
+# list and describe its functions, and check scripts against them,
+# without importing the library. Importing a library can take seconds
+# when it uses matplotlib, scipy or netCDF4; the framework imports it
+# only when one of its functions is created (see
+# MPilotFramework.CreateFxnObject()).
+#
+# A manifest is saved in a per user cache directory, named for the
+# absolute path of the module source (see ManifestFNm()), and records
+# the size and modification time of the source of the
+# module and of the modules its function classes inherit from. A
+# manifest whose sources have changed is ignored, and made again by
+# importing the module.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotRegistry
+
+import cPickle as pickle
+import hashlib
+import imp
+import importlib
+import inspect
+import os
+import sys
+
+from MPCore import MPilotFxnParent as mpfp
+from MPCore import MPilotHash as mphash
+
+# Changes when what is saved changes
+_MANIFEST_FORMAT = 2
+
+def ModuleNm(modSpec):
+    # The name of the module of a module specification (see
+    # MPilotFramework), e.g. ('.Addition','MathLibs') -> MathLibs.Addition
+    if isinstance(modSpec,tuple):
+        return '{}{}'.format(modSpec[1],modSpec[0])
+    return modSpec
+
+def SrcFNm(mod):
+    # The source file of an imported module, None if it has none
+
+    srcFNm = getattr(mod,'__file__',None)
+    if srcFNm is None:
+        return None
+    if srcFNm[-4:] in ['.pyc','.pyo']:
+        srcFNm = srcFNm[:-1]
+    if not os.path.isfile(srcFNm):
+        return None
+
+    return os.path.abspath(srcFNm)
+
+# def SrcFNm(mod):
+
+def ModuleSrcFNm(modNm):
+
+    # The source file of a module, found without importing it (its
+    # package is imported). None if it cannot be found.
+
+    if modNm in sys.modules:
+        return SrcFNm(sys.modules[modNm])
+
+    pkgNm,dot,baseNm = modNm.rpartition('.')
+    searchPath = None
+    if pkgNm != '':
+        searchPath = getattr(importlib.import_module(pkgNm),'__path__',None)
+        if searchPath is None:
+            return None
+
+    try:
+        modF,srcFNm,modDesc = imp.find_module(baseNm,searchPath)
+    except ImportError:
+        return None
+    if modF is not None:
+        modF.close()
+    if modDesc[2] != imp.PY_SOURCE:
+        return None
+
+    return os.path.abspath(srcFNm)
+
+# def ModuleSrcFNm(modNm):
+
+def CacheDir():
+    # The per user directory manifests are kept in:
+    # $XDG_CACHE_HOME/mpilot, or ~/.cache/mpilot
+    cacheRoot = os.environ.get('XDG_CACHE_HOME')
+    if not cacheRoot:
+        cacheRoot = os.path.join(os.path.expanduser('~'),'.cache')
+    return os.path.join(cacheRoot,'mpilot')
+
+def ManifestFNm(srcFNm):
+    # Where the manifest of a module is kept, keyed by the absolute
+    # path of its source, e.g. /libs/a.py -> CacheDir()/a-<sha1>.mpreg
+
+    srcFNm = os.path.abspath(srcFNm)
+    return os.path.join(
+        CacheDir(),
+        '{}-{}.mpreg'.format(
+            os.path.splitext(os.path.basename(srcFNm))[0],
+            hashlib.sha1(srcFNm).hexdigest()
+            )
+        )
+
+# def ManifestFNm(srcFNm):
+
+def FxnClasses(mod,modNm):
+
+    # (name, class) of the MPilot functions module mod defines.
+    # They are the classes that are:
+    #   intended to be public
+    #   descended from mpfp._MPilotFxnParent
+    #   defined in the module itself
+
+    rtrn = []
+    for attNm in dir(mod):
+
+        attr = getattr(mod,attNm)
+
+        if attNm.find('_') == 0: continue
+        if not inspect.isclass(attr): continue
+        if not issubclass(attr,mpfp._MPilotFxnParent): continue
+        if not attr.__module__ == modNm: continue
+
+        rtrn.append((attNm,attr))
+
+    return rtrn
+
+# def FxnClasses(mod,modNm):
+
+def MakeManifest(mod,modNm):
+
+    # The manifest of imported module mod:
+    #   'modNm': the module name
+    #   'fxns': [(function name, fxnDesc, formatted fxnDesc), ...]
+    #   'srcStats': [(module name, source file, FileStat()), ...] of
+    #     the module and the modules its function classes inherit from
+
+    srcMods = {modNm:mod}
+    fxns = []
+    for fxnNm,fxnCls in FxnClasses(mod,modNm):
+
+        with fxnCls() as fxn:
+            fxns.append((fxnNm,fxn.FxnDesc(),fxn.FormattedFxnDesc()))
+
+        for cls in inspect.getmro(fxnCls):
+            if cls.__module__ in sys.modules:
+                srcMods[cls.__module__] = sys.modules[cls.__module__]
+
+    srcStats = []
+    for srcModNm,srcMod in sorted(srcMods.items()):
+        srcFNm = SrcFNm(srcMod)
+        if srcFNm is not None:
+            srcStats.append((srcModNm,srcFNm,mphash.FileStat(srcFNm)))
+
+    return {
+        'modNm':modNm,
+        'fxns':fxns,
+        'srcStats':srcStats,
+        }
+
+# def MakeManifest(mod,modNm):
+
+def Load(manifestFNm,modNm):
+
+    # The manifest of module modNm, None if there is none or its
+    # sources have changed. A manifest that cannot be read is treated
+    # as missing.
+
+    if not os.path.isfile(manifestFNm):
+        return None
+
+    try:
+        with open(manifestFNm,'rb') as inF:
+            manifestFormat,manifest = pickle.load(inF)
+    except Exception:
+        return None
+
+    if manifestFormat != _MANIFEST_FORMAT or manifest['modNm'] != modNm:
+        return None
+
+    for srcModNm,srcFNm,srcStat in manifest['srcStats']:
+        if mphash.FileStat(srcFNm) != srcStat:
+            return None
+
+    return manifest
+
+# def Load(manifestFNm,modNm):
+
+def Save(manifestFNm,manifest):
+
+    # As MPilotCompiled.Save(). Returns False if the manifest cannot
+    # be saved, in which case the module is imported next time.
+
+    tmpFNm = '{}.{}.tmp'.format(manifestFNm,os.getpid())
+    try:
+        manifestDir = os.path.dirname(manifestFNm)
+        if not os.path.isdir(manifestDir):
+            os.makedirs(manifestDir)
+        with open(tmpFNm,'wb') as outF:
+            pickle.dump((_MANIFEST_FORMAT,manifest),outF,pickle.HIGHEST_PROTOCOL)
+        if os.path.exists(manifestFNm):
+            os.remove(manifestFNm)
+        os.rename(tmpFNm,manifestFNm)
+    except (IOError,OSError,pickle.PicklingError,TypeError):
+        if os.path.exists(tmpFNm):
+            os.remove(tmpFNm)
+        return False
+
+    return True
+
+# def Save(manifestFNm,manifest):
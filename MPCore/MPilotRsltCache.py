@@ -0,0 +1,177 @@
+# On-disk cache of the results of MPilot commands, shared across runs
+# and across scripts.
+#
+# Entries are keyed by a hash of everything a command's result depends
+# on (see MPilotProgram._CacheKeys()): the command's function name and
+# arguments, the contents of the files it reads, and the keys of the
+# commands it depends on. Identical subgraphs in different scripts
+# therefore share entries.
+#
+# An entry holds the execution state of a command (its result along
+# with anything else Exec() sets, such as the EEMS data type), written
+# with the highest pickle protocol so that numpy and masked arrays,
+# NCVar and NCDimensionedVar objects are stored as raw binary buffers.
+#
+# The cache is bounded in size. When it grows beyond maxBytes, the
+# least recently used entries are removed.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotRsltCache
+
+import cPickle as pickle
+import os
+import time
+
+DEFAULT_MAX_BYTES = 10 * 2**30
+
+# Attributes of a command that describe the command rather than
+# the result of executing it. fxnDesc is not among them: it is shared
+# by the class, and is only in a command's __dict__ when Exec() gives
+# the command its own (e.g. the ReturnType of an EEMSRead).
+_CMD_ATTR_NMS = ['mptCmdStruct','prefetched','argValCache']
+
+def ExecState(mpCmd):
+    # The state set on a command by executing it
+    rtrn = {}
+    for attrNm,attrVal in mpCmd.__dict__.items():
+        if attrNm not in _CMD_ATTR_NMS:
+            rtrn[attrNm] = attrVal
+    return rtrn
+
+# def ExecState(mpCmd):
+
+def SetExecState(mpCmd,execState):
+    # The state may be that of another command computing the same
+    # result (see AdoptExecState())
+    mpCmd.__dict__.update(execState)
+    mpCmd.AdoptExecState()
+
+class MPilotRsltCache(object):
+
+    def __init__(
+        self,
+        cacheDir,                    # directory holding the entries
+        maxBytes=DEFAULT_MAX_BYTES,  # None for no limit
+        ):
+
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes
+
+        if not os.path.isdir(self.cacheDir):
+            os.makedirs(self.cacheDir)
+
+        # Entry sizes and last use times, oldest first when sorted
+        self.entries = {}
+        for fNm in os.listdir(self.cacheDir):
+            if not fNm.endswith('.pkl'):
+                continue
+            fStat = os.stat(os.path.join(self.cacheDir,fNm))
+            self.entries[fNm[:-4]] = [fStat.st_size,fStat.st_mtime]
+
+    # def __init__(...)
+
+    def __enter__(self):
+        return(self)
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        if exc_type is not None:
+            print exc_type, exc_value, traceback
+
+    def _EntryFNm(self,key):
+        return os.path.join(self.cacheDir,'{}.pkl'.format(key))
+
+    def _Evict(self):
+
+        if self.maxBytes is None:
+            return
+
+        totBytes = sum([entry[0] for entry in self.entries.values()])
+        if totBytes <= self.maxBytes:
+            return
+
+        for key in sorted(self.entries,key=lambda k: self.entries[k][1]):
+            try:
+                os.remove(self._EntryFNm(key))
+            except OSError:
+                pass
+            totBytes -= self.entries[key][0]
+            del self.entries[key]
+            if totBytes <= self.maxBytes:
+                break
+
+    # def _Evict(self):
+
+    def HasKey(self,key):
+        return key in self.entries
+
+    def Load(self,key):
+
+        # Returns the stored execution state, None on a miss. An entry
+        # that cannot be read (e.g. written by a different version of
+        # a library) is treated as a miss and removed.
+
+        if key not in self.entries:
+            return None
+
+        try:
+            with open(self._EntryFNm(key),'rb') as inF:
+                rtrn = pickle.load(inF)
+        except Exception:
+            self.Remove(key)
+            return None
+
+        # Mark as recently used
+        now = time.time()
+        try:
+            os.utime(self._EntryFNm(key),(now,now))
+        except OSError:
+            pass
+        self.entries[key][1] = now
+
+        return rtrn
+
+    # def Load(self,key):
+
+    def Store(self,key,execState):
+
+        # Written to a temporary file and renamed so that a partial
+        # entry is never visible, even to other processes sharing the
+        # cache directory. Returns False if the state cannot be
+        # pickled, in which case nothing is stored.
+
+        tmpFNm = '{}.{}.tmp'.format(self._EntryFNm(key),os.getpid())
+        try:
+            with open(tmpFNm,'wb') as outF:
+                pickle.dump(execState,outF,pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError,TypeError):
+            os.remove(tmpFNm)
+            return False
+
+        if os.path.exists(self._EntryFNm(key)):
+            os.remove(self._EntryFNm(key))
+        os.rename(tmpFNm,self._EntryFNm(key))
+
+        fStat = os.stat(self._EntryFNm(key))
+        self.entries[key] = [fStat.st_size,fStat.st_mtime]
+
+        self._Evict()
+
+        return True
+
+    # def Store(self,key,execState):
+
+    def Remove(self,key):
+
+        try:
+            os.remove(self._EntryFNm(key))
+        except OSError:
+            pass
+        self.entries.pop(key,None)
+
+    # def Remove(self,key):
+
+    def NBytes(self):
+        return sum([entry[0] for entry in self.entries.values()])
+
+# class MPilotRsltCache(object):
@@ -0,0 +1,62 @@
+# Information about the results of executed MPilot commands.
+#
+# Results may be numpy arrays (masked or not), NCVar and
+# NCDimensionedVar objects from MPUtilities/MPNetCDF4Variable.py,
+# scalars, or containers of these. The functions here use duck typing
+# so that the MPilot core does not need to import the libraries that
+# define them.
+#
+# File Log:
+# 2026.10.18
+#  Created with RsltNBytes()
+#  Added RsltDType()
+
+def RsltNBytes(rslt):
+    # Approximate number of bytes held by a result
+
+    if rslt is None:
+        return 0
+
+    # numpy array. For a masked array nbytes is the data only.
+    if hasattr(rslt,'nbytes') and hasattr(rslt,'dtype'):
+        nBytes = rslt.nbytes
+        mask = getattr(rslt,'mask',None)
+        if hasattr(mask,'nbytes') and getattr(mask,'ndim',0) > 0:
+            nBytes += mask.nbytes
+        return nBytes
+
+    # NCDimensionedVar: data variable plus its dimension variables
+    if hasattr(rslt,'dims') and hasattr(rslt,'data'):
+        nBytes = RsltNBytes(rslt.data)
+        if rslt.dims is not None:
+            for dimVar in rslt.dims.values():
+                nBytes += RsltNBytes(dimVar)
+        return nBytes
+
+    # NCVar
+    if hasattr(rslt,'data') and hasattr(rslt,'dim_nms'):
+        return RsltNBytes(rslt.data)
+
+    if isinstance(rslt,dict):
+        return sum([RsltNBytes(val) for val in rslt.values()])
+
+    if isinstance(rslt,(list,tuple)):
+        return sum([RsltNBytes(val) for val in rslt])
+
+    return 0
+
+# def RsltNBytes(rslt):
+
+def RsltDType(rslt):
+    # Name of the numpy data type of a result, None if it has none
+
+    if hasattr(rslt,'dtype'):
+        return str(rslt.dtype)
+
+    # NCVar and NCDimensionedVar
+    if hasattr(rslt,'data') and hasattr(rslt.data,'dtype'):
+        return str(rslt.data.dtype)
+
+    return None
+
+# def RsltDType(rslt):
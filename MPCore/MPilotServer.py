@@ -0,0 +1,460 @@
+# A long-lived server that executes MPilot programs for clients, so
+# that many short jobs do not each pay for importing numpy, scipy and
+# netCDF4, building an MPilotFramework, and parsing their script.
+#
+# The server holds one MPilotFramework for each framework name it is
+# given, loaded once at startup. It listens on a Unix socket, or on a
+# localhost TCP port, and handles each connection in its own thread,
+# so requests are executed concurrently.
+#
+# Requests and replies are JSON objects, one per line (see
+# HandleRequest() and MPilotClient.py). A run request carries the
+# script text, the framework name, the client's working directory,
+# and arguments for MPilotProgram.Run(). Relative file names in the
+# script are taken relative to the client's working directory.
+#
+# Parsed and validated programs are cached by a hash of the framework
+# name and the script text, so a script run again is neither parsed
+# nor validated. Each run gets its own copy of the cached program.
+#
+# With inputCacheMaxBytes, what commands that read input (see
+# MPilotFxnParent.IsPrefetchable()) read is also kept, up to that
+# many bytes, and reused while the command's arguments and the files
+# it reads are unchanged. Commands given cached input are not
+# prefetched.
+#
+# Anything commands print goes to the server's standard output.
+#
+# Only the user running the server may send it requests. The Unix
+# socket is made readable and writable by that user alone. On a TCP
+# port, every request must carry the token the server writes to a
+# file only that user can read (see MPilotClient.TokenFNm()). Run
+# requests may only pass the Run() arguments in RUN_ARG_TYPES.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotServer
+
+from collections import OrderedDict
+import SocketServer
+import binascii
+import copy as cp
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+import traceback
+
+import MPilotClient as mpclient
+import MPilotHash as mphash
+import MPilotProgram as mpprog
+import MPilotRsltInfo as mprslt
+
+DEFAULT_MAX_PROGRAMS = 32
+
+# The MPilotProgram.Run() arguments a run request may pass, and their
+# types as decoded from JSON
+RUN_ARG_TYPES = {
+    'targets':list,
+    'profile':bool,
+    'workers':int,
+    'prefetchWorkers':int,
+    }
+
+class _MPilotCachedInput(object):
+
+    # Stands in for a prefetch (see MPilotPrefetch.py). Each Take()
+    # returns a copy, because commands may change what they read.
+
+    def __init__(self,data):
+        self.data = data
+
+    def Take(self):
+        return cp.deepcopy(self.data)
+
+# class _MPilotCachedInput(object):
+
+class _MPilotReadingInput(object):
+
+    # Stands in for a prefetch of input that is not cached. The
+    # command's input is read when it is taken, and kept in the cache.
+
+    def __init__(self,inputCache,mpCmd,key):
+        self.inputCache = inputCache
+        self.mpCmd = mpCmd
+        self.key = key
+
+    def Take(self):
+        data = self.mpCmd.ReadInput()
+        self.inputCache.Put(self.key,data)
+        return cp.deepcopy(data)
+
+# class _MPilotReadingInput(object):
+
+class MPilotInputCache(object):
+
+    # What input commands read, by command arguments and the size and
+    # modification time of the files read. Bounded by maxBytes, least
+    # recently used first out.
+
+    def __init__(self,maxBytes):
+
+        self.maxBytes = maxBytes
+        self.entries = OrderedDict() # key: (data, bytes), oldest first
+        self.nBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    # def __init__(self,maxBytes):
+
+    def Key(self,mpCmd):
+        return (
+            mphash.ArgsSig(mpCmd),
+            tuple([(fNm,mphash.FileStat(fNm)) for fNm in mpCmd.InFileNms()])
+            )
+
+    def Attach(self,mpCmd):
+
+        # Gives a command its input, from the cache if it is there
+
+        key = self.Key(mpCmd)
+
+        with self.lock:
+            entry = self.entries.pop(key,None)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries[key] = entry
+
+        if entry is None:
+            mpCmd.SetPrefetched(_MPilotReadingInput(self,mpCmd,key))
+        else:
+            mpCmd.SetPrefetched(_MPilotCachedInput(entry[0]))
+
+    # def Attach(self,mpCmd):
+
+    def Put(self,key,data):
+
+        nBytes = mprslt.RsltNBytes(data)
+        if nBytes > self.maxBytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self.nBytes -= self.entries.pop(key)[1]
+            self.entries[key] = (data,nBytes)
+            self.nBytes += nBytes
+            while self.nBytes > self.maxBytes:
+                oldKey,oldEntry = self.entries.popitem(last=False)
+                self.nBytes -= oldEntry[1]
+
+    # def Put(self,key,data):
+
+    def Stats(self):
+        return {
+            'entries':len(self.entries),
+            'bytes':self.nBytes,
+            'hits':self.hits,
+            'misses':self.misses,
+            }
+
+# class MPilotInputCache(object):
+
+def _AbsFileArgs(mpProg,baseDir):
+
+    # Makes the relative file names in a program's arguments relative
+    # to baseDir
+
+    for mpCmd in mpProg.UnorderedCmds().values():
+
+        if mpCmd.Args() is None:
+            continue
+
+        for argNm,argVal in mpCmd.Args().items():
+
+            argTypes = mpCmd.ArgTypesFromArg(argNm)
+            if not isinstance(argTypes,list): argTypes = [argTypes]
+            if 'File Name' not in argTypes and 'File Name List' not in argTypes:
+                continue
+
+            absNms = [os.path.join(baseDir,fNm) for fNm in mpCmd._ArgToList(argNm)]
+            if argVal.strip().startswith('['):
+                mpCmd.SetArg(argNm,'[{}]'.format(','.join(absNms)))
+            else:
+                mpCmd.SetArg(argNm,absNms[0])
+
+        # for argNm,argVal in mpCmd.Args().items():
+
+    # for mpCmd in mpProg.UnorderedCmds().values():
+
+# def _AbsFileArgs(mpProg,baseDir):
+
+class _MPilotRequestHandler(SocketServer.StreamRequestHandler):
+
+    def handle(self):
+
+        for line in iter(self.rfile.readline,''):
+
+            try:
+                reply = self.server.mpServer.HandleRequest(json.loads(line))
+            except Exception:
+                reply = {'ok':False,'error':traceback.format_exc()}
+
+            self.wfile.write('{}\n'.format(json.dumps(reply)))
+            self.wfile.flush()
+
+            if reply.get('shutdown'):
+                # shutdown() waits for serve_forever(), so not in this thread
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+    # def handle(self):
+
+# class _MPilotRequestHandler(SocketServer.StreamRequestHandler):
+
+class _MPilotUnixServer(SocketServer.ThreadingMixIn,SocketServer.UnixStreamServer):
+    daemon_threads = True
+
+class _MPilotTCPServer(SocketServer.ThreadingMixIn,SocketServer.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class MPilotServer(object):
+
+    def __init__(
+        self,
+        frameworks,                         # dict of name: MPilotFramework
+        address,                            # Unix socket file name, or localhost port number
+        maxPrograms=DEFAULT_MAX_PROGRAMS,   # parsed programs kept
+        inputCacheMaxBytes=None,            # None for no input cache
+        ):
+
+        self.frameworks = frameworks
+        self.address = address
+        self.maxPrograms = maxPrograms
+        self.inputCache = None
+        if inputCacheMaxBytes is not None:
+            self.inputCache = MPilotInputCache(inputCacheMaxBytes)
+
+        self.progs = OrderedDict()  # hash: program, oldest first
+        self.progLock = threading.Lock()
+        self.progHits = 0
+        self.nRuns = 0
+        self.startTime = time.time()
+        self.server = None
+        self.token = None   # required of TCP requests, see Serve()
+
+    # def __init__(...)
+
+    def _Prog(self,frameworkNm,progStr):
+
+        # A copy of the parsed program, parsing it if it isn't cached.
+        # Parsing happens outside the lock, so a script sent twice at
+        # once may be parsed twice.
+
+        if frameworkNm not in self.frameworks:
+            raise Exception(
+                '{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Unknown framework: {}\n'.format(frameworkNm),
+                    'Frameworks: {}\n'.format(', '.join(sorted(self.frameworks.keys())))
+                    )
+                )
+
+        framework = self.frameworks[frameworkNm]
+        progHash = hashlib.sha1(repr((frameworkNm,progStr))).hexdigest()
+
+        with self.progLock:
+            mpProg = self.progs.pop(progHash,None)
+            if mpProg is not None:
+                self.progHits += 1
+                self.progs[progHash] = mpProg
+
+        if mpProg is None:
+            mpProg = mpprog.MPilotProgram(framework,sourceProgStr=progStr)
+            mpProg.OrderedCmds()
+            with self.progLock:
+                self.progs[progHash] = mpProg
+                while len(self.progs) > self.maxPrograms:
+                    self.progs.popitem(last=False)
+
+        # The framework is shared, not copied
+        return cp.deepcopy(mpProg,{id(framework):framework})
+
+    # def _Prog(self,frameworkNm,progStr):
+
+    def _RunArgs(self,request):
+
+        # The Run() arguments of a request, which must be among
+        # RUN_ARG_TYPES
+
+        runArgs = {}
+        for nm,val in (request.get('runArgs') or {}).items():
+
+            nm = str(nm)
+            if nm not in RUN_ARG_TYPES:
+                raise Exception(
+                    '{}{}{}'.format(
+                        '\n********************ERROR********************\n',
+                        'Run argument not allowed: {}\n'.format(nm),
+                        'Allowed: {}\n'.format(', '.join(sorted(RUN_ARG_TYPES.keys())))
+                        )
+                    )
+
+            if not isinstance(val,RUN_ARG_TYPES[nm]):
+                raise Exception(
+                    '{}{}'.format(
+                        '\n********************ERROR********************\n',
+                        'Run argument {} must be a {}: {}\n'.format(
+                            nm,
+                            RUN_ARG_TYPES[nm].__name__,
+                            val
+                            )
+                        )
+                    )
+
+            runArgs[nm] = val
+
+        # for nm,val in (request.get('runArgs') or {}).items():
+
+        return runArgs
+
+    # def _RunArgs(self,request):
+
+    def _RunRequest(self,request):
+
+        startTime = time.time()
+
+        cwd = request.get('cwd',os.getcwd())
+        if not os.path.isabs(cwd) or not os.path.isdir(cwd):
+            raise Exception(
+                '{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Working directory is not an absolute directory name: {}\n'.format(cwd)
+                    )
+                )
+
+        runArgs = self._RunArgs(request)
+
+        mpProg = self._Prog(request['framework'],request['script'])
+        _AbsFileArgs(mpProg,cwd)
+
+        if self.inputCache is not None:
+            for mpCmd in mpProg.OrderedCmds().values():
+                if mpCmd.IsPrefetchable():
+                    self.inputCache.Attach(mpCmd)
+
+        mpProg.Run(**runArgs)
+
+        output = ''
+        if runArgs.get('profile'):
+            output = mpProg.ProfileReport().FormattedReport()
+
+        with self.progLock:
+            self.nRuns += 1
+
+        return {
+            'ok':True,
+            'output':output,
+            'secs':time.time() - startTime,
+            }
+
+    # def _RunRequest(self,request):
+
+    def Status(self):
+
+        rtrn = {
+            'uptimeSecs':time.time() - self.startTime,
+            'frameworks':sorted(self.frameworks.keys()),
+            'programs':len(self.progs),
+            'programHits':self.progHits,
+            'runs':self.nRuns,
+            }
+        if self.inputCache is not None:
+            rtrn['inputCache'] = self.inputCache.Stats()
+
+        return rtrn
+
+    # def Status(self):
+
+    def HandleRequest(self,request):
+
+        # request['op'] is one of:
+        #   run       executes a script, see _RunRequest()
+        #   status    reports what the server holds
+        #   shutdown  stops the server after replying
+        # When the server has a token, request['token'] must be it.
+
+        if self.token is not None and \
+          not hmac.compare_digest(str(request.get('token','')),self.token):
+            return {'ok':False,'error':'Missing or wrong server token'}
+
+        op = request.get('op','run')
+
+        if op == 'run':
+            return self._RunRequest(request)
+        elif op == 'status':
+            return {'ok':True,'status':self.Status()}
+        elif op == 'shutdown':
+            return {'ok':True,'shutdown':True}
+
+        return {'ok':False,'error':'Unknown request: {}'.format(op)}
+
+    # def HandleRequest(self,request):
+
+    def _WriteToken(self):
+
+        # A new random token, in a file only this user can read
+
+        tokenFNm = mpclient.TokenFNm(self.address)
+        tokenDir = os.path.dirname(tokenFNm)
+        if not os.path.isdir(tokenDir):
+            os.makedirs(tokenDir,0700)
+        if os.path.exists(tokenFNm):
+            os.remove(tokenFNm)
+
+        self.token = binascii.hexlify(os.urandom(16))
+        tokenFD = os.open(tokenFNm,os.O_WRONLY | os.O_CREAT | os.O_EXCL,0600)
+        with os.fdopen(tokenFD,'w') as tokenF:
+            tokenF.write(self.token)
+
+    # def _WriteToken(self):
+
+    def Serve(self):
+
+        # Serves requests until a shutdown request
+
+        if isinstance(self.address,int):
+            self._WriteToken()
+            self.server = _MPilotTCPServer(('127.0.0.1',self.address),_MPilotRequestHandler)
+        else:
+            if os.path.exists(self.address):
+                os.remove(self.address)
+            # No other user may connect, even before the chmod
+            oldUmask = os.umask(0177)
+            try:
+                self.server = _MPilotUnixServer(self.address,_MPilotRequestHandler)
+            finally:
+                os.umask(oldUmask)
+            os.chmod(self.address,0600)
+
+        self.server.mpServer = self
+
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if isinstance(self.address,int):
+                tokenFNm = mpclient.TokenFNm(self.address)
+                if os.path.exists(tokenFNm):
+                    os.remove(tokenFNm)
+            elif os.path.exists(self.address):
+                os.remove(self.address)
+
+    # def Serve(self):
+
+# class MPilotServer(object):
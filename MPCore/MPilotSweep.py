@@ -0,0 +1,275 @@
+# Runs one MPilot program under many scenarios, e.g. the same script
+# with different macro values.
+#
+# Scenarios usually differ in only a few commands (an input file, a
+# threshold, a weight). Each command of each scenario is given a key
+# (see MPilotHash.CmdKey()) made from its result name, function name,
+# and arguments, and the keys of the commands it depends on. Commands
+# with the same key compute the same result, so each distinct key is
+# executed once and its result is shared by every scenario that has
+# it: inputs are read once, the subgraph common to the scenarios is
+# computed once, and only the commands that differ, and those
+# downstream of them, are executed for each scenario.
+#
+# The distinct commands of all the scenarios are executed together by
+# one MPilotExecutor, so with workers the commands of different
+# scenarios run in parallel.
+#
+# Command objects are created, and their arguments validated, once for
+# each distinct command text.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotSweep
+
+from collections import OrderedDict
+import copy as cp
+
+import MPilotExecutor as mpexec
+import MPilotHash as mphash
+import MPilotParse as mpparse
+import MPilotProgram as mpprog
+
+class _MPilotSweepCmd(object):
+
+    # Stands in for a distinct command in the executor, under its key.
+    # The command itself sees the commands it depends on under their
+    # result names.
+
+    def __init__(
+        self,
+        key,        # see MPilotHash.CmdKey()
+        mpCmd,      # the command
+        depKeys,    # dict of dependency result name: key
+        ):
+
+        self.key = key
+        self.mpCmd = mpCmd
+        self.depKeys = depKeys
+
+    # def __init__(...)
+
+    def RsltNm(self): return self.key
+
+    def FxnNm(self): return self.mpCmd.FxnNm()
+
+    def DependencyNms(self): return self.depKeys.values()
+
+    def HasSideEffects(self): return self.mpCmd.HasSideEffects()
+
+    def ExecSerially(self): return self.mpCmd.ExecSerially()
+
+    def ExecRslt(self): return self.mpCmd.ExecRslt()
+
+    def Exec(self,executedObjects):
+
+        depObjects = {}
+        for depNm,depKey in self.depKeys.items():
+            depObjects[depNm] = executedObjects[depKey].mpCmd
+
+        self.mpCmd.Exec(depObjects)
+
+        executedObjects[self.key] = self
+
+    # def Exec(self,executedObjects):
+
+# class _MPilotSweepCmd(object):
+
+class MPilotSweep(object):
+
+    def __init__(
+        self,
+        mpFramework,        # An MPilot Framework
+        scenarioProgStrs,   # OrderedDict of scenario name: MPilot script as a string
+        ):
+
+        self.mpFramework = mpFramework
+        self.scenarioKeys = OrderedDict() # scenario name: {result name: key}, ordered
+        self.sweepCmds = OrderedDict()    # key: _MPilotSweepCmd, in dependency order
+        self.executedObjects = {}
+
+        self._LoadScenarios(scenarioProgStrs)
+
+    # def __init__(...)
+
+    def __enter__(self):
+        return(self)
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        if exc_type is not None:
+            print exc_type, exc_value, traceback
+
+    def _LoadScenarios(self,scenarioProgStrs):
+
+        protoCmds = {}      # clean command string: command created for it
+        usedCmdIds = set()  # commands already standing for a key
+
+        for scenarioNm,progStr in scenarioProgStrs.items():
+
+            # A program is used to check and order the scenario's
+            # commands, with errors naming the scenario
+            prog = mpprog.MPilotProgram(self.mpFramework)
+            mptCmdStructs = mpparse.ParseStringToCommands(
+                progStr,
+                'Scenario {}'.format(scenarioNm)
+                )
+            for rsltNm,mptCmdStruct in mptCmdStructs.items():
+                cleanCmdStr = mptCmdStruct['cleanCmdStr']
+                if cleanCmdStr not in protoCmds:
+                    protoCmds[cleanCmdStr] = self.mpFramework.CreateFxnObject(
+                        mptCmdStruct['parsedCmd']['cmd'],
+                        mptCmdStruct
+                        )
+                prog.AddCmd(protoCmds[cleanCmdStr])
+
+            keys = OrderedDict()
+            for rsltNm,mpCmd in prog.OrderedCmds().items():
+
+                depKeys = {}
+                for depNm in mpCmd.DependencyNms() or []:
+                    depKeys[depNm] = keys[depNm]
+
+                key = mphash.CmdKey(
+                    (rsltNm,mphash.ArgsSig(mpCmd)),
+                    None,
+                    depKeys.items()
+                    )
+                keys[rsltNm] = key
+
+                if key not in self.sweepCmds:
+                    # The same text with different inputs is a
+                    # different command, with its own result
+                    if id(mpCmd) in usedCmdIds:
+                        mpCmd = cp.deepcopy(mpCmd)
+                    usedCmdIds.add(id(mpCmd))
+                    self.sweepCmds[key] = _MPilotSweepCmd(key,mpCmd,depKeys)
+
+            # for rsltNm,mpCmd in prog.OrderedCmds().items():
+
+            self.scenarioKeys[scenarioNm] = keys
+
+        # for scenarioNm,progStr in scenarioProgStrs.items():
+
+    # def _LoadScenarios(self,scenarioProgStrs):
+
+    def _RemainingUses(self):
+
+        # Number of distinct commands that use each key. Keys used
+        # by nothing are final results, and those written by a
+        # command (see OutputNms()) are kept too, as with
+        # MPilotProgram.Run(). Neither is ever released.
+
+        rtrn = dict([(key,0) for key in self.sweepCmds])
+        keepKeys = set()
+        for sweepCmd in self.sweepCmds.values():
+            for depKey in set(sweepCmd.DependencyNms()):
+                rtrn[depKey] += 1
+            for outNm in sweepCmd.mpCmd.OutputNms():
+                if outNm in sweepCmd.depKeys:
+                    keepKeys.add(sweepCmd.depKeys[outNm])
+
+        for key in rtrn.keys():
+            if rtrn[key] == 0 or key in keepKeys:
+                del rtrn[key]
+
+        return rtrn
+
+    # def _RemainingUses(self):
+
+    def Run(
+        self,
+        workers=None,       # Number of commands to execute at once
+        useProcesses=False, # Use worker processes instead of threads
+        releaseRslts=False, # Free intermediate results once used
+        ):
+
+        # Executes every distinct command of the scenarios once. See
+        # MPilotProgram.RunIter() for workers and useProcesses.
+        #
+        # With releaseRslts, each intermediate result is released as
+        # soon as the last command that uses it, in any scenario, has
+        # completed. See _RemainingUses() for the results that are kept.
+
+        self.executedObjects = {}
+
+        if releaseRslts:
+            remainingUses = self._RemainingUses()
+
+        executor = mpexec.MPilotExecutor(
+            self.sweepCmds,
+            self.executedObjects,
+            workers=workers,
+            useProcesses=useProcesses
+            )
+
+        for key in executor.ExecIter():
+
+            if not releaseRslts:
+                continue
+
+            for depKey in set(self.sweepCmds[key].DependencyNms()):
+                if depKey not in remainingUses:
+                    continue
+                remainingUses[depKey] -= 1
+                if remainingUses[depKey] == 0:
+                    self.sweepCmds[depKey].mpCmd.execRslt = None
+                    del self.executedObjects[depKey]
+
+        # for key in executor.ExecIter():
+
+    # def Run(...)
+
+    def Scenarios(self):
+        return self.scenarioKeys.keys()
+
+    def CmdByNm(self,scenarioNm,rsltNm):
+        return self.sweepCmds[self.scenarioKeys[scenarioNm][rsltNm]].mpCmd
+
+    def RsltByNm(self,scenarioNm,rsltNm):
+        return self.CmdByNm(scenarioNm,rsltNm).ExecRslt()
+
+    def Rslts(self,scenarioNm):
+        rtrn = OrderedDict()
+        for rsltNm in self.scenarioKeys[scenarioNm]:
+            rtrn[rsltNm] = self.RsltByNm(scenarioNm,rsltNm)
+        return rtrn
+
+    def SharedRsltNms(self):
+
+        # Results computed by the same command in every scenario
+
+        if len(self.scenarioKeys) == 0:
+            return []
+
+        scenariosKeys = self.scenarioKeys.values()
+        return [
+            rsltNm for rsltNm,key in scenariosKeys[0].items()
+            if all([scenarioKeys.get(rsltNm) == key for scenarioKeys in scenariosKeys[1:]])
+            ]
+
+    # def SharedRsltNms(self):
+
+    def DifferingRsltNms(self,scenarioNm):
+
+        # Results of a scenario that are not computed by the same
+        # command in every scenario
+
+        sharedNms = set(self.SharedRsltNms())
+        return [rsltNm for rsltNm in self.scenarioKeys[scenarioNm] if rsltNm not in sharedNms]
+
+    # def DifferingRsltNms(self,scenarioNm):
+
+    def FormattedSummary(self):
+
+        return '{}{}{}'.format(
+            'Scenarios: {}\n'.format(len(self.scenarioKeys)),
+            'Commands in all scenarios: {}  Distinct commands executed: {}\n'.format(
+                sum([len(keys) for keys in self.scenarioKeys.values()]),
+                len(self.sweepCmds)
+                ),
+            'Commands shared by every scenario: {}\n'.format(len(self.SharedRsltNms())),
+            )
+
+    # def FormattedSummary(self):
+
+# class MPilotSweep(object):
@@ -0,0 +1,583 @@
+# Tiled, out-of-core execution of MPilot programs.
+#
+# Rasters too large to hold in memory for every layer of a model are
+# processed one window (tile) of the grid at a time. Each command that
+# reads data reads only the tile's window, every command is executed
+# on the tile, and each command that writes data writes the tile into
+# its output file. Only one tile of each result is in memory at once.
+#
+# Commands take part by returning True from IsTileable(). A reader
+# returns the shape of the full grid from TileSourceShape(), and
+# readers and writers use their tile (mpCmd.tile, an MPilotTile) to
+# find their window.
+#
+# Some commands need statistics of a whole input array (e.g. the mean
+# and standard deviation for a Z score, or the minimum and maximum
+# for Normalize). They list them in GlobalStatNms(). Before the tiles
+# are processed, those statistics are accumulated over all tiles in a
+# streaming pass that executes only the commands the inputs depend
+# on. Statistics that depend on other statistics take further passes.
+# Means and standard deviations are accumulated in float64 and may
+# differ in the last digits from those of the whole array.
+#
+# Tiles can be executed in a pool of worker processes. Each worker
+# reads its own tile's window of the input files, so inputs never pass
+# between processes. The results that commands writing data (those
+# with OutputNms()) need are placed in memory mapped files, in shared
+# memory where the system has it, and the writing commands are then
+# executed in the calling process, one tile at a time in tile order.
+# Partial statistics from the workers are combined in tile order too.
+# Output files are therefore the same, byte for byte, as those of a
+# single process run.
+#
+# File Log:
+# 2026.10.18
+#  Created MPilotTile and MPilotTiler
+#  Added execution of tiles in worker processes
+
+from collections import OrderedDict
+from collections import deque
+import copy as cp
+import itertools
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import traceback
+import numpy as np
+
+import MPilotExecutor as mpexec
+import MPilotFusion as mpfuse
+import MPilotRsltCache as mpcache
+
+# Where worker processes put the results they share
+_SCRATCH_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+class MPilotTile(object):
+
+    def __init__(
+        self,
+        window,         # tuple of slices into the full grid
+        fullShape,      # shape of the full grid
+        isFirst,        # first tile of a pass
+        globalStats,    # result name: {statistic name: value}
+        ):
+
+        self.window = window
+        self.fullShape = fullShape
+        self.isFirst = isFirst
+        self.globalStats = globalStats
+
+    # def __init__(...)
+
+    def GlobalStat(self,rsltNm,statNm):
+        return self.globalStats[rsltNm][statNm]
+
+    def CmdStats(self,rsltNm):
+        # Statistics held for a command, to which it may add its own
+        return self.globalStats.setdefault(rsltNm,{})
+
+# class MPilotTile(object):
+
+class _StatAccum(object):
+
+    # Count, mean, sum of squared deviations (combined as in Chan et
+    # al.), minimum, and maximum of the unmasked values of a series
+    # of arrays
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.
+        self.m2 = 0.
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def TileStats(arr):
+
+        # (count, mean, sum of squared deviations, minimum, maximum)
+        # of one array, None if it has no unmasked values
+
+        vals = np.ma.compressed(arr) if isinstance(arr,np.ma.MaskedArray) else np.ravel(arr)
+        if vals.size == 0:
+            return None
+
+        mean = vals.mean(dtype=np.float64)
+
+        return (
+            vals.size,
+            mean,
+            ((vals - mean)**2).sum(dtype=np.float64),
+            vals.min(),
+            vals.max(),
+            )
+
+    # def TileStats(arr):
+
+    def Merge(self,tileStats):
+
+        # tileStats are from TileStats()
+
+        if tileStats is None:
+            return
+
+        n,mean,m2,tileMin,tileMax = tileStats
+
+        delta = mean - self.mean
+        totN = self.n + n
+        self.mean += delta * n / totN
+        self.m2 += m2 + delta**2 * self.n * n / totN
+        self.n = totN
+
+        self.min = tileMin if self.min is None else min(self.min,tileMin)
+        self.max = tileMax if self.max is None else max(self.max,tileMax)
+
+    # def Merge(self,tileStats):
+
+    def Add(self,arr):
+        self.Merge(self.TileStats(arr))
+
+    def Stats(self):
+
+        # As numpy.ma gives them for an array with every value masked
+        if self.n == 0:
+            return dict([(nm,np.ma.masked) for nm in ['min','max','mean','std']])
+
+        return {
+            'min':self.min,
+            'max':self.max,
+            'mean':self.mean,
+            'std':np.sqrt(self.m2 / self.n),
+            }
+
+    # def Stats(self):
+
+# class _StatAccum(object):
+
+def _ShareCmd(mpCmd,fNmBase):
+
+    # The execution state of a command, to be pickled to the calling
+    # process, with an array result written to memory mapped files
+    # instead. Returns the state and a description of the shared
+    # result (None if the result is in the state).
+
+    state = mpcache.ExecState(mpCmd)
+    state.pop('tile',None)
+    rslt = state.pop('execRslt',None)
+
+    if not isinstance(rslt,np.ndarray) or rslt.ndim == 0:
+        state['execRslt'] = rslt
+        return state,None
+
+    sharedRslt = {
+        'dataFNm':'{}.data.npy'.format(fNmBase),
+        'maskFNm':None,
+        'fillValue':None,
+        }
+
+    outArr = np.lib.format.open_memmap(
+        sharedRslt['dataFNm'],mode='w+',dtype=rslt.dtype,shape=rslt.shape
+        )
+    outArr[...] = np.ma.getdata(rslt)
+    del outArr
+
+    if isinstance(rslt,np.ma.MaskedArray):
+        sharedRslt['fillValue'] = rslt.fill_value
+        if rslt.mask is not np.ma.nomask:
+            sharedRslt['maskFNm'] = '{}.mask.npy'.format(fNmBase)
+            outArr = np.lib.format.open_memmap(
+                sharedRslt['maskFNm'],mode='w+',dtype=rslt.mask.dtype,shape=rslt.mask.shape
+                )
+            outArr[...] = rslt.mask
+            del outArr
+
+    return state,sharedRslt
+
+# def _ShareCmd(mpCmd,fNmBase):
+
+def _UnshareCmd(mpCmd,state,sharedRslt):
+
+    # Stand in for mpCmd as a worker process executed it. For a fused
+    # group, the group's last command, which holds its result.
+
+    if isinstance(mpCmd,mpfuse.MPilotFusedCmd):
+        mpCmd = mpCmd.RootCmd()
+
+    rtrn = cp.copy(mpCmd)
+    rtrn.__dict__.update(state)
+
+    if sharedRslt is not None:
+        data = np.load(sharedRslt['dataFNm'],mmap_mode='r')
+        if sharedRslt['fillValue'] is None:
+            rtrn.execRslt = data
+        else:
+            mask = np.ma.nomask
+            if sharedRslt['maskFNm'] is not None:
+                mask = np.load(sharedRslt['maskFNm'],mmap_mode='r')
+            rtrn.execRslt = np.ma.array(data,mask=mask,fill_value=sharedRslt['fillValue'])
+
+    return rtrn
+
+# def _UnshareCmd(mpCmd,state,sharedRslt):
+
+# State of a tile worker process, see _InitTileWorker()
+_tileWorker = {}
+
+def _InitTileWorker(orderedMPCmds,workers,scratchDir):
+
+    _tileWorker['orderedMPCmds'] = orderedMPCmds
+    _tileWorker['workers'] = workers
+    _tileWorker['scratchDir'] = scratchDir
+    # Kept from tile to tile, so statistics commands keep for
+    # themselves (see MPilotTile.CmdStats()) are computed once
+    _tileWorker['globalStats'] = {}
+
+# def _InitTileWorker(orderedMPCmds,workers,scratchDir):
+
+def _ExecTileInProcess(task):
+
+    # Runs in a worker process. Executes the commands of a pass on one
+    # tile and returns the partial statistics of the results named
+    # (statistics passes) or the results named, shared (final pass).
+    # Tracebacks cannot cross the process boundary, so the formatted
+    # traceback is returned.
+
+    ndx,window,fullShape,finalPass,passNms,globalStats,rtrnNms = task
+
+    passCmds = OrderedDict([(rsltNm,_tileWorker['orderedMPCmds'][rsltNm]) for rsltNm in passNms])
+
+    try:
+
+        for rsltNm,stats in globalStats.items():
+            _tileWorker['globalStats'].setdefault(rsltNm,{}).update(stats)
+
+        tile = MPilotTile(window,fullShape,ndx == 0,_tileWorker['globalStats'])
+        for mpCmd in passCmds.values():
+            mpCmd.tile = tile
+
+        executedObjects = {}
+        mpexec.MPilotExecutor(
+            passCmds,
+            executedObjects,
+            workers=_tileWorker['workers']
+            ).Exec()
+
+        rtrn = {}
+        for rsltNm in rtrnNms:
+            if finalPass:
+                rtrn[rsltNm] = _ShareCmd(
+                    executedObjects[rsltNm],
+                    os.path.join(_tileWorker['scratchDir'],'{}_{}'.format(ndx,rsltNm))
+                    )
+            else:
+                rtrn[rsltNm] = _StatAccum.TileStats(executedObjects[rsltNm].ExecRslt())
+
+        return ndx,rtrn,None
+
+    except Exception:
+
+        return ndx,None,traceback.format_exc()
+
+    finally:
+
+        for mpCmd in _tileWorker['orderedMPCmds'].values():
+            mpCmd.execRslt = None
+
+# def _ExecTileInProcess(task):
+
+class MPilotTiler(object):
+
+    def __init__(
+        self,
+        orderedMPCmds,  # OrderedDict of commands in dependency order, which
+                        # may include stand-ins for groups of commands
+                        # (see MPilotFusion.py)
+        tileShape,      # tile size along the leading dimensions of the grid
+        workers=None,   # see MPilotExecutor
+        processes=None, # tiles executed at once, each in a worker process
+        ):
+
+        self.orderedMPCmds = orderedMPCmds
+        self.tileShape = tuple(tileShape)
+        self.workers = workers
+        self.processes = processes
+
+        notTileableNms = [
+            rsltNm for rsltNm,mpCmd in orderedMPCmds.items() if not mpCmd.IsTileable()
+            ]
+        if len(notTileableNms) > 0:
+            raise Exception(
+                '{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Commands cannot be executed tile by tile:\n',
+                    ''.join(['  {}  {}\n'.format(
+                        rsltNm,orderedMPCmds[rsltNm].FxnNm()
+                        ) for rsltNm in notTileableNms])
+                    )
+                )
+
+        self.fullShape = None
+        for mpCmd in orderedMPCmds.values():
+            self.fullShape = mpCmd.TileSourceShape()
+            if self.fullShape is not None:
+                break
+
+        if self.fullShape is None:
+            raise Exception(
+                '{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'No command reads data, so there is nothing to tile.\n'
+                    )
+                )
+
+        if len(self.tileShape) > len(self.fullShape):
+            raise Exception(
+                '{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Tile shape {} has more dimensions than the data {}\n'.format(
+                        self.tileShape,
+                        self.fullShape
+                        )
+                    )
+                )
+
+    # def __init__(...)
+
+    def Windows(self):
+
+        dimRanges = []
+        for dimLen,tileLen in zip(self.fullShape,self.tileShape):
+            dimRanges.append(
+                [slice(start,min(start + tileLen,dimLen)) for start in range(0,dimLen,tileLen)]
+                )
+
+        return list(itertools.product(*dimRanges))
+
+    # def Windows(self):
+
+    def _AncestorNms(self,rsltNms):
+
+        ancestorNms = set()
+        toVisitNms = list(rsltNms)
+        while len(toVisitNms) > 0:
+            rsltNm = toVisitNms.pop()
+            if rsltNm in ancestorNms:
+                continue
+            ancestorNms.add(rsltNm)
+            toVisitNms.extend(self.orderedMPCmds[rsltNm].DependencyNms() or [])
+
+        return ancestorNms
+
+    # def _AncestorNms(self,rsltNms):
+
+    def _StatLevels(self):
+
+        # Commands needing statistics, grouped by the pass that
+        # computes them: a command's statistics are computed in the
+        # pass after those of every command its input depends on.
+
+        levels = {}
+        for rsltNm,mpCmd in self.orderedMPCmds.items():
+            if len(mpCmd.GlobalStatNms()) == 0:
+                continue
+            inLevels = [
+                levels[nm] for nm in self._AncestorNms([mpCmd.GlobalStatInNm()])
+                if nm in levels
+                ]
+            levels[rsltNm] = max(inLevels + [0]) + 1
+
+        rtrn = []
+        for level in range(1,max(levels.values() + [0]) + 1):
+            rtrn.append([nm for nm in levels if levels[nm] == level])
+
+        return rtrn
+
+    # def _StatLevels(self):
+
+    def _ExecTiles(self,passCmds,globalStats,tileFxn=None):
+
+        # Executes passCmds on each tile in turn, calling
+        # tileFxn(executedObjects) after each tile
+
+        for ndx,window in enumerate(self.Windows()):
+
+            tile = MPilotTile(window,self.fullShape,ndx == 0,globalStats)
+            for mpCmd in passCmds.values():
+                mpCmd.tile = tile
+
+            executedObjects = {}
+            mpexec.MPilotExecutor(
+                passCmds,
+                executedObjects,
+                workers=self.workers
+                ).Exec()
+
+            if tileFxn is not None:
+                tileFxn(executedObjects)
+
+        # for ndx,window in enumerate(self.Windows()):
+
+    # def _ExecTiles(self,passCmds,globalStats,tileFxn=None):
+
+    def _ProcessTiles(self,pool,finalPass,passNms,globalStats,rtrnNms):
+
+        # Generator that executes passNms on each tile in the pool of
+        # worker processes, yielding (tile index, what the worker
+        # returned) in tile order. A limited number of tiles are
+        # handed out ahead of the one being yielded, so that finished
+        # tiles waiting their turn do not pile up.
+
+        windows = self.Windows()
+        pending = deque()
+        nextNdx = 0
+
+        while nextNdx < len(windows) or len(pending) > 0:
+
+            while nextNdx < len(windows) and len(pending) < 2 * self.processes:
+                pending.append(pool.apply_async(
+                    _ExecTileInProcess,
+                    ((
+                        nextNdx,
+                        windows[nextNdx],
+                        self.fullShape,
+                        finalPass,
+                        passNms,
+                        globalStats,
+                        rtrnNms,
+                        ),)
+                    ))
+                nextNdx += 1
+
+            # Wait with a timeout so that KeyboardInterrupt is
+            # delivered to the main thread
+            asyncRslt = pending.popleft()
+            while not asyncRslt.ready():
+                asyncRslt.wait(1.0)
+
+            ndx,rtrn,errStr = asyncRslt.get()
+            if errStr is not None:
+                raise Exception(
+                    '{}{}{}'.format(
+                        '\n********************ERROR********************\n',
+                        'Tile failed in worker process: {}\n'.format(windows[ndx]),
+                        'Worker traceback:\n{}\n'.format(errStr)
+                        )
+                    )
+
+            yield ndx,rtrn
+
+        # while nextNdx < len(windows) or len(pending) > 0:
+
+    # def _ProcessTiles(self,pool,finalPass,passNms,globalStats,rtrnNms):
+
+    def _ExecFinalInProcesses(self,pool,globalStats):
+
+        # Workers execute everything but the commands that write data,
+        # which are executed here on the shared results they need
+
+        writerCmds = OrderedDict([
+            (rsltNm,mpCmd) for rsltNm,mpCmd in self.orderedMPCmds.items()
+            if len(mpCmd.OutputNms()) > 0
+            ])
+        passNms = [rsltNm for rsltNm in self.orderedMPCmds if rsltNm not in writerCmds]
+        shareNms = []
+        for mpCmd in writerCmds.values():
+            for depNm in mpCmd.DependencyNms() or []:
+                if depNm not in writerCmds and depNm not in shareNms:
+                    shareNms.append(depNm)
+
+        windows = self.Windows()
+        for ndx,sharedCmds in self._ProcessTiles(pool,True,passNms,globalStats,shareNms):
+
+            executedObjects = {}
+            for rsltNm,(state,sharedRslt) in sharedCmds.items():
+                executedObjects[rsltNm] = _UnshareCmd(
+                    self.orderedMPCmds[rsltNm],state,sharedRslt
+                    )
+
+            tile = MPilotTile(windows[ndx],self.fullShape,ndx == 0,globalStats)
+            for mpCmd in writerCmds.values():
+                mpCmd.tile = tile
+
+            mpexec.MPilotExecutor(writerCmds,executedObjects).Exec()
+
+            # Memory maps are closed before their files are removed
+            executedObjects = None
+            for state,sharedRslt in sharedCmds.values():
+                if sharedRslt is not None:
+                    for fNm in [sharedRslt['dataFNm'],sharedRslt['maskFNm']]:
+                        if fNm is not None:
+                            os.remove(fNm)
+
+        # for ndx,sharedCmds in self._ProcessTiles(...):
+
+    # def _ExecFinalInProcesses(self,pool,globalStats):
+
+    def Exec(self):
+
+        globalStats = {}
+        pool = None
+        scratchDir = None
+
+        try:
+
+            if self.processes is not None and self.processes > 1:
+                scratchDir = tempfile.mkdtemp(prefix='mpilot_tiles_',dir=_SCRATCH_ROOT)
+                pool = mp.Pool(
+                    self.processes,
+                    _InitTileWorker,
+                    (self.orderedMPCmds,self.workers,scratchDir)
+                    )
+
+            for levelNms in self._StatLevels():
+
+                inNms = [self.orderedMPCmds[nm].GlobalStatInNm() for nm in levelNms]
+                neededNms = self._AncestorNms(inNms)
+                passCmds = OrderedDict([
+                    (rsltNm,mpCmd) for rsltNm,mpCmd in self.orderedMPCmds.items()
+                    if rsltNm in neededNms
+                    ])
+
+                accums = dict([(nm,_StatAccum()) for nm in levelNms])
+
+                if pool is None:
+
+                    def AccumTile(executedObjects):
+                        for rsltNm,inNm in zip(levelNms,inNms):
+                            accums[rsltNm].Add(executedObjects[inNm].ExecRslt())
+
+                    self._ExecTiles(passCmds,globalStats,AccumTile)
+
+                else:
+
+                    for ndx,tileStats in self._ProcessTiles(
+                        pool,False,passCmds.keys(),globalStats,list(set(inNms))
+                        ):
+                        for rsltNm,inNm in zip(levelNms,inNms):
+                            accums[rsltNm].Merge(tileStats[inNm])
+
+                for rsltNm in levelNms:
+                    globalStats.setdefault(rsltNm,{}).update(accums[rsltNm].Stats())
+
+            # for levelNms in self._StatLevels():
+
+            if pool is None:
+                self._ExecTiles(self.orderedMPCmds,globalStats)
+            else:
+                self._ExecFinalInProcesses(pool,globalStats)
+
+        finally:
+
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            if scratchDir is not None:
+                shutil.rmtree(scratchDir,ignore_errors=True)
+
+            for mpCmd in self.orderedMPCmds.values():
+                mpCmd.tile = None
+                mpCmd.execRslt = None
+
+    # def Exec(self):
+
+# class MPilotTiler(object):
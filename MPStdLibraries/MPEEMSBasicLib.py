@@ -1,5 +1,6 @@
 from __future__ import division
 from MPCore import MPilotEEMSFxnParent as mpefp
+from MPCore import MPilotEstimate as mpest
 import numpy as np
 import copy as cp
 
@@ -40,6 +41,10 @@ class Copy(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
         
+    def IsTileable(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         fldNmObj = executedObjects[self.ValFromArgByNm('InFieldName')]
@@ -97,6 +102,10 @@ class AMinusB(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
     
+    def IsTileable(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         aObj = executedObjects[self.ValFromArgByNm('A')]
@@ -173,6 +182,10 @@ class Sum(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsTileable(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts)
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -251,6 +264,8 @@ class WeightedSum(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -324,6 +339,10 @@ class Multiply(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsTileable(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts)
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -408,6 +427,8 @@ class ADividedByB(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
     
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
 
         aObj = executedObjects[self.ValFromArgByNm('A')]
@@ -474,6 +495,10 @@ class Minimum(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsTileable(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         self._ValidateListLen('InFldNms',1)
@@ -548,6 +573,10 @@ class Maximum(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsTileable(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         self._ValidateListLen('InFldNms',1)
@@ -623,6 +652,29 @@ class Mean(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsFusable(self): return True
+
+    def FusedRsltMinNeeded(self): return True
+
+    def SetFusedDataType(self,rsltMin):
+        if rsltMin is not None and rsltMin > 0:
+            self.dataType = 'Positive Float'
+        else:
+            self.dataType = 'Float'
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+
+        np.copyto(outBlock,inBlocks[0],casting='unsafe')
+        for inBlock in inBlocks[1:]:
+            np.add(outBlock,inBlock,out=outBlock,casting='unsafe')
+        np.true_divide(outBlock,len(inBlocks),out=outBlock)
+
+        return ~np.isfinite(outBlock)
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -697,6 +749,31 @@ class WeightedMean(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsFusable(self): return True
+
+    def FusedRsltMinNeeded(self): return True
+
+    def SetFusedDataType(self,rsltMin):
+        if rsltMin is not None and rsltMin > 0:
+            self.dataType = 'Positive Float'
+        else:
+            self.dataType = 'Float'
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+
+        wts = self.ValFromArgByNm('Weights')
+
+        np.multiply(inBlocks[0],wts[0],out=outBlock,casting='unsafe')
+        for wt,inBlock in zip(wts,inBlocks)[1:]:
+            np.add(outBlock,inBlock * wt,out=outBlock,casting='unsafe')
+        np.true_divide(outBlock,sum(wts),out=outBlock)
+
+        return ~np.isfinite(outBlock)
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -777,6 +854,10 @@ class Normalize(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
         
+    def IsTileable(self): return True
+
+    def GlobalStatNms(self): return ['min','max']
+
     def Exec(self,executedObjects):
 
         inObj = executedObjects[self.ValFromArgByNm('InFieldName')]
@@ -788,8 +869,8 @@ class Normalize(mpefp._MPilotEEMSFxnParent):
         if endVal is None: endVal = 1.0
 
         inArr = inObj.ExecRslt()
-        inMin = inArr.min()
-        inMax = inArr.max()
+        inMin = self._ArrStat('min',inArr)
+        inMax = self._ArrStat('max',inArr)
         
         self.execRslt = (inArr-inMin) * (startVal-endVal) / (inMin-inMax) + startVal
 
@@ -838,6 +919,10 @@ class PrintVars(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
 
@@ -4,7 +4,9 @@
 # 2016.07.06 - tjs
 #  Created _MPilotEEMSParent
 
+from MPCore import MPilotCmdStruct as mpcs
 from MPCore import MPilotEEMSFxnParent as mpefp
+from MPCore import MPilotEstimate as mpest
 import numpy as np
 
 class EEMSRead(mpefp._MPilotEEMSFxnParent):
@@ -14,6 +16,10 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
         mptCmdStruct=None
         ):
 
+        # Struct dicts are converted before their args are read
+        if mptCmdStruct is not None:
+            mptCmdStruct = mpcs.CmdStructFromDict(mptCmdStruct)
+
         self.mptCmdStruct = mptCmdStruct
         if not self.ArgExists('DataType'):
             dataType = 'Float'
@@ -69,7 +75,7 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
     # _SetFxnDesc(self):
 
     def _SetRsltNm(self,nm):
-        self.mptCmdStruct['parsedCmd']['rsltNm'] = nm
+        self.SetRsltNm(nm)
 
     def DependencyNms(self):
         
@@ -77,7 +83,24 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
         return rtrn
     
     # def DependencyNms(self):
-    
+
+    def EstimateRslt(self,depEsts):
+
+        # One value for each non-blank line after the header.
+        # Errors are left for Exec() to report.
+        try:
+            with open(self.ArgByNm('InFileName'),'rU') as inF:
+                inF.readline()
+                nVals = sum([1 for line in inF if line.strip().replace('"','') != ''])
+        except IOError:
+            return None
+
+        if self.ArgExists('MissingVal') and self.DataType() == 'Integer':
+            return mpest.RsltEst((nVals,),np.int,masked=True)
+        return mpest.RsltEst((nVals,),np.float64,masked=True)
+
+    # def EstimateRslt(self,depEsts):
+
     def Exec(self,executedObjects):
 
         # Set the return name
@@ -89,7 +112,8 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
         # if self.RsltNm() is None:
                            
         if self.ArgExists('ReturnType'):
-            self.fxnDesc['ReturnType'] = self.ArgByNm('ReturnType')
+            # fxnDesc is shared by the class, so this command gets its own
+            self.fxnDesc = self.fxnDesc.Replace(ReturnType=self.ArgByNm('ReturnType'))
 
         with open(self.ArgByNm('InFileName'),'rU') as inF:
             # Read first line, clean it, get index of field name
@@ -231,6 +255,12 @@ class EEMSWrite(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def HasSideEffects(self): return True
+
+    def OutputNms(self): return self._ArgToList('OutFieldNames')
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
 
         outFldNms = self.ArgByNm('OutFieldNames').replace('[','').replace(']','').split(',')
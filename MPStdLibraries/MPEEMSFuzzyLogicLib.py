@@ -46,6 +46,37 @@ class CvtToFuzzy(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def IsFusable(self):
+        # Thresholds from Direction need all of the input
+        return 'Direction' not in self.Args()
+
+    def FusedInNms(self): return [self.ArgByNm('InFieldName')]
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+
+        x1 = float(self.ArgByNm('TrueThreshold'))
+        x2 = float(self.ArgByNm('FalseThreshold'))
+        y1 = self.fuzzyMax
+        y2 = self.fuzzyMin
+
+        np.subtract(inBlocks[0],x1,out=outBlock)
+        np.multiply(outBlock,y2-y1,out=outBlock)
+        np.true_divide(outBlock,x2-x1,out=outBlock)
+        invalid = ~np.isfinite(outBlock)
+        np.add(outBlock,y1,out=outBlock)
+        self._InsureFuzzyBlock(outBlock)
+
+        return invalid
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def IsTileable(self): return True
+
+    def GlobalStatNms(self):
+        if 'Direction' in self.Args():
+            return ['min','max']
+        return []
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -91,17 +122,17 @@ class CvtToFuzzy(mpefp._MPilotEEMSFxnParent):
             falseThresh = self.ArgByNm('FalseThreshold')
         elif 'Direction' in self.Args():
             if self.ArgByNm('Direction') in ['LowToHigh']:
-                falseThresh =  inArr.min()
+                falseThresh =  self._ArrStat('min',inArr)
             elif self.ArgByNm('Direction') in ['HighToLow']:
-                falseThresh =  inArr.max()
+                falseThresh =  self._ArrStat('max',inArr)
                 
         if 'TrueThreshold' in self.Args():
             trueThresh = self.ArgByNm('TrueThreshold')
         elif 'Direction' in self.Args():
             if self.ArgByNm('Direction') in ['LowToHigh']:
-                trueThresh =  inArr.max()
+                trueThresh =  self._ArrStat('max',inArr)
             elif self.ArgByNm('Direction') in ['HighToLow']:
-                trueThresh =  inArr.min()
+                trueThresh =  self._ArrStat('min',inArr)
 
         if trueThresh == falseThresh:
             raise Exception(
@@ -173,6 +204,10 @@ class CvtToFuzzyZScore(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def IsTileable(self): return True
+
+    def GlobalStatNms(self): return ['mean','std']
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -211,8 +246,8 @@ class CvtToFuzzyZScore(mpefp._MPilotEEMSFxnParent):
                 ),
             )
 
-        rawMean = np.ma.mean(inArr)
-        rawStdDev = np.ma.std(inArr)
+        rawMean = self._ArrStat('mean',inArr)
+        rawStdDev = self._ArrStat('std',inArr)
         
         x1 = rawMean + rawStdDev * trueThreshZScore
         x2 = rawMean + rawStdDev * falseThreshZScore
@@ -273,6 +308,8 @@ class CvtToFuzzyCat(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -361,6 +398,8 @@ class CvtToFuzzyCurve(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -475,6 +514,10 @@ class CvtToFuzzyCurveZScore(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def IsTileable(self): return True
+
+    def GlobalStatNms(self): return ['mean','std']
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -508,8 +551,8 @@ class CvtToFuzzyCurveZScore(mpefp._MPilotEEMSFxnParent):
 
         fuzzyVals = self.ValFromArgByNm('FuzzyValues')
         zScoreVals = self.ValFromArgByNm('ZScoreValues')
-        rawMean = np.ma.mean(inArr)
-        rawStdDev = np.ma.std(inArr)
+        rawMean = self._ArrStat('mean',inArr)
+        rawStdDev = self._ArrStat('std',inArr)
         
         rawVals = [rawMean + zScoreVal * rawStdDev for zScoreVal in zScoreVals]
 
@@ -595,6 +638,8 @@ Direction = HighToLow for values below threshold to be true and above to be fals
     
     # def DependencyNms(self):
 
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -690,6 +735,23 @@ class FuzzyUnion(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsFusable(self): return True
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+
+        np.copyto(outBlock,inBlocks[0],casting='unsafe')
+        for inBlock in inBlocks[1:]:
+            np.add(outBlock,inBlock,out=outBlock,casting='unsafe')
+        np.true_divide(outBlock,float(len(inBlocks)),out=outBlock)
+        invalid = ~np.isfinite(outBlock)
+        self._InsureFuzzyBlock(outBlock)
+
+        return invalid
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -748,6 +810,25 @@ class FuzzyWeightedUnion(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
     
+    def IsFusable(self): return True
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+
+        wts = self.ValFromArgByNm('Weights')
+
+        np.multiply(inBlocks[0],wts[0],out=outBlock,casting='unsafe')
+        for wt,inBlock in zip(wts,inBlocks)[1:]:
+            np.add(outBlock,inBlock * wt,out=outBlock,casting='unsafe')
+        np.true_divide(outBlock,sum(wts),out=outBlock)
+        invalid = ~np.isfinite(outBlock)
+        self._InsureFuzzyBlock(outBlock)
+
+        return invalid
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -810,6 +891,8 @@ class FuzzySelectedUnion(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -896,6 +979,21 @@ class FuzzyOr(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsFusable(self): return True
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+
+        np.copyto(outBlock,inBlocks[0],casting='unsafe')
+        for inBlock in inBlocks[1:]:
+            np.maximum(outBlock,inBlock,out=outBlock,casting='unsafe')
+        self._InsureFuzzyBlock(outBlock)
+
+        return None
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
 
         self._ValidateListLen('InFldNms',1)
@@ -947,6 +1045,21 @@ class FuzzyAnd(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsFusable(self): return True
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+
+        np.copyto(outBlock,inBlocks[0],casting='unsafe')
+        for inBlock in inBlocks[1:]:
+            np.minimum(outBlock,inBlock,out=outBlock,casting='unsafe')
+        self._InsureFuzzyBlock(outBlock)
+
+        return None
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
 
         self._ValidateListLen('InFldNms',1)
@@ -997,6 +1110,8 @@ class FuzzyXOr(mpefp._MPilotEEMSFxnParent):
         
     # _SetFxnDesc(self):
 
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
 
         self._ValidateListLen('InFieldNames',2)
@@ -1083,6 +1198,21 @@ class FuzzyNot(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def IsFusable(self): return True
+
+    def FusedInNms(self): return [self.ArgByNm('InFieldName')]
+
+    def FusedBlockExec(self,inBlocks,outBlock):
+
+        np.negative(inBlocks[0],out=outBlock,casting='unsafe')
+        self._InsureFuzzyBlock(outBlock)
+
+        return None
+
+    # def FusedBlockExec(self,inBlocks,outBlock):
+
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
 
         inFldNm = self.ArgByNm('InFieldName')
@@ -1139,6 +1269,8 @@ class CvtFromFuzzy(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def IsTileable(self): return True
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
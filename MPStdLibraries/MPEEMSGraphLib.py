@@ -1,5 +1,6 @@
 from __future__ import division
 from MPCore import MPilotEEMSFxnParent as mpefp
+from MPCore import MPilotEstimate as mpest
 import numpy as np
 import copy as cp
 import matplotlib.pyplot as plt
@@ -49,6 +50,10 @@ class HistoDist(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
         
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
         
         dataObj = executedObjects[self.ValFromArgByNm('InFieldName')]
@@ -160,6 +165,10 @@ class LineDist(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
         
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
 
         print 'LineDist.Exec()',self.ArgByNm('OutFileName')
@@ -349,6 +358,10 @@ class RenderLayer(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
         
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
         
         dataObj = executedObjects[self.ValFromArgByNm('InFieldName')]
@@ -491,6 +504,10 @@ class ScatterXY(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
         
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
         
         xDataObj = executedObjects[self.ValFromArgByNm('XFieldName')]
@@ -4,10 +4,14 @@
 # 2016.07.27 - tjs
 #  First draft
 
+from MPCore import MPilotCmdStruct as mpcs
 from MPCore import MPilotEEMSFxnParent as mpefp
+from MPCore import MPilotEstimate as mpest
+from MPCore import MPilotNCLock as mpnclock
 import numpy as np
 import netCDF4 as nc4
 from scipy.io import netcdf
+import contextlib
 import copy as cp
 import os.path
 
@@ -20,6 +24,10 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
         isDataLayer=False
         ):
 
+        # Struct dicts are converted before their args are read
+        if mptCmdStruct is not None:
+            mptCmdStruct = mpcs.CmdStructFromDict(mptCmdStruct)
+
         self.mptCmdStruct = mptCmdStruct
 
         if mptCmdStruct is not None:
@@ -63,8 +71,67 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
         return rtrn
     
     # def DependencyNms(self):
+
+    def IsTileable(self): return True
+
+    def TileSourceShape(self):
+
+        # Errors are left for Exec() to report
+        if not os.path.isfile(self.ArgByNm('InFileName')):
+            return None
+
+        with mpnclock.NC_LOCK, nc4.Dataset(self.ArgByNm('InFileName'),'r') as inDS:
+            if self.ArgByNm('InFieldName') not in inDS.variables:
+                return None
+            return inDS.variables[self.ArgByNm('InFieldName')].shape
+
+    # def TileSourceShape(self):
+
+    def EstimateRslt(self,depEsts):
+
+        # From the file's header, with the data type Exec() converts to
+        shape = self.TileSourceShape()
+        if shape is None:
+            return None
+
+        if self.dataType in ['Integer']:
+            newDType = np.int
+        elif self.dataType in ['Positive Integer']:
+            newDType = np.uint
+        else:
+            newDType = np.float64
+
+        return mpest.RsltEst(shape,newDType,masked=True)
+
+    # def EstimateRslt(self,depEsts):
+
+    def _VarMax(self,inV,inArr):
+
+        # Maximum of the whole variable. When tiled, inArr is only
+        # the tile, so the maximum is found once, reading the
+        # variable a band of tiles at a time.
+
+        if self.tile is None:
+            return inArr.max()
+
+        cmdStats = self.tile.CmdStats(self.RsltNm())
+        if 'max' not in cmdStats:
+            bandLen = self.tile.window[0].stop - self.tile.window[0].start
+            bandMaxs = []
+            for bandStart in range(0,inV.shape[0],bandLen):
+                bandMax = inV[bandStart:bandStart + bandLen].max()
+                if bandMax is not np.ma.masked:
+                    bandMaxs.append(bandMax)
+            cmdStats['max'] = max(bandMaxs) if len(bandMaxs) > 0 else np.ma.masked
+
+        return cmdStats['max']
+
+    # def _VarMax(self,inV,inArr):
     
-    def Exec(self,executedObjects):
+    def _OpenInDS(self):
+
+        # The input dataset, checked for the variable read. Callers
+        # hold mpnclock.NC_LOCK while it is open.
 
         if not os.path.isfile(self.ArgByNm('InFileName')):
             raise Exception(
@@ -80,29 +147,74 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
             )
         # if not os.path.isfile(self.ArgByNm('InFileName'),'r'):
             
-        with nc4.Dataset(self.ArgByNm('InFileName'),'r') as inDS:
-            if self.ArgByNm('InFieldName') not in inDS.variables:
-                raise Exception(
-                    '{}{}{}{}{}'.format(
-                        '\n********************ERROR********************\n',
-                        'Read failure for file: {}\n'.format(self.ArgByNm('InFileName')),
-                        '  Variable not in file: {}\n'.format(self.ArgByNm('InFieldName')),
-                        'Script File: {}  Line number: {}\n'.format(
-                            self.mptCmdStruct['cmdFileNm'],
-                            self.mptCmdStruct['lineNo']
-                            ),
-                        'Full command:\n{}\n'.format(self.mptCmdStruct['rawCmdStr'])
-                    ),
-                )
+        inDS = nc4.Dataset(self.ArgByNm('InFileName'),'r')
+        if self.ArgByNm('InFieldName') not in inDS.variables:
+            inDS.close()
+            raise Exception(
+                '{}{}{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Read failure for file: {}\n'.format(self.ArgByNm('InFileName')),
+                    '  Variable not in file: {}\n'.format(self.ArgByNm('InFieldName')),
+                    'Script File: {}  Line number: {}\n'.format(
+                        self.mptCmdStruct['cmdFileNm'],
+                        self.mptCmdStruct['lineNo']
+                        ),
+                    'Full command:\n{}\n'.format(self.mptCmdStruct['rawCmdStr'])
+                ),
+            )
+
+        return inDS
+
+    # def _OpenInDS(self):
+
+    def IsPrefetchable(self): return True
+
+    def ReadInput(self):
+
+        # The whole variable. Tiled execution reads windows of it
+        # in _InArr().
+
+        with mpnclock.NC_LOCK:
+            inDS = self._OpenInDS()
+            try:
+                return inDS.variables[self.ArgByNm('InFieldName')][:]
+            finally:
+                inDS.close()
+
+    # def ReadInput(self):
+
+    @contextlib.contextmanager
+    def _InArr(self):
 
-            inV = inDS.variables[self.ArgByNm('InFieldName')]
+        # The input variable and the array of it that is used. In
+        # tiled execution the variable is open, and only the tile's
+        # window is read. Otherwise the variable is None and the
+        # array is all of it, perhaps prefetched.
+
+        if self.tile is None:
+            yield None,self._TakeInput()
+            return
+
+        with mpnclock.NC_LOCK:
+            inDS = self._OpenInDS()
+            try:
+                inV = inDS.variables[self.ArgByNm('InFieldName')]
+                yield inV,inV[self.tile.window]
+            finally:
+                inDS.close()
+
+    # def _InArr(self):
+    
+    def Exec(self,executedObjects):
+
+        with self._InArr() as (inV,inArr):
             
-            if isinstance(inV[:],np.ma.core.MaskedArray):
-                newMask = cp.deepcopy(inV[:].mask)
-                newData = cp.deepcopy(inV[:].data)
+            if isinstance(inArr,np.ma.core.MaskedArray):
+                newMask = cp.deepcopy(inArr.mask)
+                newData = cp.deepcopy(inArr.data)
             else:
                 newMask = False
-                newData = cp.deepcopy(inV[:])
+                newData = cp.deepcopy(inArr)
 
             if self.dataType in ['Integer']:
                 newDType = np.int
@@ -111,7 +223,7 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
             else:
                 newDType = np.float64
 
-            if inV[:].dtype == np.float64 and newDType in [np.int,np.uint]:
+            if inArr.dtype == np.float64 and newDType in [np.int,np.uint]:
                 self.execRslt = np.ma.array(
                     newData + 0.5, # result rounds to nearest int
                     mask=newMask,
@@ -130,26 +242,26 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
             msg = None
             if self.dataType == 'Positive Integer':
                 
-                if inV[:].max() < 0.: msg = 'Positive Integer data has negative value'
+                if self._VarMax(inV,inArr) < 0.: msg = 'Positive Integer data has negative value'
                     
             elif self.dataType == 'Positive Float':
                 
-                if inV[:].max() < 0.: msg = 'Positive Float data has negative value'
+                if self._VarMax(inV,inArr) < 0.: msg = 'Positive Float data has negative value'
                     
             elif self.dataType == 'Fuzzy':
                 
                 fzPad = 0.01 * (self.fuzzyMax - self.fuzzyMin)
                 
-                if inV[:].max() >  self.fuzzyMax + fzPad or \
-                    inV[:].min() <  self.fuzzyMin - fzPad:
+                if inArr.max() >  self.fuzzyMax + fzPad or \
+                    inArr.min() <  self.fuzzyMin - fzPad:
 
                     msg = '{}{}'.format(
                         'Fuzzy data outside of fuzzy range: {} {}\n'.format(
                             self.fuzzyMin,self.fuzzyMax
                             ),
                         'Minimum and maximum values: {}  {}\n'.format(
-                            inV[:].min(),
-                            inV[:].max()
+                            inArr.min(),
+                            inArr.max()
                             )
                         )
                 else:
@@ -186,7 +298,7 @@ class EEMSRead(mpefp._MPilotEEMSFxnParent):
                     self.execRslt.mask = np.where(
                         self.execRslt.data == missingVal,
                         True,
-                        inV[:].mask
+                        inArr.mask
                         )
                 else:
                     self.execRslt.mask = np.ma.where(
@@ -283,8 +395,48 @@ class EEMSWrite(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def HasSideEffects(self): return True
+
+    def OutputNms(self): return self._ArgToList('OutFieldNames')
+
+    def IsTileable(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
 
+        # In tiled execution the file is created with the first tile,
+        # and each tile is written into its window of the variables
+        newFile = self.tile is None or self.tile.isFirst
+        if self.tile is None:
+            window = slice(None)
+        else:
+            window = self.tile.window
+
+        outFldNms = self._ArgToList('OutFieldNames')
+
+        # Check that all output variables are data layers
+        for outFldNm in outFldNms:
+            self._ValidateIsDataLayer(executedObjects[outFldNm])
+
+        # Make the universal mask
+        uniMask = cp.deepcopy(executedObjects[outFldNm].ExecRslt().mask)
+        for outFldNm in outFldNms[1:]:
+            uniMask = np.ma.mask_or(uniMask,executedObjects[outFldNm].ExecRslt().mask)
+
+        if not newFile:
+
+            with mpnclock.NC_LOCK, nc4.Dataset(self.ArgByNm('OutFileName'),'a') as outDS:
+                for outFldNm in outFldNms:
+                    outDS.variables[outFldNm][window] = \
+                        np.ma.MaskedArray(executedObjects[outFldNm].ExecRslt().data,uniMask)
+
+            self.execRslt = True
+            executedObjects[self.RsltNm()] = self
+            return
+
+        # if not newFile:
+
         try: # check for writable file
             outF = open(self.ArgByNm('OutFileName'),'w')
             outF.close()
@@ -303,17 +455,11 @@ class EEMSWrite(mpefp._MPilotEEMSFxnParent):
             )
 
         # try: # check for writable file            
-        
-        outFldNms = self._ArgToList('OutFieldNames')
 
-        # Check that all output variables are data layers
-        for outFldNm in outFldNms:
-            self._ValidateIsDataLayer(executedObjects[outFldNm])
-
-        with nc4.Dataset(self.ArgByNm('OutFileName'),'w') as outDS:
+        with mpnclock.NC_LOCK, nc4.Dataset(self.ArgByNm('OutFileName'),'w') as outDS:
             
             # Prep the dimensions in the ouput file
-            with nc4.Dataset(self.ArgByNm('DimensionFileName')) as dimDS:
+            with mpnclock.NC_LOCK, nc4.Dataset(self.ArgByNm('DimensionFileName')) as dimDS:
                 dimNms = dimDS[self.ArgByNm('DimensionFieldName')].dimensions
                 for dimNm in dimNms:
                     inDimV = dimDS.variables[dimNm]
@@ -326,11 +472,6 @@ class EEMSWrite(mpefp._MPilotEEMSFxnParent):
                     outDimV[:] = inDimV[:]
             # with Dataset(self.ArgByNm('DimensionFileName')) as dimDS:
 
-            # Make the universal mask
-            uniMask = cp.deepcopy(executedObjects[outFldNm].ExecRslt().mask)
-            for outFldNm in outFldNms[1:]:
-                uniMask = np.ma.mask_or(uniMask,executedObjects[outFldNm].ExecRslt().mask)
-
             # print 'MPilotEEMSNC4IO.py outFldNms:'
             # for outFldNm in outFldNms:
             #     print outFldNm
@@ -345,7 +486,7 @@ class EEMSWrite(mpefp._MPilotEEMSFxnParent):
                     fill_value = executedObjects[outFldNm].ExecRslt().fill_value
                     )
                 # outV[:] = cp.deepcopy(executedObjects[outFldNm].ExecRslt())
-                outV[:] = np.ma.MaskedArray(executedObjects[outFldNm].ExecRslt().data,uniMask)                
+                outV[window] = np.ma.MaskedArray(executedObjects[outFldNm].ExecRslt().data,uniMask)                
             # for outFldNm in outFldNms:
         
         self.execRslt = True
@@ -6,6 +6,7 @@
 #
 
 import MPilotEEMSFxnParent as mpefp
+import MPilotEstimate as mpest
 
 class PrintVars(mpefp._MPilotEEMSFxnParent):
 
@@ -46,6 +47,10 @@ class PrintVars(mpefp._MPilotEEMSFxnParent):
     
     # def DependencyNms(self):
 
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
 
@@ -27,6 +27,9 @@ import numpy as np
 from scipy import stats
 import copy as cp
 from MPCore import MPilotFxnParent as mpfp
+from MPCore import MPilotEstimate as mpest
+from MPCore import MPilotNCLock as mpnclock
+from MPCore import MPilotArgTypes as mpat
 from MPUtilities import MPNetCDF4Variable as mpncv
 import re
 import os
@@ -127,131 +130,44 @@ class _NetCDFUtilParent(mpfp._MPilotFxnParent):
         
     # def __init__(...)
 
-    def _IsArgType(self,inStr,inType):
+    # Argument types NetCDF commands accept (see MPilotArgTypes.py),
+    # along with One of, Tuple, and Tuple List types
+    _ARG_ELEM_CHECKS = dict(
+        mpat.COMMON_ELEM_CHECKS,
+        **{
+            'Binary':mpat.IsBinary,
+            }
+        )
+
+    @classmethod
+    def _MakeArgTypeValidator(cls,argType):
 
         # If the string has a list of single word values it
         # can be.
-        if inType.startswith('One of|'):
-            if inStr in inType.split('|',2)[1].split():
-                return True
-            else:
-                return False
-
-        if inType.startswith('Tuple:'):
-            
-            types = inType.split(':',1)[1].split(':')
-            types = [s.strip() for s in types]
-
-            # strip out the whitespace and split the tup
-            tup_entries = ''.join(inStr.split()).split(':')
-
-            # check for length of tup
-            if len(tup_entries) != len(types):
-                return False
-
-            # check type of each tup entry
-            for tup_entry, type in zip(tup_entries,types):
-                if not self._IsArgType(tup_entry,type):
-                    return False
-                
-            # if we got to here, it's good!
-            return True
-
-        # if inType.startswith('Tuple:'):
-
-        if inType.startswith('Tuple List:'):
-            # a tuple list would look like this:
-            # [lat:44.75:49.00, lon:-127.25:-129.25]
-            types = inType.split(':',1)[1].split(':')
-            types = [s.strip() for s in types]
-            tups = inStr.replace('[','').replace(']','').split(',')
-            
-            for tup in tups:
-                
-                # strip out the whitespace and split the tup
-                tup_entries = ''.join(tup.split()).split(':')
-                
-                # check for length of tup
-                if len(tup_entries) != len(types):
-                    return False
-                
-                # check type of each tup entry
-                for tup_entry, type in zip(tup_entries,types):
-                    if not self._IsArgType(tup_entry,type):
-                        return False
-
-            # if we got to here, it's good!
-            return True
+        if argType.startswith('One of|'):
+            return mpat.MakeOneOfValidator(argType)
+
+        # a tuple list would look like this:
+        # [lat:44.75:49.00, lon:-127.25:-129.25]
+        for tupPrefix,isList in [('Tuple:',False),('Tuple List:',True)]:
+            if argType.startswith(tupPrefix):
+                entryTypes = [s.strip() for s in argType.split(':',1)[1].split(':')]
+                return mpat.MakeTupleValidator(
+                    [cls._ArgTypeValidator(entryType) for entryType in entryTypes],
+                    isList
+                    )
 
-        # if inType.startswith('Tuple List:'):
-            
         # Otherwise do the check by type.
-        if re.match(r'.+ List$',inType):
-            theType = inType.replace(' List','',1)
-            if not re.match(r'\[.*\]',inStr): return False
-            theStr = inStr.replace('[','').replace(']','')
-        else:
-            theStr = inStr
-            theType = inType
-            
-        theStrs = theStr.split(',')
-        if len(theStrs) == 0: return False
+        return super(_NetCDFUtilParent,cls)._MakeArgTypeValidator(argType)
 
-        for theStr in theStrs:
-            if theType == 'Any':
-                pass
-            elif theType == 'String':
-                pass
-            elif theType == 'File Name':
-                if not re.match(r'([a-zA-Z]:[\\/]){0,1}[\w\\/\.\- ~]*\w+\s*$',theStr):
-                    return False
-            elif theType == 'Field Name':
-                if not re.match(r'^[a-zA-Z][-\w]*$',theStr):
-                    return False
-            elif theType == 'Integer':
-                if not re.match(r'^[+-]{0,1}[0-9]+$',theStr):
-                    return False
-            elif theType == 'Binary':
-                if not re.match(r'^[01]+$',theStr):
-                    return False
-            elif theType == 'Positive Integer':
-                if not re.match(r'^[+]{0,1}^[0-9]$',theStr):
-                    return False
-                else:
-                    if int(theStr) < 1:
-                        return False
-            elif theType == 'Float':
-                if not re.match(r'^[+-]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
-                    return False
-                
-            elif theType == 'Fuzzy Value':
-
-                if not re.match(r'^[+-]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
-                    return False
-                if not self.fuzzyMin <= float(theStr) <= self.fuzzyMax:
-                    return False
-
-            elif theType == 'Positive Float':
-                if not re.match(r'^[+]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
-                    return False
-            elif theType == 'Boolean':
-                if not (inStr == 'True' or inStr == 'False'):
-                    return False                
-            else:
-                raise Exception(
-                    '{}{}{}'.format(
-                        '\n********************ERROR********************\n',
-                        'Class definition error.\n',
-                        'Illegal argument type in function descriptions: {}'.format(inType)
-                        )
-                    )
-        # for theStr in theStrs:
+    # def _MakeArgTypeValidator(cls,argType):
 
-        return True
+    def _IsArgType(self,inStr,inType):
+        return self._ArgTypeValidator(inType)(self,inStr)
     
     # def _IsArgType(self,inStr,type):
 
-    def ValFromArgByNm(self,argNm):
+    def _ConvertArgByNm(self,argNm):
 
         # Return an actual value (be that a single value or a list)
         # of an argument. Arguments are read as strings, so this
@@ -384,7 +300,7 @@ class _NetCDFUtilParent(mpfp._MPilotFxnParent):
 
         return rtrn
 
-    # def ValFromArgByNm(self,argNm):
+    # def _ConvertArgByNm(self,argNm):
 
     def _MakeCongruentNCDimArr(self,ncdimarr_to_expand,ncdimarr_to_match):
         '''
@@ -473,6 +389,34 @@ class _NetCDFUtilParent(mpfp._MPilotFxnParent):
             
     # def _CreateNCVarName(self):
 
+    def AdoptExecState(self):
+
+        # The result was computed by another command. Its name (see
+        # _CreateNCVarName()) and NodeCommand metadata are made this
+        # command's on a copy of the NCDimensionedVar that shares the
+        # arrays of the original.
+
+        ncdimvar = self.execRslt
+        if not isinstance(ncdimvar,mpncv.NCDimensionedVar) or ncdimvar.data is None:
+            return
+
+        new_nm = self._CreateNCVarName()
+        cmd_str = self.mptCmdStruct['rawCmdStr']
+        if ncdimvar.name == new_nm and \
+          ncdimvar.metadata.get('NodeCommand',cmd_str) == cmd_str:
+            return
+
+        new_ncdimvar = cp.copy(ncdimvar)
+        new_ncdimvar.data = cp.copy(ncdimvar.data)
+        new_ncdimvar.metadata = OrderedDict(ncdimvar.metadata)
+        new_ncdimvar.name = new_nm
+        if 'NodeCommand' in new_ncdimvar.metadata:
+            new_ncdimvar.set_metadata_val('NodeCommand',cmd_str)
+
+        self.execRslt = new_ncdimvar
+
+    # def AdoptExecState(self):
+
     def _SetMetadata(self,ncdimvar=None):
 
         if ncdimvar is None:
@@ -486,6 +430,35 @@ class _NetCDFUtilParent(mpfp._MPilotFxnParent):
                 ncdimvar.set_metadata_val(key,val)
 
     # def _SetMetadata(self,ncdimvar):
+
+    def _ReducedEst(self,in_est,dim_nms):
+
+        # For a dry run, the estimate for a result that summarizes
+        # in_est over dimensions dim_nms. None if unknown.
+
+        if in_est is None or in_est['dimNms'] is None:
+            return None
+
+        for dim_nm in dim_nms:
+            if dim_nm not in in_est['dimNms']:
+                return None
+
+        new_dim_nms = []
+        new_shape = []
+        for dim_nm,dim_len in zip(in_est['dimNms'],in_est['shape']):
+            if dim_nm not in dim_nms:
+                new_dim_nms.append(dim_nm)
+                new_shape.append(dim_len)
+
+        return mpest.RsltEst(
+            new_shape,
+            np.float64,
+            masked=True,
+            extraBytes=in_est['extraBytes'],
+            dimNms=new_dim_nms
+            )
+
+    # def _ReducedEst(self,in_est,dim_nms):
     
 # class _NetCDFUtilParent(mpfp._MPilotFxnParent):
 
@@ -522,7 +495,11 @@ class ReadAscVariable(_NetCDFUtilParent):
     def DependencyNms(self):
         return self._ArgToList('PrecursorFieldNames')
 
-    def Exec(self,executedObjects):
+    def IsPrefetchable(self): return True
+
+    def ReadInput(self):
+
+        # The lines of the file
         
         if not os.path.isfile(self.ArgByNm('InFileName')):
             raise Exception(
@@ -539,7 +516,13 @@ class ReadAscVariable(_NetCDFUtilParent):
         # if not os.path.isfile(self.ArgByNm('InFileName'),'r'):
 
         with open(self.ArgByNm('InFileName'), 'rU') as in_f:
-            lines = in_f.readlines()
+            return in_f.readlines()
+
+    # def ReadInput(self):
+
+    def Exec(self,executedObjects):
+
+        lines = self._TakeInput()
 
         # Grab the fields that define the file
 
@@ -712,7 +695,44 @@ class ReadNCVariable(_NetCDFUtilParent):
     def DependencyNms(self):
         return self._ArgToList('PrecursorFieldNames')
 
-    def Exec(self,executedObjects):
+    def EstimateRslt(self,depEsts):
+
+        # From the file's header. Errors are left for Exec() to report.
+
+        if not os.path.isfile(self.ArgByNm('InFileName')):
+            return None
+
+        with mpnclock.NC_LOCK, nc.Dataset(self.ArgByNm('InFileName'),'r') as in_ds:
+
+            if self.ArgByNm('InFieldName') not in in_ds.variables:
+                return None
+
+            in_var = in_ds.variables[self.ArgByNm('InFieldName')]
+
+            # Dimension variables, or indices for dimensions without them
+            dim_bytes = 0
+            for dim_nm in in_var.dimensions:
+                if dim_nm in in_ds.variables:
+                    dim_itemsize = in_ds.variables[dim_nm].dtype.itemsize
+                else:
+                    dim_itemsize = np.dtype(float).itemsize
+                dim_bytes += len(in_ds.dimensions[dim_nm]) * dim_itemsize
+
+            return mpest.RsltEst(
+                in_var.shape,
+                in_var.dtype,
+                masked=True,
+                extraBytes=dim_bytes,
+                dimNms=in_var.dimensions
+                )
+
+    # def EstimateRslt(self,depEsts):
+
+    def IsPrefetchable(self): return True
+
+    def ReadInput(self):
+
+        # The variable, with its dimensions
         
         if not os.path.isfile(self.ArgByNm('InFileName')):
             raise Exception(
@@ -728,7 +748,7 @@ class ReadNCVariable(_NetCDFUtilParent):
             )
         # if not os.path.isfile(self.ArgByNm('InFileName'),'r'):
 
-        with nc.Dataset(self.ArgByNm('InFileName'),'r') as in_ds:
+        with mpnclock.NC_LOCK, nc.Dataset(self.ArgByNm('InFileName'),'r') as in_ds:
             if self.ArgByNm('InFieldName') not in in_ds.variables:
                 raise Exception(
                     '{}{}{}{}{}'.format(
@@ -743,13 +763,19 @@ class ReadNCVariable(_NetCDFUtilParent):
                     ),
                 )
                 
-            self.execRslt = mpncv.NCDimensionedVar(
+            return mpncv.NCDimensionedVar(
                 nc_ds=in_ds,
                 ncvar_nm=self.ArgByNm('InFieldName')
                 )
             
         # with nc.Dataset(self.ArgByNm('InFileName'),'r') as in_ds:
 
+    # def ReadInput(self):
+
+    def Exec(self,executedObjects):
+
+        self.execRslt = self._TakeInput()
+
         # Reorder based on dimensions?
         dim_val_orders = self.ValFromArgByNm('DimensionValueOrders')
         
@@ -855,7 +881,7 @@ class ReadAndStackNCVariables(_NetCDFUtilParent):
                 )
             # if not os.path.isfile(self.ArgByNm('InFileName'),'r'):
 
-            with nc.Dataset(infile_name,'r') as in_ds:
+            with mpnclock.NC_LOCK, nc.Dataset(infile_name,'r') as in_ds:
                 if infield_name not in in_ds.variables:
                     raise Exception(
                         '{}{}{}{}{}'.format(
@@ -1007,6 +1033,12 @@ class WriteNCVariables(_NetCDFUtilParent):
     
     # def DependencyNms(self):
 
+    def HasSideEffects(self): return True
+
+    def OutputNms(self): return self._ArgToList('OutFieldNames')
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
 
         if self.ValFromArgByNm('Overwrite'):
@@ -1034,7 +1066,7 @@ class WriteNCVariables(_NetCDFUtilParent):
 
         # try: # check for writable file
 
-        with nc.Dataset(self.ArgByNm('OutFileName'),write_or_append) as outDS:
+        with mpnclock.NC_LOCK, nc.Dataset(self.ArgByNm('OutFileName'),write_or_append) as outDS:
 
             # Tolerance for checking matching dimensions
             tolerance = self.ValFromArgByNm('DimensionTolerance')
@@ -1096,6 +1128,8 @@ class ReadNCGlobalMetadata(_NetCDFUtilParent):
     def DependencyNms(self):
         return self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
         
         if not os.path.isfile(self.ArgByNm('InFileName')):
@@ -1112,7 +1146,7 @@ class ReadNCGlobalMetadata(_NetCDFUtilParent):
             )
         # if not os.path.isfile(self.ArgByNm('InFileName'),'r'):
             
-        with nc.Dataset(self.ArgByNm('InFileName'),'r') as in_ds:
+        with mpnclock.NC_LOCK, nc.Dataset(self.ArgByNm('InFileName'),'r') as in_ds:
             self.execRslt = cp.deepcopy(in_ds.__dict__)
         executedObjects[self.RsltNm()] = self
 
@@ -1151,6 +1185,10 @@ class WriteNCGlobalMetadata(_NetCDFUtilParent):
     def DependencyNms(self):
         return self._ArgToList('PrecursorFieldNames') + self._ArgToList('InFieldName')
 
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
 
         if self.ValFromArgByNm('Overwrite'):
@@ -1180,7 +1218,7 @@ class WriteNCGlobalMetadata(_NetCDFUtilParent):
 
         nc_atts = OrderedDict()
 
-        with nc.Dataset(self.ArgByNm('OutFileName'),write_or_append) as out_ds:
+        with mpnclock.NC_LOCK, nc.Dataset(self.ArgByNm('OutFileName'),write_or_append) as out_ds:
             out_ds.setncatts(
                 executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt()
                 )
@@ -1223,6 +1261,10 @@ class AddToNCGlobalMetadata(_NetCDFUtilParent):
     def DependencyNms(self):
         return self._ArgToList('PrecursorFieldNames') + self._ArgToList('InFieldName')
 
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
 
         if self.ValFromArgByNm('Overwrite'):
@@ -1257,7 +1299,7 @@ class AddToNCGlobalMetadata(_NetCDFUtilParent):
             val = val.replace('_',' ')
             nc_atts[key] = val
             
-        with nc.Dataset(self.ArgByNm('OutFileName'),write_or_append) as out_ds:
+        with mpnclock.NC_LOCK, nc.Dataset(self.ArgByNm('OutFileName'),write_or_append) as out_ds:
                 out_ds.setncatts(nc_atts)
 
         self.execRslt = True
@@ -1304,6 +1346,8 @@ class CopyNCVar(_NetCDFUtilParent):
         return self._ArgToList('InFieldName') + \
           self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         new_ncdimvar = cp.deepcopy(
@@ -1355,6 +1399,8 @@ class MaskNCVarByValues(_NetCDFUtilParent):
         return self._ArgToList('PrecursorFieldNames') + \
           self._ArgToList('InFieldName')
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         src_dimarr = executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt()
@@ -1444,6 +1490,8 @@ class MaskNCVarByValueRanges(_NetCDFUtilParent):
         return self._ArgToList('PrecursorFieldNames') + \
           self._ArgToList('InFieldName')
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         src_dimarr = executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt()
@@ -1952,6 +2000,8 @@ class ReplaceMask(_NetCDFUtilParent):
           self._ArgToList('TargetFieldName') + \
           self._ArgToList('FromFieldName') 
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
         
         tgt_ncdimvar = executedObjects[self.ValFromArgByNm('TargetFieldName')].ExecRslt()
@@ -2069,6 +2119,8 @@ class AddToMask(_NetCDFUtilParent):
           self._ArgToList('TargetFieldName') + \
           self._ArgToList('FromFieldNames') 
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         tgt_ncdimvar = executedObjects[self.ValFromArgByNm('TargetFieldName')].ExecRslt()
@@ -2192,6 +2244,8 @@ class MaskByTemplate(_NetCDFUtilParent):
           self._ArgToList('TargetFieldName') + \
           self._ArgToList('FromFieldNames') 
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         tgt_ncdimvar = executedObjects[self.ValFromArgByNm('TargetFieldName')].ExecRslt()
@@ -2320,6 +2374,8 @@ class MaskByMatchingValues(_NetCDFUtilParent):
           self._ArgToList('InFieldName') + \
           self._ArgToList('MatchFieldName') 
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         new_ncdimvar = cp.deepcopy(executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt())
@@ -2658,6 +2714,8 @@ class MaskByDimensionPatterns(_NetCDFUtilParent):
         return self._ArgToList('InFieldName') + \
           self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         new_ncdimvar = cp.deepcopy(
@@ -2765,6 +2823,8 @@ class UnmaskNCVar(_NetCDFUtilParent):
         return self._ArgToList('InFieldName') + \
           self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         new_ncdimvar = cp.deepcopy(
@@ -2823,6 +2883,8 @@ class UnmaskNCVarWithValue(_NetCDFUtilParent):
         return self._ArgToList('InFieldName') + \
           self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         new_ncdimvar = cp.deepcopy(
@@ -2864,6 +2926,18 @@ class _SummaryOverDimensions(_NetCDFUtilParent):
     that do a summary over one or more dimensions.
     '''
 
+    def EstimateRslt(self,depEsts):
+
+        # Some classes using this parent only allow one dimension
+        if 'Dimensions' in self.FxnReqArgs():
+            dim_nms = self._ArgToList('Dimensions')
+        else:
+            dim_nms = self._ArgToList('Dimension')
+
+        return self._ReducedEst(depEsts.get(self.ArgByNm('InFieldName')),dim_nms)
+
+    # def EstimateRslt(self,depEsts):
+
     def _Exec(self,executedObjects,summary_type):
 
         parent_ncdimvar = executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt()
@@ -3697,6 +3771,8 @@ class ZScore(_SummaryOverDimensions):
             self._ArgToList('StdDevFieldName') + \
             self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts,np.float64)
+
     def Exec(self,executedObjects):
         
         std_ncdimvar = executedObjects[self.ValFromArgByNm('StdDevFieldName')].ExecRslt()
@@ -3842,6 +3918,15 @@ class _ApplyScalarOperation(_NetCDFUtilParent):
         super(_ApplyScalarOperation,self).__init__(mpt_cmd_struct)
         
     # def __init__(...)
+
+    def EstimateRslt(self,depEsts):
+
+        rtrn = mpest.ElementwiseEst(self,depEsts)
+        if rtrn is not None:
+            rtrn['dtype'] = np.result_type(rtrn['dtype'],self.ValFromArgByNm('Scalar'))
+        return rtrn
+
+    # def EstimateRslt(self,depEsts):
     
     def _Exec(self,executedObjects,operation):
 
@@ -4076,6 +4161,8 @@ class Normalize(_NetCDFUtilParent):
         return self._ArgToList('InFieldName') + \
           self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts,np.float64)
+
     def Exec(self,executedObjects):
 
         new_ncdimvar = cp.deepcopy(executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt())
@@ -4127,6 +4214,8 @@ class AbsoluteValue(_NetCDFUtilParent):
         return self._ArgToList('InFieldName') + \
           self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         new_ncdimvar = cp.deepcopy(executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt())
@@ -4156,6 +4245,8 @@ class _DoArrayArithmetic(_NetCDFUtilParent):
         return self._ArgToList('InFieldNames') + \
           self._ArgToList('PrecursorFieldNames')
 
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts)
+
     def _Exec(self,executedObjects,operation):
 
         fldnm_list = self._ArgToList('InFieldNames')
@@ -4569,6 +4660,8 @@ class ClassFractionComposition(_NetCDFUtilParent):
     
     # def DependencyNms(self):
 
+    def HasSideEffects(self): return True
+
     def Exec(self,executedObjects):
 
         class_ncdimvar = executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt()
@@ -4618,6 +4711,10 @@ class ClassFractionComposition(_NetCDFUtilParent):
 
 class _GraphicsParent(_NetCDFUtilParent):
 
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def _InsureDirExists(self,dir_nm):
         
         if os.path.isdir(dir_nm):
@@ -8196,6 +8293,10 @@ class PrintVariables(_NetCDFUtilParent):
         self._ArgToList('PrecursorFieldNames')
         return rtrn
 
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
         
         print_objs = OrderedDict()
@@ -8295,6 +8396,10 @@ class PrintString(_NetCDFUtilParent):
         rtrn = self._ArgToList('PrecursorFieldNames')
         return rtrn
 
+    def HasSideEffects(self): return True
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
         print '{}\n'.format(self.ArgByNm('String').replace('_',' '))
 
@@ -8328,6 +8433,8 @@ class _FuzzyParent(_NetCDFUtilParent):
         arr[np.ma.where(arr < self.fuzzyMin)] = self.fuzzyMin
                 
     # def _InsureFuzzy(self,arr):
+
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts,np.float64)
        
 # class _FuzzyParent(_NetCDFUtilParent):
 
@@ -8797,6 +8904,8 @@ Direction = HighToLow for values below threshold to be 1 and above to be 0.'''
     
     # def DependencyNms(self):
 
+    def EstimateRslt(self,depEsts): return mpest.ElementwiseEst(self,depEsts,np.float64)
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -9778,6 +9887,12 @@ class FuzzySelectedUnionOverDimensions(_FuzzyParent):
     
     # def DependencyNms(self):
 
+    def EstimateRslt(self,depEsts):
+        return self._ReducedEst(
+            depEsts.get(self.ArgByNm('InFieldName')),
+            self._ArgToList('Dimensions')
+            )
+
     def Exec(self,executedObjects):
         # executedObjects is a dictionary of executed MPilot function objects
         
@@ -10024,6 +10139,8 @@ class MaskRandomSample(_NetCDFUtilParent):
     
     # def DependencyNms(self):
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
     
         src_dimarr = executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt()
@@ -10237,6 +10354,8 @@ class InvertMask(_NetCDFUtilParent):
     
     # def DependencyNms(self):
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         src_dimarr = executedObjects[self.ValFromArgByNm('InFieldName')].ExecRslt()
@@ -10763,6 +10882,8 @@ class MaskNCVarByDimensionIndexRanges(_NetCDFUtilParent):
           self._ArgToList('PrecursorFieldNames')
 
 
+    def EstimateRslt(self,depEsts): return mpest.FirstInEst(self,depEsts)
+
     def Exec(self,executedObjects):
 
         comp_tolerance = self.ValFromArgByNm('ComparisonTolerance')
@@ -10817,7 +10938,7 @@ class MaskNCVarByDimensionIndexRanges(_NetCDFUtilParent):
             add_mask = np.where(add_mask == True, False, True)
 
         self.execRslt = cp.deepcopy(to_mask_ncdimvar)
-        self.execRslt.name = self.RsltNm()
+        self.execRslt.name = self._CreateNCVarName()
         self.execRslt.data.data.mask = np.ma.mask_or(
             self.execRslt.data.data.mask,
             add_mask
@@ -10886,7 +11007,7 @@ class CompositeArrays(_NetCDFUtilParent):
         fldnm_list = self._ArgToList('InFieldNames')
         new_ncdimvar = cp.deepcopy(executedObjects[fldnm_list[0]].ExecRslt())
         new_marr = new_ncdimvar.data.data
-        new_ncdimvar.name = self.RsltNm()
+        new_ncdimvar.name = self._CreateNCVarName()
                 
         for fldnm in fldnm_list[1:]:
 
@@ -11094,6 +11215,12 @@ class WriteNCVariablesToCSV(_NetCDFUtilParent):
     def DependencyNms(self):
         return self._ArgToList('OutFieldNames') + self._ArgToList('PrecursorFieldNames')
 
+    def HasSideEffects(self): return True
+
+    def OutputNms(self): return self._ArgToList('OutFieldNames')
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
 
         try: # check for writable file
@@ -11190,6 +11317,12 @@ class Write1DNCVariablesToCSV(_NetCDFUtilParent):
     def DependencyNms(self):
         return self._ArgToList('OutFieldNames') + self._ArgToList('PrecursorFieldNames')
 
+    def HasSideEffects(self): return True
+
+    def OutputNms(self): return self._ArgToList('OutFieldNames')
+
+    def EstimateRslt(self,depEsts): return mpest.NoRsltEst()
+
     def Exec(self,executedObjects):
 
         try: # check for writable file
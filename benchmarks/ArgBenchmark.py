@@ -0,0 +1,219 @@
+# Benchmark of the per command overhead of argument validation and
+# conversion in EEMS commands: creating a command (which validates its
+# arguments) and then asking for its argument values as Exec() and
+# Mutate() methods do. Validation by the validators of
+# MPilotArgTypes.py, with converted values kept by ValFromArgByNm(),
+# is compared with the implementation they replaced, which is kept
+# here for comparison.
+#
+# Usage:
+#   python -m benchmarks.ArgBenchmark [Commands [ValCalls [Repeats]]]
+#
+# Commands (default 5000) CvtToFuzzyCurve and WeightedSum commands are
+# parsed from a generated script, created, and each numeric argument
+# asked for ValCalls (default 10) times, best of Repeats (default 3).
+# The two implementations must produce the same values.
+#
+# File Log:
+# 2026.10.18
+#  Created ArgBenchmark
+
+from collections import OrderedDict
+import re
+import sys
+import time
+
+from MPCore import MPilotParse as mpparse
+from MPStdLibraries import MPEEMSBasicLib as eemsbasic
+from MPStdLibraries import MPEEMSFuzzyLogicLib as eemsfuzzy
+
+# _MPilotEEMSFxnParent._IsArgType() before 2026.10.18
+
+def LegacyIsArgType(self,inStr,inType):
+
+    if re.match(r'.+ List$',inType):
+        theType = inType.replace(' List','',1)
+        if not re.match(r'\[.*\]',inStr): return False
+        theStr = inStr.replace('[','').replace(']','')
+    else:
+        theStr = inStr
+        theType = inType
+
+    theStrs = theStr.split(',')
+    if len(theStrs) == 0: return False
+
+    for theStr in theStrs:
+        if theType == 'Any':
+            pass
+        elif theType == 'String':
+            pass
+        elif theType == 'File Name':
+            if not re.match(r'([a-zA-Z]:[\\/]){0,1}[\w\\/\.\- ~]*\w+\s*$',theStr):
+                return False
+        elif theType == 'Field Name':
+            if not re.match(r'^[a-zA-Z][-\w]*$',theStr):
+                return False
+        elif theType == 'Integer':
+            if not re.match(r'^[+-]{0,1}[0-9]+$',theStr):
+                return False
+        elif theType == 'Positive Integer':
+            if not re.match(r'^[+]{0,1}^[0-9]$',theStr):
+                return False
+            else:
+                if int(theStr) < 1:
+                    return False
+        elif theType == 'Float':
+            if not re.match(r'^[+-]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
+                return False
+        elif theType == 'Positive Float':
+            if not re.match(r'^[+]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
+                return False
+        elif theType == 'Fuzzy Value':
+            if not re.match(r'^[+-]{0,1}([0-9]+\.*[0-9]*)(e[+-]{0,1}[0-9]+){0,1}$|(^[+-]{0,1}\.[0-9]+)(e[+-]{0,1}[0-9]+){0,1}$',theStr):
+                return False
+            if not self.fuzzyMin <= float(theStr) <= self.fuzzyMax:
+                return False
+        elif theType == 'Truest Or Falsest':
+            if not (inStr == '-1' or
+                inStr == '1' or
+                re.match(r'^[Tt][Rr][Uu][Ee][Ss][Tt]$',inStr) or
+                re.match(r'^[Ff][Aa][Ll][Ss][Ee][Ss][Tt]$',inStr)):
+                return False                
+        elif theType == 'Boolean':
+            if not (inStr == 'True' or inStr == 'False'):
+                return False                
+        elif theType == 'Data Type Desc':
+            if not theStr in [
+                'Any',
+                'String',
+                'File Name',
+                'Field Name',
+                'Integer',
+                'Positive Integer',
+                'Float',
+                'Positive Float',
+                'Fuzzy Value',
+                'Fuzzy',
+                ]:
+                return False
+        else:
+            raise Exception(
+                '{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Class definition error.\n',
+                    'Illegal argument type in function descriptions: {}'.format(inType)
+                    )
+                )
+    # for theStr in theStrs:
+
+    return True
+
+# def LegacyIsArgType(self,inStr,inType):
+
+class _LegacyArgs(object):
+
+    # Mixed into a command class to validate and convert arguments
+    # as before 2026.10.18: regular expressions chosen by type name on
+    # each check, and conversion on each ValFromArgByNm() call
+
+    _IsArgType = LegacyIsArgType
+
+    def ValFromArgByNm(self,argNm): return self._ConvertArgByNm(argNm)
+
+# class _LegacyArgs(object):
+
+# Command classes, and the arguments asked for by ValFromArgByNm()
+_BENCH_CLASSES = OrderedDict([
+    ('CvtToFuzzyCurve',(eemsfuzzy.CvtToFuzzyCurve,['RawValues','FuzzyValues'])),
+    ('WeightedSum',(eemsbasic.WeightedSum,['Weights'])),
+    ])
+
+def GenerateScript(nCmds):
+
+    # An MPilot script of nCmds commands
+
+    cmdTmpls = [
+        'c{n} = CvtToFuzzyCurve(\n    InFieldName = a{n},\n    RawValues = [0, 1.5, {n}.25, 1e3],\n    FuzzyValues = [-1, -0.5, 0.5, 1]\n    )\n',
+        'w{n} = WeightedSum(InFieldNames = [a{n}, b{n}, c{n}], Weights = [0.5, 2, -1.25])\n',
+        ]
+
+    lines = []
+    for cmdNdx in range(nCmds):
+        lines.append(cmdTmpls[cmdNdx % len(cmdTmpls)].format(n=cmdNdx))
+
+    return ''.join(lines)
+
+# def GenerateScript(nCmds):
+
+def TimeCmds(cmdClasses,mptCmdStructs,valCalls,repeats):
+
+    # Best time, in seconds, of creating the commands and asking for
+    # their argument values, and the values
+
+    bestSecs = None
+    for repeatNdx in range(repeats):
+
+        startTime = time.time()
+        rtrn = []
+        for mptCmdStruct in mptCmdStructs:
+            cmdCls,argNms = cmdClasses[mptCmdStruct['parsedCmd']['cmd']]
+            mpCmd = cmdCls(mptCmdStruct)
+            for callNdx in range(valCalls):
+                argVals = [mpCmd.ValFromArgByNm(argNm) for argNm in argNms]
+            rtrn.append(argVals)
+        secs = time.time() - startTime
+
+        if bestSecs is None or secs < bestSecs:
+            bestSecs = secs
+
+    return bestSecs,rtrn
+
+# def TimeCmds(cmdClasses,mptCmdStructs,valCalls,repeats):
+
+def RunBenchmark(nCmds=5000,valCalls=10,repeats=3):
+
+    mptCmdStructs = mpparse.ParseStringToCommands(GenerateScript(nCmds),'Benchmark').values()
+
+    print 'Commands: {}  ValFromArgByNm() calls per argument: {}'.format(len(mptCmdStructs),valCalls)
+
+    legacyClasses = OrderedDict([
+        (cmdNm,(type('Legacy{}'.format(cmdNm),(_LegacyArgs,cmdCls),{}),argNms))
+        for cmdNm,(cmdCls,argNms) in _BENCH_CLASSES.items()
+        ])
+
+    rslts = OrderedDict()
+    for benchNm,cmdClasses in [
+        ('MPilotArgTypes',_BENCH_CLASSES),
+        ('Legacy',legacyClasses),
+        ]:
+        secs,argVals = TimeCmds(cmdClasses,mptCmdStructs,valCalls,repeats)
+        rslts[benchNm] = (secs,argVals)
+        print '{:<20} {:8.3f} s  {:8.1f} us/command'.format(
+            benchNm,
+            secs,
+            1e6 * secs / len(mptCmdStructs)
+            )
+
+    print 'Speedup: {:.1f}x'.format(rslts['Legacy'][0] / rslts['MPilotArgTypes'][0])
+
+    if rslts['MPilotArgTypes'][1] != rslts['Legacy'][1]:
+        raise Exception(
+            '{}{}'.format(
+                '\n********************ERROR********************\n',
+                'The implementations produced different argument values\n'
+                )
+            )
+
+# def RunBenchmark(nCmds=5000,valCalls=10,repeats=3):
+
+if __name__ == '__main__':
+
+    if len(sys.argv) > 4:
+        print 'python -m benchmarks.ArgBenchmark [Commands [ValCalls [Repeats]]]'
+        exit()
+
+    RunBenchmark(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 3
+        )
@@ -0,0 +1,357 @@
+# Benchmark of MPilot script parsing, in MB of script per second, of
+# MPilotParse.ParseStringToCommands() and of the implementation it
+# replaced, which is kept here for comparison.
+#
+# Usage:
+#   python -m benchmarks.ParseBenchmark [ScriptMB [Repeats]]
+#
+# A script of about ScriptMB megabytes (default 10) is generated, with
+# comments, blank lines, commands spread over several lines and list
+# arguments, and parsed by both implementations, best of Repeats
+# (default 3). The two must produce the same commands.
+#
+# File Log:
+# 2026.10.18
+#  Created ParseBenchmark
+
+from collections import OrderedDict
+import copy as cp
+import re
+import sys
+import time
+
+from MPCore import MPilotParse as mpparse
+from MPCore import MPilotCmdStruct as mpcs
+
+# The implementation of ParseStringToCommands() before 2026.10.18
+
+def LegacyParseStringToCommands(
+    inStr,
+    objNm=None
+    ):
+    # Each command must start on a new line
+    # a mptCmdStruct is a list of dicts for the command string
+
+    mptCmdStructs = OrderedDict()
+    mptCmdStructstartLineNo = 0
+    if objNm is None: objNm = 'Input string'
+
+    cmdLine = ''      # buffer to build command from lines of input file
+    inParens = False  # whether or not parsing is within parentheses
+    parenCnt = 0      # count of parenthesis levels
+    inLineCnt = 0     # line number of input file for error messages.
+
+    rawCmd = ''
+    cleanCmd = ''
+
+    # Basically a finite state machine to build individual commands
+    
+    for inLine in inStr.split('\n'):
+
+        inLineCnt +=1
+
+        cleanLine = re.sub('#.*$','',inLine)
+        cleanLine = re.sub('\s+','',cleanLine)
+        
+        # Only start gathering a command where
+        # a command starts
+        if rawCmd == '':
+            if cleanLine == '':
+                continue
+            else:
+                mptCmdStructstartLineNum = inLineCnt
+
+        rawCmd = '{}{}\n'.format(rawCmd,inLine)
+
+        for charNdx in range(len(cleanLine)):
+            cleanCmd += cleanLine[charNdx]
+            if cleanLine[charNdx] == '(':
+                inParens = True
+                parenCnt += 1
+            elif cleanLine[charNdx] == ')':
+                parenCnt -= 1
+
+            if parenCnt < 0:
+                raise Exception(
+                    '{}{}{}{}'.format(
+                        '\n********************ERROR********************\n',
+                        'Unmatched right paren *)*\n',
+                        '  input: {}, line {}:\n'.format(objNm,inLineCnt),
+                        '  {}\n'.format(inLine),
+                        )
+                    )
+            if inParens and parenCnt == 0:
+                if charNdx < (len(cleanLine)-1):
+                    raise Exception(
+                        '{}{}{}{}'.format(
+                            '\n********************ERROR********************\n',
+                            'Extraneous characters beyond end of command\n',
+                            '  Input: {}, line {}:\n'.format(objNm,inLineCnt),
+                            '  {}\n'.format(inLine),
+                            )
+                        )
+
+                else:
+
+                    cleanCmd = re.sub(',+([\]\)])',r'\1',cleanCmd)
+                    
+                    mptCmdStructTmp = ({
+                        'cmdFileNm':objNm,
+                        'lineNo':mptCmdStructstartLineNum,
+                        'rawCmdStr':rawCmd,
+                        'cleanCmdStr':cleanCmd,
+                        })
+
+                    mptCmdStructTmp['parsedCmd'] = LegacyParseCommandToArgs(mptCmdStructTmp)
+                    
+                    rsltNm = mptCmdStructTmp['parsedCmd']['rsltNm']
+
+                    if mptCmdStructTmp['parsedCmd']['rsltNm'] in mptCmdStructs:
+                        raise Exception(
+                            '{}{}{}{}{}{}'.format(
+                                '\n********************ERROR********************\n',
+                                'Result appears more than once in input: {}.\n'.format(objNm),
+                                'First occurence: line {}:\n'.format(mptCmdStructs[rsltNm]['lineNo']),
+                                '  Command:\n{}\n'.format(mptCmdStructs[rsltNm]['rawCmdStr']),
+                                'Second occurence: line {}:\n'.format(mptCmdStructTmp['lineNo']),
+                                '  Command:\n{}\n'.format(mptCmdStructTmp['rawCmdStr']),
+                                )
+                            )
+
+                    mptCmdStructs[mptCmdStructTmp['parsedCmd']['rsltNm']] = cp.deepcopy(mptCmdStructTmp)
+
+                    rawCmd = ''
+                    cleanCmd = ''
+                    inParens = False
+                    parenCnt = 0
+
+        # for charNdx in range(len(cleanLine)):
+    # for inLine in inStr.split('\n'):
+
+    #    if cleanCmd != '':
+    if rawCmd != '':
+        raise Exception(
+            '{}{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Incomplete command in file:\n',
+                '  input: {}, line {}:\n'.format(objNm,mptCmdStructstartLineNum),
+                'Command:\n{}\n'.format(rawCmd),
+                )
+            )
+
+    return mptCmdStructs
+
+# def LegacyParseStringToCommands(inFDef):
+
+def LegacyParseCommandToArgs(mptCmdStruct):
+    # mptCmdStruct is a dict:
+    # 'lineNo': the command's line within the input file
+    # 'rawCmdStr': the command string as it appeared in the input
+    #    file, comments, line breaks, and all
+    # 'cleanCmdStr': the command string stripped of all its
+    #    comments, line breaks, and all
+
+    # strip white space
+    cmdStr = re.sub('\s+','',mptCmdStruct['cleanCmdStr'])
+
+    # parse the command string into result, command name, and arguments
+
+    cmdMatchRE = re.compile(r'([^=]+)=([^\(]+)\(([^\)]+)\)')
+    exprParse = cmdMatchRE.match(cmdStr)
+    
+    if not exprParse or len(exprParse.groups()) != 3:
+        raise Exception(
+            '{}{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Invalid command format.\n',
+                'File: {}  Line number: {}\n'.format(mptCmdStruct['cmdFileNm'],mptCmdStruct['lineNo']),
+                'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr'])),
+                )
+
+
+    parsedCmd = OrderedDict()
+    
+    # Every command must have a result
+    if exprParse.groups()[0] is None:
+        raise Exception(
+            '{}{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Command is missing result name.\n',
+                'File: {}  Line number: {}\n'.format(mptCmdStruct['cmdFileNm'],mptCmdStruct['lineNo']),
+                'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr'])),
+            )
+
+
+    parsedCmd['rsltNm'] = exprParse.groups()[0]
+
+    if (not re.match(r'^[a-zA-Z0-9\-\_]+$',parsedCmd['rsltNm']) and
+        not re.match(r'^\[[a-zA-Z0-9\-\_,]+\]$',parsedCmd['rsltNm'])
+        ):
+        raise Exception(
+            '{}{}{}{}'.format(
+                '\n********************ERROR********************\n',
+                'Invalid result name in command.\n',
+                'File: {}  Line number: {}\n'.format(mptCmdStruct['cmdFileNm'],mptCmdStruct['lineNo']),
+                'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr'])),
+            )
+
+
+    parsedCmd['cmd'] = exprParse.groups()[1]
+    
+    # Parse out the arguments
+    argStr = exprParse.groups()[2]
+    argPairs = []
+
+    while argStr != '':
+        argPairMatchObj = re.match(r'\s*([^=]*=\s*\[[^\[]*\])\s*,*\s*(.*)',argStr)
+        if argPairMatchObj:
+            argPairs.append(argPairMatchObj.groups()[0])
+            argStr = argPairMatchObj.groups()[1]
+        else:
+            argPairMatchObj = re.match(r'\s*([^=,]*=\s*[^,]*)\s*,*\s*(.*)',argStr)
+            if argPairMatchObj:
+                argPairs.append(argPairMatchObj.groups()[0])
+                argStr = argPairMatchObj.groups()[1]
+            else:
+                raise Exception(
+                    '{}{}{}{}{}'.format(
+                        '\n********************ERROR********************\n',
+                        'Invalid argument specification.\n',
+                        'File: {}  Line number: {}\n'.format(mptCmdStruct['cmdFileNm'],mptCmdStruct['lineNo']),
+                        'Section of command: {}\n'.format(argStr),
+                        'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr']),
+                        )
+                    )
+
+        # if argPair:...else:
+
+    # while argStr != '':
+
+    parsedCmd['arguments'] = OrderedDict()
+    for argPair in argPairs:
+
+        argTokens = re.split(r'\s*=\s*',argPair,2)
+
+        argTokens[0] = argTokens[0].strip()
+        argTokens[1] = argTokens[1].strip()
+
+        argTokens[1] = re.sub(r'\s*\[\s*','[',argTokens[1])
+        argTokens[1] = re.sub(r'\s*\]\s*',']',argTokens[1])
+        argTokens[1] = re.sub(r'\s*,\s*',',',argTokens[1])
+
+        if (len(argTokens) != 2
+            or argTokens[0] == ''
+            or argTokens[1] == ''
+            or argTokens[0] in parsedCmd
+            ):
+
+            raise Exception(
+                '{}{}{}{}'.format(
+                    '\n********************ERROR********************\n',
+                    'Invalid argument specification. Line number {}\n'.format(mptCmdStruct['lineNo']),
+                    'Argument specification: {}\n'.format(argPair),
+                    'Full command:\n{}\n'.format(mptCmdStruct['rawCmdStr']),
+                    )
+                )
+
+        parsedCmd['arguments'][argTokens[0]] = argTokens[1]
+            
+    # for argPair in argPairs:
+
+    return parsedCmd
+
+# def LegacyParseCommandToArgs(inCmd):
+
+
+def GenerateScript(nBytes):
+
+    # An MPilot script of about nBytes bytes
+
+    cmdTmpls = [
+        'a{n} = ReadNCVariable(InFileName = in.nc, InFieldName = a) # read\n',
+        '# a comment line\n\nb{n} = ReadNCVariable(\n    InFileName = in.nc,\n    InFieldName = b,\n)\n',
+        's{n} = SumArrays(\n    InFieldNames = [a{n}, b{n}],  # the inputs\n    Metadata = [DisplayName:Sum_{n}]\n    )\n',
+        'k{n} = MultiplyByScalar(InFieldName = s{n}, Scalar = 2.5)\n\n',
+        ]
+
+    lines = []
+    nLineBytes = 0
+    cmdNdx = 0
+    while nLineBytes < nBytes:
+        for cmdTmpl in cmdTmpls:
+            line = cmdTmpl.format(n=cmdNdx)
+            lines.append(line)
+            nLineBytes += len(line)
+        cmdNdx += 1
+
+    return ''.join(lines)
+
+# def GenerateScript(nBytes):
+
+def TimeParse(parseFxn,scriptStr,repeats):
+
+    # Best time, in seconds, of parseFxn over repeats parses, and
+    # what it returned
+
+    bestSecs = None
+    for repeatNdx in range(repeats):
+        startTime = time.time()
+        rtrn = parseFxn(scriptStr,'Benchmark')
+        secs = time.time() - startTime
+        if bestSecs is None or secs < bestSecs:
+            bestSecs = secs
+
+    return bestSecs,rtrn
+
+# def TimeParse(parseFxn,scriptStr,repeats):
+
+def RunBenchmark(scriptMB=10,repeats=3):
+
+    scriptStr = GenerateScript(int(scriptMB * 2**20))
+    scriptMB = len(scriptStr) / float(2**20)
+
+    print 'Script: {:.1f} MB'.format(scriptMB)
+
+    rslts = OrderedDict()
+    for parseNm,parseFxn in [
+        ('ParseStringToCommands',mpparse.ParseStringToCommands),
+        ('LegacyParseStringToCommands',LegacyParseStringToCommands),
+        ]:
+        secs,mptCmdStructs = TimeParse(parseFxn,scriptStr,repeats)
+        rslts[parseNm] = (secs,mptCmdStructs)
+        print '{:<30} {:8.3f} s  {:8.2f} MB/s  {} commands'.format(
+            parseNm,
+            secs,
+            scriptMB / secs,
+            len(mptCmdStructs)
+            )
+
+    print 'Speedup: {:.1f}x'.format(
+        rslts['LegacyParseStringToCommands'][0] / rslts['ParseStringToCommands'][0]
+        )
+
+    # The legacy parser made dicts rather than MPilotCmdStructs
+    legacyStructs = OrderedDict([
+        (rsltNm,mpcs.CmdStructFromDict(mptCmdStruct))
+        for rsltNm,mptCmdStruct in rslts['LegacyParseStringToCommands'][1].items()
+        ])
+    if rslts['ParseStringToCommands'][1] != legacyStructs:
+        raise Exception(
+            '{}{}'.format(
+                '\n********************ERROR********************\n',
+                'The parsers produced different commands\n'
+                )
+            )
+
+# def RunBenchmark(scriptMB=10,repeats=3):
+
+if __name__ == '__main__':
+
+    if len(sys.argv) > 3:
+        print 'python -m benchmarks.ParseBenchmark [ScriptMB [Repeats]]'
+        exit()
+
+    RunBenchmark(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3
+        )
@@ -0,0 +1,122 @@
+# Tests that the argument validators of MPilotArgTypes.py accept and
+# reject the same arguments as the _IsArgType() they replaced, which
+# is kept in benchmarks/ArgBenchmark.py, and that commands convert
+# their arguments to the same values.
+#
+# Usage, from the top of the package:
+#   python -m unittest discover tests
+#
+# File Log:
+# 2026.10.18
+#  Created test_arg_types
+
+import unittest
+
+from MPCore import MPilotParse as mpparse
+from benchmarks import ArgBenchmark as argbench
+
+ARG_TYPES = [
+    'Any',
+    'String',
+    'File Name',
+    'Field Name',
+    'Integer',
+    'Positive Integer',
+    'Float',
+    'Positive Float',
+    'Fuzzy Value',
+    'Truest Or Falsest',
+    'Boolean',
+    'Data Type Desc',
+    ]
+
+ARG_STRS = [
+    '', ',', 'a', 'a1', '1a', 'a-b_c', '-a', 'a b', 'a,b', 'in.nc',
+    'C:/data/in.nc', 'C:\\data\\in.nc', '~/in.nc', 'dir/', 'in.nc ',
+    '0', '1', '7', '10', '+3', '-3', '+-3', '0,1', '1,2,3',
+    '1.', '.5', '-.5', '+.5', '1.5', '-1.5', '1e3', '1e-3', '-1e+3',
+    '1E3', '1.5e2', '2.5', '-0.75', '1..5', 'nan', 'inf',
+    'True', 'False', 'true', 'Truest', 'TRUEST', 'falsest', '-1',
+    'Float', 'Fuzzy', 'Positive Integer', 'Float,Integer', 'Real',
+    ]
+
+SCRIPT = '''
+c = CvtToFuzzyCurve(InFieldName = a, RawValues = [0, 1.5, 2.25], FuzzyValues = [-1, 0, 1])
+'''
+
+def _Outcome(fxn,*args):
+
+    # What fxn returns, or the type of the exception it raises: both
+    # implementations raise ValueError for some strings their float
+    # pattern matches (e.g. 1..5) when checking fuzzy limits
+
+    try:
+        return fxn(*args)
+    except Exception as e:
+        return type(e)
+
+# def _Outcome(fxn,*args):
+
+class TestArgTypeValidators(unittest.TestCase):
+
+    def setUp(self):
+        mptCmdStruct = mpparse.ParseStringToCommands(SCRIPT,'Test').values()[0]
+        self.mpCmd = argbench.eemsfuzzy.CvtToFuzzyCurve(mptCmdStruct)
+    # def setUp(self):
+
+    def _AssertSameAsLegacy(self):
+
+        for argType in ARG_TYPES:
+            for listType,argStrs in [
+                (argType,ARG_STRS),
+                (argType + ' List',ARG_STRS + ['[{}]'.format(argStr) for argStr in ARG_STRS]),
+                ]:
+                for argStr in argStrs:
+                    self.assertEqual(
+                        _Outcome(self.mpCmd._IsArgType,argStr,listType),
+                        _Outcome(argbench.LegacyIsArgType,self.mpCmd,argStr,listType),
+                        '{!r} as {}'.format(argStr,listType)
+                        )
+
+    # def _AssertSameAsLegacy(self):
+
+    def testSameAsLegacy(self):
+        self._AssertSameAsLegacy()
+    # def testSameAsLegacy(self):
+
+    def testFuzzyLimits(self):
+        self.mpCmd.fuzzyMin = -0.5
+        self.mpCmd.fuzzyMax = 2.
+        self._AssertSameAsLegacy()
+        self.assertTrue(self.mpCmd._IsArgType('1.5','Fuzzy Value'))
+        self.assertFalse(self.mpCmd._IsArgType('-0.75','Fuzzy Value'))
+    # def testFuzzyLimits(self):
+
+    def testIllegalType(self):
+        self.assertRaises(Exception,argbench.LegacyIsArgType,self.mpCmd,'1','Real')
+        self.assertRaises(Exception,self.mpCmd._IsArgType,'1','Real')
+    # def testIllegalType(self):
+
+# class TestArgTypeValidators(unittest.TestCase):
+
+class TestArgVals(unittest.TestCase):
+
+    def testSameAsLegacy(self):
+
+        mptCmdStructs = mpparse.ParseStringToCommands(argbench.GenerateScript(50),'Test').values()
+        for mptCmdStruct in mptCmdStructs:
+            cmdCls,argNms = argbench._BENCH_CLASSES[mptCmdStruct['parsedCmd']['cmd']]
+            legacyCls = type('Legacy{}'.format(cmdCls.__name__),(argbench._LegacyArgs,cmdCls),{})
+            mpCmd = cmdCls(mptCmdStruct)
+            legacyCmd = legacyCls(mptCmdStruct)
+            for argNm in argNms:
+                # Asked twice, as the second call may use a kept value
+                for callNdx in range(2):
+                    self.assertEqual(mpCmd.ValFromArgByNm(argNm),legacyCmd.ValFromArgByNm(argNm))
+
+    # def testSameAsLegacy(self):
+
+# class TestArgVals(unittest.TestCase):
+
+if __name__ == '__main__':
+    unittest.main()
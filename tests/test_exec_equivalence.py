@@ -0,0 +1,235 @@
+# Tests that the ways of executing a program that are meant to give
+# the same results as executing it one command at a time do: with
+# duplicate commands executed once (MPilotDedup.py), with chains of
+# elementwise commands fused (MPilotFusion.py), and one tile at a
+# time in threads or processes (MPilotTiler.py).
+#
+# Usage, from the top of the package:
+#   python -m unittest discover tests
+#
+# File Log:
+# 2026.10.18
+#  Created test_exec_equivalence
+
+import os
+import shutil
+import tempfile
+import unittest
+import netCDF4 as nc4
+import numpy as np
+
+from MPCore import MPilotDedup as mpdedup
+from MPCore import MPilotFramework as mpf
+from MPCore import MPilotProgram as mpprog
+
+EEMS_SCRIPT = '''
+A = EEMSRead(InFileName = {inFNm}, InFieldName = a)
+A2 = EEMSRead(InFileName = {inFNm}, InFieldName = a)
+B = EEMSRead(InFileName = {inFNm}, InFieldName = b)
+S = Sum(InFieldNames = [A,B])
+AFz = CvtToFuzzy(InFieldName = A, TrueThreshold = 80, FalseThreshold = 10)
+A2Fz = CvtToFuzzy(InFieldName = A2, TrueThreshold = 80, FalseThreshold = 10)
+BFz = CvtToFuzzy(InFieldName = B, Direction = HighToLow)
+NFz = CvtToFuzzyZScore(InFieldName = S, TrueThresholdZScore = 1, FalseThresholdZScore = -1)
+Or = FuzzyOr(InFieldNames = [AFz,A2Fz,BFz])
+Not = FuzzyNot(InFieldName = Or)
+M = Multiply(InFieldNames = [S,B])
+MFz = CvtToFuzzy(InFieldName = M, Direction = LowToHigh)
+And = FuzzyAnd(InFieldNames = [Not,NFz,MFz])
+Out = EEMSWrite(OutFileName = {outFNm}, OutFieldNames = [A2Fz,Or,Not,NFz,MFz,And], DimensionFileName = {inFNm}, DimensionFieldName = a)
+'''
+
+EEMS_OUT_NMS = ['A2Fz','Or','Not','NFz','MFz','And']
+
+NETCDF_SCRIPT = '''
+a = ReadNCVariable(InFileName = {inFNm}, InFieldName = a)
+a2 = ReadNCVariable(InFileName = {inFNm}, InFieldName = a)
+k = MultiplyByScalar(InFieldName = a, Scalar = 2.5)
+k2 = MultiplyByScalar(InFieldName = a2, Scalar = 2.5)
+'''
+
+def WriteSampleFile(inFNm):
+
+    # Two fields of random values, with about a tenth masked
+
+    yLen,xLen = 53,41
+    randState = np.random.RandomState(0)
+    with nc4.Dataset(inFNm,'w') as outDS:
+        for dimNm,dimLen in [('y',yLen),('x',xLen)]:
+            outDS.createDimension(dimNm,dimLen)
+            dimV = outDS.createVariable(dimNm,'f8',(dimNm,))
+            dimV[:] = np.arange(dimLen,dtype=float)
+        for varNm in ['a','b']:
+            varV = outDS.createVariable(varNm,'f8',('y','x'),fill_value=-9999.)
+            varV[:] = np.ma.array(
+                randState.rand(yLen,xLen) * 100.,
+                mask=randState.rand(yLen,xLen) < 0.1
+                )
+
+# def WriteSampleFile(inFNm):
+
+class _SampleDataTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpDir = tempfile.mkdtemp(prefix='mpilot_test_')
+        self.inFNm = os.path.join(self.tmpDir,'in.nc')
+        WriteSampleFile(self.inFNm)
+    # def setUp(self):
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpDir,ignore_errors=True)
+    # def tearDown(self):
+
+    def assertSameArr(self,arr,refArr,msg,rtol=0.,atol=0.):
+        self.assertTrue(
+            np.array_equal(np.ma.getmaskarray(arr),np.ma.getmaskarray(refArr)),
+            'Masks differ: {}'.format(msg)
+            )
+        self.assertTrue(
+            np.ma.allclose(arr,refArr,rtol=rtol,atol=atol),
+            'Values differ: {}'.format(msg)
+            )
+    # def assertSameArr(self,arr,refArr,msg,rtol=0.,atol=0.):
+
+# class _SampleDataTest(unittest.TestCase):
+
+class TestEEMSExec(_SampleDataTest):
+
+    def setUp(self):
+        _SampleDataTest.setUp(self)
+        self.fw = mpf.MPilotFramework([
+            ('.MPEEMSBasicLib','MPStdLibraries'),
+            ('.MPEEMSFuzzyLogicLib','MPStdLibraries'),
+            ('.MPEEMSNC4IO','MPStdLibraries'),
+            ])
+        self.refProg,self.refOutFNm = self._Prog('ref')
+        self.refProg.Run()
+    # def setUp(self):
+
+    def _Prog(self,tag):
+        outFNm = os.path.join(self.tmpDir,'{}.nc'.format(tag))
+        progStr = EEMS_SCRIPT.format(inFNm=self.inFNm,outFNm=outFNm)
+        return mpprog.MPilotProgram(self.fw,sourceProgStr=progStr),outFNm
+    # def _Prog(self,tag):
+
+    def _OutArrs(self,outFNm):
+        with nc4.Dataset(outFNm) as inDS:
+            return dict([(varNm,inDS.variables[varNm][:]) for varNm in EEMS_OUT_NMS])
+    # def _OutArrs(self,outFNm):
+
+    def _AssertSameOutput(self,outFNm,tol=0.):
+        outArrs = self._OutArrs(outFNm)
+        refArrs = self._OutArrs(self.refOutFNm)
+        for varNm in EEMS_OUT_NMS:
+            self.assertSameArr(
+                outArrs[varNm],
+                refArrs[varNm],
+                '{} in {}'.format(varNm,os.path.basename(outFNm)),
+                rtol=tol,
+                atol=tol
+                )
+    # def _AssertSameOutput(self,outFNm,tol=0.):
+
+    def testDedup(self):
+
+        mpProg,outFNm = self._Prog('dedup')
+        self.assertEqual(
+            dict(mpdedup.DuplicateCmds(mpProg.OrderedCmds())),
+            {'A2':'A','A2Fz':'AFz'}
+            )
+
+        mpProg.Run(dedup=True)
+        for rsltNm in mpProg.OrderedCmds():
+            if rsltNm == 'Out': continue
+            self.assertSameArr(mpProg.RsltByNm(rsltNm),self.refProg.RsltByNm(rsltNm),rsltNm)
+        self._AssertSameOutput(outFNm)
+
+    # def testDedup(self):
+
+    def testFuse(self):
+        mpProg,outFNm = self._Prog('fuse')
+        mpProg.Run(fuse=True)
+        self._AssertSameOutput(outFNm)
+    # def testFuse(self):
+
+    def testTiled(self):
+
+        # Statistics over the whole data (CvtToFuzzyZScore, CvtToFuzzy
+        # without thresholds)
+        # are accumulated tile by tile, so may differ in the last bits
+
+        for tag,runArgs in [
+            ('tiled1',dict(tileShape=[10])),
+            ('tiled2',dict(tileShape=[17,12],workers=3)),
+            ('tiledFuse',dict(tileShape=[8],fuse=True)),
+            ('tiledWhole',dict(tileShape=[100,100])),
+            ]:
+            mpProg,outFNm = self._Prog(tag)
+            mpProg.RunTiled(**runArgs)
+            self._AssertSameOutput(outFNm,tol=1e-12)
+
+    # def testTiled(self):
+
+    def testTiledProcesses(self):
+
+        # Tiles executed in worker processes must give exactly what
+        # they give in this one
+
+        for tag,runArgs in [
+            ('tiled',dict(tileShape=[7])),
+            ('tiledFuse',dict(tileShape=[13,20],fuse=True)),
+            ]:
+            mpProg,outFNm = self._Prog(tag)
+            mpProg.RunTiled(**runArgs)
+            procProg,procOutFNm = self._Prog(tag + 'Processes')
+            procProg.RunTiled(processes=3,**runArgs)
+
+            outArrs = self._OutArrs(outFNm)
+            procOutArrs = self._OutArrs(procOutFNm)
+            for varNm in EEMS_OUT_NMS:
+                self.assertSameArr(procOutArrs[varNm],outArrs[varNm],'{} in {}'.format(varNm,tag))
+            self._AssertSameOutput(procOutFNm,tol=1e-12)
+
+    # def testTiledProcesses(self):
+
+# class TestEEMSExec(_SampleDataTest):
+
+class TestNetCDFDedup(_SampleDataTest):
+
+    def testDedup(self):
+
+        fw = mpf.MPilotFramework([('.MPNetCDFUtilsLib','MPStdLibraries')])
+        progStr = NETCDF_SCRIPT.format(inFNm=self.inFNm)
+
+        mpProg = mpprog.MPilotProgram(fw,sourceProgStr=progStr)
+        self.assertEqual(
+            dict(mpdedup.DuplicateCmds(mpProg.OrderedCmds())),
+            {'a2':'a','k2':'k'}
+            )
+
+        mpProg.Run(dedup=True)
+        refProg = mpprog.MPilotProgram(fw,sourceProgStr=progStr)
+        refProg.Run()
+
+        for rsltNm in mpProg.OrderedCmds():
+            self.assertSameArr(
+                mpProg.RsltByNm(rsltNm).data.data,
+                refProg.RsltByNm(rsltNm).data.data,
+                rsltNm
+                )
+
+        # A duplicate carries its own name and NodeCommand, and shares
+        # the array of the command it duplicates
+        for dupNm,origNm in [('a2','a'),('k2','k')]:
+            rslt = mpProg.RsltByNm(dupNm)
+            refRslt = refProg.RsltByNm(dupNm)
+            self.assertEqual(rslt.name,refRslt.name)
+            self.assertEqual(rslt.metadata.get('NodeCommand'),refRslt.metadata.get('NodeCommand'))
+            self.assertTrue(rslt.data.data is mpProg.RsltByNm(origNm).data.data)
+
+    # def testDedup(self):
+
+# class TestNetCDFDedup(_SampleDataTest):
+
+if __name__ == '__main__':
+    unittest.main()
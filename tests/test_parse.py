@@ -0,0 +1,70 @@
+# Tests that MPilotParse.ParseStringToCommands() produces the same
+# commands as the implementation it replaced, which is kept in
+# benchmarks/ParseBenchmark.py.
+#
+# Usage, from the top of the package:
+#   python -m unittest discover tests
+#
+# File Log:
+# 2026.10.18
+#  Created test_parse
+
+from collections import OrderedDict
+import unittest
+
+from MPCore import MPilotParse as mpparse
+from MPCore import MPilotCmdStruct as mpcs
+from benchmarks import ParseBenchmark as parsebench
+
+# Scripts with what the generated script does not have
+EDGE_SCRIPTS = [
+    'a = ReadNCVariable(InFileName = in.nc, InFieldName = a)',
+    '\n\n  # leading comment\na = ReadNCVariable(InFileName=in.nc,InFieldName=a)\n\n# trailing comment',
+    'a = ReadNCVariable(\n\tInFileName = in.nc,\n\tInFieldName = a,,\n)\n',
+    '[a, b] = SplitArray(\n    InFieldName = x, # split\n    Dims = [1 , 2 ,]\n    )\n',
+    'w = WeightedSum(InFieldNames = [a,\n  b,\n  c],\n  Weights = [0.5,\n  2, -1.25])\n',
+    's = SumArrays(InFieldNames = [a, b], Metadata = [DisplayName:Sum, ColorMap:RdYlBu])\n',
+    u'a = ReadNCVariable(InFileName = in.nc, InFieldName = a)\n',
+    ]
+
+class TestParseStringToCommands(unittest.TestCase):
+
+    def _AssertSameAsLegacy(self,scriptStr):
+
+        # The legacy parser made dicts rather than MPilotCmdStructs
+        legacyStructs = OrderedDict([
+            (rsltNm,mpcs.CmdStructFromDict(mptCmdStruct))
+            for rsltNm,mptCmdStruct in
+            parsebench.LegacyParseStringToCommands(scriptStr,'Test').items()
+            ])
+
+        mptCmdStructs = mpparse.ParseStringToCommands(scriptStr,'Test')
+
+        self.assertEqual(mptCmdStructs.keys(),legacyStructs.keys())
+        for rsltNm in legacyStructs:
+            self.assertEqual(mptCmdStructs[rsltNm],legacyStructs[rsltNm],rsltNm)
+
+    # def _AssertSameAsLegacy(self,scriptStr):
+
+    def testGeneratedScript(self):
+        self._AssertSameAsLegacy(parsebench.GenerateScript(64 * 2**10))
+    # def testGeneratedScript(self):
+
+    def testEdgeScripts(self):
+        for scriptStr in EDGE_SCRIPTS:
+            self._AssertSameAsLegacy(scriptStr)
+    # def testEdgeScripts(self):
+
+    def testUnmatchedParens(self):
+        for scriptStr in [
+            'a = ReadNCVariable(InFileName = in.nc, InFieldName = a',
+            'a = ReadNCVariable(InFileName = in.nc, InFieldName = a))',
+            ]:
+            self.assertRaises(Exception,parsebench.LegacyParseStringToCommands,scriptStr,'Test')
+            self.assertRaises(Exception,mpparse.ParseStringToCommands,scriptStr,'Test')
+    # def testUnmatchedParens(self):
+
+# class TestParseStringToCommands(unittest.TestCase):
+
+if __name__ == '__main__':
+    unittest.main()